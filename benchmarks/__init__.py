@@ -0,0 +1,7 @@
+"""Benchmarks for the datatypes package.
+
+Run ``python -m benchmarks --help`` from the repository root. Each
+benchmark times the package's implementation next to its stdlib
+counterpart; results can be saved as JSON and compared against a saved
+baseline to catch regressions.
+"""
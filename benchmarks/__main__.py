@@ -0,0 +1,78 @@
+"""Command line entry point: ``python -m benchmarks``."""
+import argparse
+import importlib
+import json
+import sys
+from pathlib import Path
+
+from benchmarks import runner
+
+MODULES = ('bench_collections', 'bench_numeric', 'bench_pickler', 'bench_multiexp', 'bench_zkproofs',
+           'bench_imports')
+
+
+def _load_modules() -> None:
+    for name in MODULES:
+        try:
+            importlib.import_module(f'benchmarks.{name}')
+        except ImportError as e:
+            print(f"skipping {name}: {e}", file=sys.stderr)
+
+
+def _parse_overrides(values):
+    overrides = {}
+    for value in values or ():
+        name, _, fraction = value.partition('=')
+        overrides[name] = float(fraction)
+    return overrides
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__)
+    parser.add_argument('names', nargs='*', help="run benchmarks whose name contains any of these (default: all)")
+    parser.add_argument('--list', action='store_true', help="list benchmarks and exit")
+    parser.add_argument('--sizes', help="comma separated sizes overriding each benchmark's defaults "
+                                            "(benchmarks sized in bits keep theirs)")
+    parser.add_argument('--repeat', type=int, default=5, help="timing repeats per variant (default: 5)")
+    parser.add_argument('--min-time', type=float, default=0.05,
+                        help="minimum seconds per repeat (default: 0.05)")
+    parser.add_argument('--output', type=Path, help="write results as JSON to this file")
+    parser.add_argument('--baseline', type=Path, help="compare against results saved with --output")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="allowed slowdown against the baseline as a fraction (default: 0.10)")
+    parser.add_argument('--threshold-for', action='append', metavar='PREFIX=FRACTION',
+                        help="per-benchmark threshold, may be repeated")
+    args = parser.parse_args(argv)
+
+    _load_modules()
+    if args.list:
+        for bench in runner.REGISTRY.values():
+            fixed = '  (fixed)' if bench.fixed_sizes else ''
+            print(f"{bench.name}  sizes={list(bench.sizes)}{fixed}")
+        return 0
+
+    sizes = [int(s) for s in args.sizes.split(',')] if args.sizes else None
+
+    def progress(result):
+        print(f"{result.name:<40} {result.size:>8} {result.variant:<12} "
+              f"{runner.format_seconds(result.best):>12}", flush=True)
+
+    results = runner.run(args.names, sizes, args.repeat, args.min_time, progress)
+    if args.output:
+        args.output.write_text(json.dumps(runner.to_json(results), indent=2))
+
+    if args.baseline:
+        comparisons = runner.compare(results, runner.load(args.baseline), args.threshold,
+                                     _parse_overrides(args.threshold_for))
+        regressions = [c for c in comparisons if c.regressed]
+        print()
+        for c in comparisons:
+            mark = 'REGRESSION' if c.regressed else 'ok'
+            print(f"{c.key:<60} {c.ratio:6.2f}x  {mark}")
+        print(f"\n{len(regressions)} regression(s) in {len(comparisons)} comparison(s)")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
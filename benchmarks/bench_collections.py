@@ -0,0 +1,89 @@
+"""Collections benchmarks: CircularList, MultiDict and OrderedSet."""
+from collections import deque
+
+from benchmarks.runner import register
+from datatypes import CircularList, MultiDict, OrderedSet
+
+SIZES = (100, 10_000, 100_000)
+
+
+@register('collections.circularlist.rotate', SIZES)
+def circularlist_rotate(size):
+    items = CircularList(range(size))
+    stdlib = deque(range(size))
+    return {'datatypes': lambda: items.rotate(3), 'stdlib': lambda: stdlib.rotate(3)}
+
+
+@register('collections.circularlist.getitem', SIZES)
+def circularlist_getitem(size):
+    items = CircularList(range(size))
+    stdlib = deque(range(size))
+    index = size + size // 2
+    return {'datatypes': lambda: items[index], 'stdlib': lambda: stdlib[index % size]}
+
+
+@register('collections.multidict.add', SIZES)
+def multidict_add(size):
+    keys = [i % (size // 4 + 1) for i in range(size)]
+
+    def datatypes():
+        md = MultiDict()
+        for i, key in enumerate(keys):
+            md.add(key, i)
+
+    def stdlib():
+        d = {}
+        for i, key in enumerate(keys):
+            d.setdefault(key, []).append(i)
+
+    return {'datatypes': datatypes, 'stdlib': stdlib}
+
+
+@register('collections.multidict.len', SIZES)
+def multidict_len(size):
+    md = MultiDict()
+    d = {}
+    for i in range(size):
+        md.add(i % (size // 4 + 1), i)
+        d[i] = i
+    return {'datatypes': lambda: len(md), 'stdlib': lambda: len(d)}
+
+
+@register('collections.orderedset.build', SIZES)
+def orderedset_build(size):
+    values = list(range(size))
+    return {'datatypes': lambda: OrderedSet(values), 'stdlib': lambda: dict.fromkeys(values)}
+
+
+@register('collections.orderedset.contains', SIZES)
+def orderedset_contains(size):
+    values = list(range(size))
+    items = OrderedSet(values)
+    stdlib = dict.fromkeys(values)
+    probe = size // 2
+    return {'datatypes': lambda: probe in items, 'stdlib': lambda: probe in stdlib}
+
+
+@register('collections.multidict.snapshot', SIZES)
+def multidict_snapshot(size):
+    """A consistent read view: copy-on-write snapshot vs a full copy."""
+    md = MultiDict()
+    d = {}
+    for i in range(size):
+        md.add(i % (size // 4 + 1), i)
+        d.setdefault(i % (size // 4 + 1), []).append(i)
+
+    def datatypes():
+        # Includes the first writes after the snapshot, which pay the copy.
+        view = md.snapshot()
+        md.add(-1, 0)
+        md.remove(-1)
+        return view
+
+    def stdlib():
+        view = {key: list(values) for key, values in d.items()}
+        d[-1] = [0]
+        del d[-1]
+        return view
+
+    return {'datatypes': datatypes, 'stdlib': stdlib}
@@ -0,0 +1,33 @@
+"""Import-time benchmarks: cold start of ``import datatypes`` and of each group.
+
+Every call starts a fresh interpreter, so the numbers include interpreter
+startup; the ``python`` variant measures that alone for reference.
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.runner import register
+
+ROOT = Path(__file__).parent.parent
+
+FIRST_USE = {
+    'python': 'pass',
+    'package': 'import datatypes',
+    'collections': 'import datatypes; datatypes.OrderedSet',
+    'numeric': 'import datatypes; datatypes.Complex',
+    'pickler': 'import datatypes; datatypes.BaseDataTypesPickler',
+    'testgen': 'import datatypes; datatypes.TestGenerator',
+    'zkproofs': 'import datatypes; datatypes.ZeroKnowledgeProofs',
+}
+
+
+def _interpreter(code):
+    def run():
+        subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True)
+    return run
+
+
+@register('imports.cold_start', (1,), fixed_sizes=True)
+def cold_start(size):
+    return {name: _interpreter(code) for name, code in FIRST_USE.items()}
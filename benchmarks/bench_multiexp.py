@@ -0,0 +1,50 @@
+"""Benchmark simultaneous multi-exponentiation against paired pow() calls.
+
+Part of the suite (``python -m benchmarks multiexp``); it can also be run
+on its own with ``python -m benchmarks.bench_multiexp [repeats]``.
+"""
+import random
+import sys
+import timeit
+
+from benchmarks.runner import register
+from datatypes.others.multiexp import interleaved_exp, shamir_exp
+from datatypes.others.zkparams import default_provider
+
+SIZES = (2048, 3072)
+
+
+def _operands(bits: int):
+    group = default_provider().group(bits)
+    p = group.p
+    a = pow(group.g, random.randrange(group.q), p)
+    b = group.derive_generator(b'bench')
+    return a, random.randrange(p - 1), b, random.randrange(p - 1), p
+
+
+@register('others.multiexp.two_bases', SIZES, fixed_sizes=True)
+def two_bases(bits):
+    a, x, b, y, p = _operands(bits)
+    return {
+        'shamir': lambda: shamir_exp(a, x, b, y, p),
+        'interleaved': lambda: interleaved_exp((a, b), (x, y), p),
+        'stdlib': lambda: pow(a, x, p) * pow(b, y, p) % p,
+    }
+
+
+def bench(bits: int, repeats: int) -> None:
+    a, x, b, y, p = _operands(bits)
+    assert shamir_exp(a, x, b, y, p) == pow(a, x, p) * pow(b, y, p) % p
+
+    paired = min(timeit.repeat(lambda: pow(a, x, p) * pow(b, y, p) % p, number=1, repeat=repeats))
+    shamir = min(timeit.repeat(lambda: shamir_exp(a, x, b, y, p), number=1, repeat=repeats))
+    straus = min(timeit.repeat(lambda: interleaved_exp((a, b), (x, y), p), number=1, repeat=repeats))
+    print(f"{bits:>5} bits  paired pow {paired * 1e3:8.2f} ms"
+          f"  shamir {shamir * 1e3:8.2f} ms ({paired / shamir:.2f}x)"
+          f"  interleaved {straus * 1e3:8.2f} ms ({paired / straus:.2f}x)")
+
+
+if __name__ == '__main__':
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    for bits in SIZES:
+        bench(bits, repeats)
@@ -0,0 +1,47 @@
+"""Numeric benchmarks: Complex and DecimalRange."""
+from benchmarks.runner import register
+from datatypes import Complex, DecimalRange
+
+SIZES = (100, 10_000)
+
+
+@register('numeric.complex.mul', SIZES)
+def complex_mul(size):
+    ours = [Complex(i, i + 1) for i in range(size)]
+    builtin = [complex(i, i + 1) for i in range(size)]
+
+    def datatypes():
+        acc = Complex(1, 0)
+        for value in ours:
+            acc = acc * value
+
+    def stdlib():
+        acc = complex(1, 0)
+        for value in builtin:
+            acc = acc * value
+
+    return {'datatypes': datatypes, 'stdlib': stdlib}
+
+
+@register('numeric.decimalrange.iter', SIZES)
+def decimalrange_iter(size):
+    ours = DecimalRange(0, size, 1)
+    builtin = range(0, size, 1)
+
+    def datatypes():
+        for _ in ours:
+            pass
+
+    def stdlib():
+        for _ in builtin:
+            pass
+
+    return {'datatypes': datatypes, 'stdlib': stdlib}
+
+
+@register('numeric.decimalrange.contains', SIZES)
+def decimalrange_contains(size):
+    ours = DecimalRange(0, size, 1)
+    builtin = range(0, size, 1)
+    probe = size // 2
+    return {'datatypes': lambda: probe in ours, 'stdlib': lambda: probe in builtin}
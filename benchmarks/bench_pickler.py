@@ -0,0 +1,21 @@
+"""Pickler benchmarks: the package pickler round trip against plain pickle."""
+import pickle
+
+from benchmarks.runner import register
+from datatypes.others.pickler import BaseDataTypesPickler, BaseDataTypesUnpickler
+
+SIZES = (10, 1_000, 100_000)
+
+
+@register('others.pickler.roundtrip', SIZES)
+def pickler_roundtrip(size):
+    value = {i: (str(i), i * 1.5, [i, i + 1]) for i in range(size)}
+
+    def datatypes():
+        data = BaseDataTypesPickler(value).get_pickled_value()
+        BaseDataTypesUnpickler(data).get_unpickled_value()
+
+    def stdlib():
+        pickle.loads(pickle.dumps(value))
+
+    return {'datatypes': datatypes, 'stdlib': stdlib}
@@ -0,0 +1,36 @@
+"""Zero-knowledge proof benchmarks. Sizes are modulus sizes in bits.
+
+There is no stdlib counterpart, so the variants compare the plain params
+with precomputed tables, batch verification and the P-256 backend.
+"""
+from benchmarks.runner import register
+from datatypes.others.zkproofs import ZeroKnowledgeProofs
+
+SIZES = (2048,)
+BATCH = 32
+
+
+@register('others.zkproofs.schnorr_verify', SIZES, fixed_sizes=True)
+def schnorr_verify(bits):
+    params = ZeroKnowledgeProofs.schnorr_setup(bits)
+    tables = ZeroKnowledgeProofs.precompute(params)
+    proof = ZeroKnowledgeProofs.schnorr_prove(0, tables)
+    proofs = [ZeroKnowledgeProofs.schnorr_prove(0, tables) for _ in range(BATCH)]
+    ec = ZeroKnowledgeProofs.schnorr_setup(group='p256')
+    ec_proof = ZeroKnowledgeProofs.schnorr_prove(0, ec)
+    return {
+        'plain': lambda: ZeroKnowledgeProofs.schnorr_verify(proof, params),
+        'precomputed': lambda: ZeroKnowledgeProofs.schnorr_verify(proof, tables),
+        f'batch{BATCH}': lambda: ZeroKnowledgeProofs.schnorr_batch_verify(proofs, tables),
+        'p256': lambda: ZeroKnowledgeProofs.schnorr_verify(ec_proof, ec),
+    }
+
+
+@register('others.zkproofs.pedersen_commit', SIZES, fixed_sizes=True)
+def pedersen_commit(bits):
+    params = ZeroKnowledgeProofs.pedersen_setup(bits)
+    tables = ZeroKnowledgeProofs.precompute(params)
+    return {
+        'plain': lambda: ZeroKnowledgeProofs.pedersen_commit(12345, params),
+        'precomputed': lambda: ZeroKnowledgeProofs.pedersen_commit(12345, tables),
+    }
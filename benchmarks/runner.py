@@ -0,0 +1,173 @@
+"""Registry, timing and baseline comparison for the benchmark suite."""
+import json
+import platform
+import statistics
+import time
+import timeit
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+
+@dataclass
+class Benchmark:
+    """A benchmark case with one or more variants timed at several sizes.
+
+    ``setup(size)`` returns a mapping of variant name to a zero-argument
+    callable. The package's own implementation is conventionally called
+    ``'datatypes'`` and its stdlib counterpart ``'stdlib'``. Benchmarks
+    whose sizes mean something other than an item count (bit lengths, a
+    placeholder) set ``fixed_sizes`` and keep them under ``--sizes``.
+    """
+    name: str
+    setup: Callable[[int], Dict[str, Callable[[], Any]]]
+    sizes: Sequence[int]
+    fixed_sizes: bool = False
+
+
+@dataclass
+class Result:
+    """The timing of one variant of one benchmark at one size."""
+    name: str
+    variant: str
+    size: int
+    best: float
+    median: float
+    loops: int
+    repeats: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}[{self.size}]:{self.variant}"
+
+
+@dataclass
+class Comparison:
+    """A result compared with the same result in a baseline run."""
+    key: str
+    baseline: float
+    current: float
+    threshold: float
+    ratio: float = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.ratio = self.current / self.baseline if self.baseline else float('inf')
+
+    @property
+    def regressed(self) -> bool:
+        return self.ratio > 1 + self.threshold
+
+
+REGISTRY: Dict[str, Benchmark] = {}
+
+
+def register(name: str, sizes: Sequence[int], fixed_sizes: bool = False) -> Callable:
+    """Decorator registering a benchmark setup function under ``name``."""
+    def decorator(setup: Callable[[int], Dict[str, Callable[[], Any]]]) -> Callable:
+        if name in REGISTRY:
+            raise ValueError(f"Benchmark {name!r} is already registered")
+        REGISTRY[name] = Benchmark(name, setup, tuple(sizes), fixed_sizes)
+        return setup
+    return decorator
+
+
+def time_callable(func: Callable[[], Any], repeats: int = 5, min_time: float = 0.05):
+    """Time a callable, returning ``(best, median, loops)`` seconds per call.
+
+    The loop count is calibrated so one repeat takes at least ``min_time``.
+    """
+    timer = timeit.Timer(func)
+    loops = 1
+    while True:
+        if timer.timeit(loops) >= min_time:
+            break
+        loops *= 2 if loops < 1024 else 10
+    times = [t / loops for t in timer.repeat(repeat=repeats, number=loops)]
+    return min(times), statistics.median(times), loops
+
+
+def run(names: Optional[Iterable[str]] = None, sizes: Optional[Sequence[int]] = None,
+        repeats: int = 5, min_time: float = 0.05,
+        progress: Optional[Callable[[Result], None]] = None) -> List[Result]:
+    """Run registered benchmarks.
+
+    Args:
+        names: Substrings of the benchmark names to select; all benchmarks
+            run when omitted.
+        sizes: Override the sizes of every selected benchmark, except
+            those registered with ``fixed_sizes``.
+        repeats: Timing repeats per variant; the best one is reported.
+        min_time: Minimum duration of one repeat, in seconds.
+        progress: Called with every result as soon as it is measured.
+
+    Returns:
+        List[Result]: One result per benchmark, size and variant.
+    """
+    names = list(names or ())
+    results = []
+    for bench in REGISTRY.values():
+        if names and not any(n in bench.name for n in names):
+            continue
+        for size in bench.sizes if bench.fixed_sizes else sizes or bench.sizes:
+            for variant, func in bench.setup(size).items():
+                best, median, loops = time_callable(func, repeats, min_time)
+                result = Result(bench.name, variant, size, best, median, loops, repeats)
+                results.append(result)
+                if progress is not None:
+                    progress(result)
+    return results
+
+
+def to_json(results: Sequence[Result]) -> Dict[str, Any]:
+    """Return the machine-readable form of a run."""
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        },
+        'results': [asdict(r) for r in results],
+    }
+
+
+def load(path: Path) -> List[Result]:
+    """Load results saved with ``to_json``."""
+    data = json.loads(Path(path).read_text())
+    return [Result(**r) for r in data['results']]
+
+
+def compare(current: Sequence[Result], baseline: Sequence[Result],
+            threshold: float = 0.10,
+            overrides: Optional[Dict[str, float]] = None) -> List[Comparison]:
+    """Compare a run with a baseline run.
+
+    Args:
+        current: Results of this run.
+        baseline: Results of the saved run.
+        threshold: Allowed slowdown as a fraction (0.10 = 10% slower).
+        overrides: Per-benchmark thresholds, keyed by benchmark name prefix.
+
+    Returns:
+        List[Comparison]: One entry per result present in both runs.
+    """
+    overrides = overrides or {}
+    before = {r.key: r for r in baseline}
+    comparisons = []
+    for result in current:
+        old = before.get(result.key)
+        if old is None:
+            continue
+        limit = threshold
+        for prefix, value in overrides.items():
+            if result.name.startswith(prefix):
+                limit = value
+        comparisons.append(Comparison(result.key, old.best, result.best, limit))
+    return comparisons
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
@@ -0,0 +1,95 @@
+"""Extra data types, grouped into collections, numeric, others and future.
+
+Nothing is imported up front. A group is loaded the first time one of its
+names is used, and its ``__data__`` enable/disable and version checks run
+at that point, once per group::
+
+    import datatypes
+    datatypes.OrderedSet                      # checks and loads collections
+    from datatypes import ZeroKnowledgeProofs  # loads PyCryptodome
+
+Group directories are namespace packages, so ``datatypes.collections`` does
+not shadow the standard library ``collections`` when ``datatypes/`` itself
+is on ``sys.path``. Importing a module directly, e.g.
+``import datatypes.collections.orderedset``, skips the group checks, as
+importing it without its initializer always has. Either way its classes
+are registered for instrumentation and memory reports by the import hook
+of ``others/registry.py``, installed below.
+"""
+import importlib
+
+from .others import registry
+
+# Group name to the initializer module that runs its __data__ checks.
+# (No typing import here: it would triple the cost of ``import datatypes``.)
+_GROUPS = {
+    'collections': 'initializer_collections_group',
+    'numeric': 'initializer_numeric_types',
+    'future': 'initializer_future_group',
+    'others': None,
+}
+
+# Public name to the module defining it, relative to this package.
+_ATTRIBUTES = {
+    'CircularList': 'collections.circularlist',
+    'DefaultList': 'collections.DefaultList_NewList',
+    'DiskMultiDict': 'collections.diskmultidict',
+    'DiskOrderedSet': 'collections.diskorderedset',
+    'FrozenDict': 'collections.frozendict',
+    'MultiDict': 'collections.multidict',
+    'NewDefaultList': 'collections.DefaultList_NewList',
+    'NewList': 'collections.DefaultList_NewList',
+    'OrderedSet': 'collections.orderedset',
+    'SharedFrozenDict': 'collections.sharedfrozendict',
+    'indexdict': 'collections.indexdict',
+    'Complex': 'numeric.complex',
+    'DecimalRange': 'numeric.decimalrange',
+    'BaseDataTypesPickler': 'others.pickler',
+    'BaseDataTypesUnpickler': 'others.pickler',
+    'BulkDataGenerator': 'others.testgen',
+    'DataGenerator': 'others.testgen',
+    'TestGenerator': 'others.testgen',
+    'ZeroKnowledgeProofs': 'others.zkproofs',
+    'deep_sizeof': 'others.memory',
+    'memory_report': 'others.memory',
+    'PersistentCache': 'future.cache',
+    'memoize': 'future.cache',
+}
+
+__all__ = sorted(_GROUPS) + sorted(_ATTRIBUTES)
+
+_checked = set()
+
+registry.install()
+
+
+def _load_group(group: str):
+    """Import a group, running its initializer the first time.
+
+    A failing check is not remembered, so a disabled group keeps raising
+    on every use instead of only the first.
+    """
+    if group not in _checked:
+        initializer = _GROUPS[group]
+        if initializer is not None:
+            importlib.import_module(f'.{group}.{initializer}', __name__)
+        _checked.add(group)
+    return importlib.import_module(f'.{group}', __name__)
+
+
+def __getattr__(name: str):
+    if name in _GROUPS:
+        value = _load_group(name)
+    elif name in _ATTRIBUTES:
+        module_name = _ATTRIBUTES[name]
+        _load_group(module_name.partition('.')[0])
+        value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Later lookups find the value directly and never reach __getattr__.
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(__all__))
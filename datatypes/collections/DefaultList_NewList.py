@@ -1,3 +1,6 @@
+import sys
+
+
 class DefaultList(list):
     def __init__(self,*items,default):
         super().__init__(*items)
@@ -7,6 +10,9 @@ class DefaultList(list):
             return super().__getitem__(index)
         except IndexError:
             return self.default
+    def __sizeof__(self):
+        # The attribute dict holding ``default`` comes on top of the list.
+        return list.__sizeof__(self) + sys.getsizeof(self.__dict__)
         
 
 
@@ -17,5 +23,3 @@ class NewList(list):
 
 class NewDefaultList(NewList,DefaultList):
     pass
-
-
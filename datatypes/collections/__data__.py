@@ -1,3 +1,4 @@
 disabled = False  # Collections are enabled by default
 disabletype = 'RaiseWarning'
 version = 'stable'  # Collections are stable
+instrument = False  # Count calls, sizes and timings; see others/instrument.py
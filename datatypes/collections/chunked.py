@@ -0,0 +1,259 @@
+"""Insertion-ordered sets and maps stored in small parts, for copy-on-write.
+
+``OrderedSet`` and ``MultiDict`` keep their contents here so that their
+snapshots can share them. Keys live in hash buckets, small dicts of about
+``LOAD`` keys each, and in chunks of ``CHUNK`` slots that record insertion
+order. ``copy`` shares every bucket and chunk and copies only the outer
+lists, O(n / CHUNK); afterwards each side copies a bucket or chunk the
+first time it changes it. A write after a snapshot therefore pays for the
+parts it touches rather than for the whole container.
+
+These are internal building blocks. They are not thread-safe; the
+containers built on them decide who may write.
+"""
+import sys
+from functools import partial
+from itertools import chain
+from operator import is_not
+
+CHUNK = 64  # Slots per order chunk
+LOAD = 64  # Average keys per bucket before the buckets grow
+GROWTH = 8  # Factor by which the number of buckets grows
+
+_GAP = object()  # Fills the slot of a removed key until the next rebuild
+_present = partial(is_not, _GAP)
+
+
+class ChunkedSet:
+    """An insertion-ordered set of hashable keys."""
+
+    __slots__ = ('_index', '_chunks', '_mask', '_len', '_gaps', '_tail', '_owned')
+
+    def __init__(self, keys=()) -> None:
+        self._build(list(dict.fromkeys(keys)))
+
+    def _build(self, keys: list) -> None:
+        """Store ``keys``, which are distinct, in new parts."""
+        buckets = 1
+        while buckets * LOAD < len(keys):
+            buckets *= 2
+        mask = buckets - 1
+        index = [{} for _ in range(buckets)]
+        chunks = [keys[start:start + CHUNK] for start in range(0, len(keys), CHUNK)] or [[]]
+        # Keys map to their chunk number; each chunk's keys share one int.
+        for number, chunk in enumerate(chunks):
+            for key in chunk:
+                index[hash(key) & mask][key] = number
+        self._index = index
+        self._chunks = chunks
+        self._mask = mask
+        self._len = len(keys)
+        self._gaps = 0
+        self._tail = len(chunks) - 1
+        self._owned = None  # Ids of the parts copied since the last copy(); None = all
+
+    def _rebuild(self) -> None:
+        self._build(list(self))
+
+    def _grow(self) -> None:
+        """Spread the keys over ``GROWTH`` times as many buckets."""
+        mask = len(self._index) * GROWTH - 1
+        self._index = self._rehash(self._index, mask)
+        self._mask = mask
+
+    def _rehash(self, buckets: list, mask: int) -> list:
+        """Return new buckets holding the entries of ``buckets``, placed by ``mask``."""
+        rehashed = [{} for _ in range(mask + 1)]
+        for bucket in buckets:
+            for key, value in bucket.items():
+                rehashed[hash(key) & mask][key] = value
+        if self._owned is not None:
+            self._owned.update(map(id, rehashed))
+        return rehashed
+
+    def _own(self, parts: list, position: int):
+        """Return the part at ``position``, first copying it if it is shared."""
+        part = parts[position]
+        owned = self._owned
+        if owned is not None and id(part) not in owned:
+            part = parts[position] = part.copy()
+            owned.add(id(part))
+        return part
+
+    def copy(self) -> 'ChunkedSet':
+        """Return a copy in O(n / CHUNK) that shares every part with this one.
+
+        Both sides copy a part before their first change to it.
+        """
+        other = object.__new__(type(self))
+        other._index = list(self._index)
+        other._chunks = list(self._chunks)
+        other._mask = self._mask
+        other._len = self._len
+        other._gaps = self._gaps
+        other._tail = self._tail
+        other._owned = set()
+        self._owned = set()
+        return other
+
+    def add(self, key) -> bool:
+        """Append ``key`` unless it is present; return whether it was added."""
+        position = hash(key) & self._mask
+        bucket = self._index[position]
+        if key in bucket:
+            return False
+        owned = self._owned
+        if owned is not None and id(bucket) not in owned:
+            bucket = self._own(self._index, position)
+        chunk = self._chunks[self._tail]
+        if len(chunk) == CHUNK or (owned is not None and id(chunk) not in owned):
+            chunk = self._writable_tail()
+        chunk.append(key)
+        bucket[key] = self._tail
+        self._len += 1
+        if self._len > len(self._index) * LOAD:
+            self._grow()
+        return True
+
+    def update(self, keys) -> None:
+        """Add each of ``keys`` in turn; ``add`` in one loop, for bulk loads."""
+        index, mask, owned = self._index, self._mask, self._owned
+        number = self._tail
+        chunk = self._chunks[number]
+        limit = len(index) * LOAD
+        for key in keys:
+            position = hash(key) & mask
+            bucket = index[position]
+            if key in bucket:
+                continue
+            if owned is not None and id(bucket) not in owned:
+                bucket = self._own(index, position)
+            if len(chunk) == CHUNK or (owned is not None and id(chunk) not in owned):
+                chunk = self._writable_tail()
+                number = self._tail
+            chunk.append(key)
+            bucket[key] = number
+            self._len += 1
+            if self._len > limit:
+                self._grow()
+                index, mask = self._index, self._mask
+                limit = len(index) * LOAD
+
+    def _writable_tail(self) -> list:
+        """Return the last chunk, copied if it is shared, or a new one if it is full."""
+        chunks = self._chunks
+        if len(chunks[self._tail]) < CHUNK:
+            return self._own(chunks, self._tail)
+        chunk = []
+        chunks.append(chunk)
+        self._tail = len(chunks) - 1
+        if self._owned is not None:
+            self._owned.add(id(chunk))
+        return chunk
+
+    def discard(self, key) -> bool:
+        """Remove ``key`` if it is present; return whether it was removed."""
+        position = hash(key) & self._mask
+        number = self._index[position].get(key)
+        if number is None:
+            return False
+        del self._own(self._index, position)[key]
+        chunk = self._own(self._chunks, number)
+        chunk[chunk.index(key)] = _GAP
+        self._len -= 1
+        self._gaps += 1
+        if self._gaps > CHUNK and self._gaps > self._len:
+            self._rebuild()
+        return True
+
+    def parts(self) -> list:
+        """Return the outer lists and every bucket and chunk."""
+        return [self._index, *self._index, self._chunks, *self._chunks]
+
+    def __contains__(self, key) -> bool:
+        return key in self._index[hash(key) & self._mask]
+
+    def __iter__(self):
+        return filter(_present, chain.from_iterable(self._chunks))
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + sum(map(sys.getsizeof, self.parts()))
+
+
+class ChunkedMap(ChunkedSet):
+    """An insertion-ordered map; a value keeps its key's position when replaced."""
+
+    __slots__ = ('_values',)
+
+    def __init__(self, items=()) -> None:
+        items = dict(items)
+        self._build(list(items), list(items.values()))
+
+    def _build(self, keys: list, values: list = ()) -> None:
+        super()._build(keys)
+        buckets = [{} for _ in self._index]
+        mask = self._mask
+        for key, value in zip(keys, values):
+            buckets[hash(key) & mask][key] = value
+        self._values = buckets
+
+    def _rebuild(self) -> None:
+        keys = list(self)
+        self._build(keys, [self[key] for key in keys])
+
+    def _grow(self) -> None:
+        self._values = self._rehash(self._values, len(self._values) * GROWTH - 1)
+        super()._grow()
+
+    def copy(self) -> 'ChunkedMap':
+        other = super().copy()
+        other._values = list(self._values)
+        return other
+
+    def add(self, key) -> bool:
+        raise TypeError("ChunkedMap keys are added by assigning a value")
+
+    def update(self, keys) -> None:
+        raise TypeError("ChunkedMap keys are added by assigning a value")
+
+    def discard(self, key) -> bool:
+        position = hash(key) & self._mask
+        if key not in self._values[position]:
+            return False
+        del self._own(self._values, position)[key]
+        return super().discard(key)
+
+    def get(self, key, default=None):
+        return self._values[hash(key) & self._mask].get(key, default)
+
+    def items(self):
+        buckets, mask = self._values, self._mask
+        for key in self:
+            yield key, buckets[hash(key) & mask][key]
+
+    def values(self):
+        """Return the values bucket by bucket, not in key order; for totals."""
+        return chain.from_iterable(bucket.values() for bucket in self._values)
+
+    def parts(self) -> list:
+        return [*super().parts(), self._values, *self._values]
+
+    def __getitem__(self, key):
+        return self._values[hash(key) & self._mask][key]
+
+    def __setitem__(self, key, value) -> None:
+        position = hash(key) & self._mask
+        bucket = self._values[position]
+        if self._owned is not None and id(bucket) not in self._owned:
+            bucket = self._own(self._values, position)
+        # The value goes in first: adding the key may grow the buckets.
+        bucket[key] = value
+        if key not in self._index[position]:
+            super().add(key)
+
+    def __delitem__(self, key) -> None:
+        if not self.discard(key):
+            raise KeyError(key)
@@ -1,3 +1,4 @@
+import sys
 from collections.abc import Sequence
 from itertools import cycle
 class CircularListIterator():
@@ -63,3 +64,6 @@ class CircularList():
     
     def __repr__(self) -> str:
         return f"CircularList({self._items})"
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + sys.getsizeof(self._items)
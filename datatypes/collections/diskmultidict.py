@@ -0,0 +1,81 @@
+from typing import Any, Generic, Iterator, List, Tuple, TypeVar
+
+from .logstore import LogStore
+
+KT = TypeVar('KT')
+VT = TypeVar('VT')
+
+
+class DiskMultiDict(Generic[KT, VT]):
+    """A ``MultiDict`` kept on disk, for more values than fit in memory.
+
+    Values are appended to a log in ``path`` and found through a
+    memory-mapped hash index; see ``logstore``. Keys and values are limited
+    to None, bool, int, float, str, bytes and tuples of them. Close the
+    dictionary (or use it as a context manager) so it reopens without
+    rebuilding its index.
+    """
+
+    def __init__(self, path: str, **options: Any):
+        """Open or create the dictionary stored in the directory ``path``.
+
+        Args:
+            path: Directory holding the dictionary's files.
+            **options: Tuning options passed to ``LogStore``.
+        """
+        self._store = LogStore(path, **options)
+
+    def add(self, key: KT, value: VT) -> None:
+        """Add a value to a key."""
+        self._store.add(key, value)
+
+    def get(self, key: KT) -> List[VT]:
+        """Get all values for a key."""
+        return self._store.get(key)
+
+    def get_one(self, key: KT) -> VT:
+        """Get the first value for a key."""
+        values = self.get(key)
+        if not values:
+            raise KeyError(key)
+        return values[0]
+
+    def remove(self, key: KT, value: VT = None) -> None:
+        """Remove a specific value for a key, or all values if value is None."""
+        if value is None:
+            self._store.remove_key(key)
+        else:
+            self._store.remove_value(key, value)
+
+    def items(self) -> Iterator[Tuple[KT, VT]]:
+        """Return all key-value pairs."""
+        for key in self._store.keys():
+            for value in self._store.get(key):
+                yield key, value
+
+    def __len__(self) -> int:
+        return self._store.value_count
+
+    def __str__(self) -> str:
+        return str(dict(self.items()))
+
+    def __repr__(self) -> str:
+        return f"DiskMultiDict({self._store.path!r}, len={len(self)})"
+
+    def compact(self, wait: bool = True) -> None:
+        """Rewrite the log so every key's values are read with one record."""
+        self._store.compact(wait)
+
+    def flush(self) -> None:
+        """Write pending changes to disk."""
+        self._store.flush()
+
+    def close(self) -> None:
+        """Flush and close the dictionary."""
+        self._store.close()
+
+    def __enter__(self) -> 'DiskMultiDict[KT, VT]':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
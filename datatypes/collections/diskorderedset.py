@@ -0,0 +1,72 @@
+from .logstore import LogStore
+
+
+class DiskOrderedSet:
+    """An ``OrderedSet`` kept on disk, for more items than fit in memory.
+
+    Items are appended to a log in ``path`` and found through a
+    memory-mapped hash index; see ``logstore``. Items are limited to None,
+    bool, int, float, str, bytes and tuples of them. Close the set (or use
+    it as a context manager) so it reopens without rebuilding its index.
+    """
+
+    def __init__(self, path, iterable=None, **options):
+        """Open or create the set stored in the directory ``path``.
+
+        Args:
+            path: Directory holding the set's files.
+            iterable: Items to add after opening.
+            **options: Tuning options passed to ``LogStore``.
+        """
+        self._store = LogStore(path, **options)
+        if iterable is not None:
+            self.update(iterable)
+
+    def add(self, item):
+        """Add an item to the set."""
+        if not self._store.contains(item):
+            self._store.add(item, None)
+
+    def discard(self, item):
+        """Remove an item from the set if it exists."""
+        self._store.remove_key(item)
+
+    def remove(self, item):
+        """Remove an item from the set, raising KeyError if not found."""
+        if not self._store.remove_key(item):
+            raise KeyError(item)
+
+    def update(self, iterable):
+        """Update the set with items from an iterable."""
+        for item in iterable:
+            self.add(item)
+
+    def __iter__(self):
+        return self._store.keys()
+
+    def __len__(self):
+        return len(self._store)
+
+    def __contains__(self, item):
+        return self._store.contains(item)
+
+    def __repr__(self):
+        return f"DiskOrderedSet({self._store.path!r}, len={len(self)})"
+
+    def compact(self, wait=True):
+        """Rewrite the log without removed items."""
+        self._store.compact(wait)
+
+    def flush(self):
+        """Write pending changes to disk."""
+        self._store.flush()
+
+    def close(self):
+        """Flush and close the set."""
+        self._store.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
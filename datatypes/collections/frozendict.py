@@ -1,3 +1,4 @@
+import sys
 from typing import TypeVar, Generic, Dict, Iterator
 
 
@@ -42,3 +43,20 @@ class FrozenDict(dict):
     
     def __repr__(self):
         return f"FrozenDict({self._dict})"
+
+    def __sizeof__(self):
+        # The dict base class stays empty; the items live in a second dict.
+        return dict.__sizeof__(self) + sys.getsizeof(self._dict)
+
+    def share(self, name=None):
+        """Freeze the dictionary into shared memory for other processes.
+
+        Args:
+            name: Name of the shared memory segment; random if omitted.
+
+        Returns:
+            SharedFrozenDict: The shared table; attach to it elsewhere with
+            ``SharedFrozenDict.attach(name)`` or by pickling it.
+        """
+        from .sharedfrozendict import SharedFrozenDict
+        return SharedFrozenDict.create(self._dict, name)
@@ -1,8 +1,5 @@
-from __data__ import disabled, disabletype, version
-import sys
-from pathlib import Path
-sys.path.append(str(Path(__file__).parent.parent))
-from others.errors.errordevfile import (
+from .__data__ import disabled, disabletype, version
+from ..others.errors.errordevfile import (
     ImportDisabledError, 
     ImportDisabledWarning,
     VersionIsIndevError,
@@ -0,0 +1,688 @@
+"""Append-only log with a memory-mapped hash index, for disk-backed collections.
+
+A store maps keys to lists of values. Every change is appended to a log as
+a checksummed record that points back to the previous record of the same
+key, so a key's state is read by following its chain from the newest
+record. An open-addressing hash table in a memory-mapped file maps each
+key to the newest record of its chain, so a lookup touches one index slot
+and then the log.
+
+Compaction rewrites the live state into a new generation with one record
+per key, so afterwards every lookup reads exactly one record. It runs on a
+background thread while the store stays usable; if it fails, the next
+write (or ``close``) raises the error. The generation in use is
+named by the ``CURRENT`` file, which is replaced atomically, so a crash
+during compaction leaves the old generation intact. A store that was not
+closed cleanly rebuilds its index from the log when reopened, dropping a
+torn last record.
+
+Keys and values must be encodable by ``sharedfrozendict.encode``: None,
+bool, int, float, str, bytes and tuples of them.
+"""
+import mmap
+import os
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Iterator, List, Optional, Tuple
+
+from .sharedfrozendict import decode, encode, stable_hash
+
+OP_ADD = 1           # value: one value
+OP_BLOCK = 2         # value: tuple of values, written by compaction
+OP_REMOVE_VALUE = 3  # value: (value, number of copies removed)
+OP_REMOVE_KEY = 4    # value: number of values removed
+
+_RECORD = struct.Struct('>IIBQ')  # crc32, payload length, op, previous record + 1
+_INDEX_MAGIC = b'LSI1'
+_INDEX_HEADER = struct.Struct('>4sIQQQQQQB')  # magic, version, capacity, used slots,
+                                              # live keys, values, records, log length, clean
+_INDEX_DATA = 128
+_SLOT = struct.Struct('>QQQ')  # key hash, head record + 1, chain start + 1 (0 = none)
+_VERSION = 1
+_MAX_LOAD = 0.6
+
+
+class _Index:
+    """The memory-mapped hash table from key hashes to chain heads."""
+
+    def __init__(self, path: str, capacity: Optional[int] = None) -> None:
+        self.path = path
+        if capacity is not None:
+            with open(path, 'wb') as f:
+                f.truncate(_INDEX_DATA + capacity * _SLOT.size)
+        self._file = open(path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        if capacity is not None:
+            self.capacity, self.used, self.live_keys, self.values, self.records = capacity, 0, 0, 0, 0
+            self.log_length, self.clean = 0, False
+            self.write_header()
+        else:
+            (magic, version, self.capacity, self.used, self.live_keys, self.values,
+             self.records, self.log_length, clean) = _INDEX_HEADER.unpack_from(self._map, 0)
+            if magic != _INDEX_MAGIC or version != _VERSION or \
+                    len(self._map) != _INDEX_DATA + self.capacity * _SLOT.size:
+                self.close()
+                raise ValueError("Not a valid index file")
+            self.clean = bool(clean)
+        self.mask = self.capacity - 1
+
+    def write_header(self) -> None:
+        _INDEX_HEADER.pack_into(self._map, 0, _INDEX_MAGIC, _VERSION, self.capacity, self.used,
+                                self.live_keys, self.values, self.records, self.log_length,
+                                int(self.clean))
+
+    def slot(self, i: int) -> Tuple[int, int, int]:
+        """Return ``(hash, head, start)`` of a slot; offsets are -1 when unset."""
+        h, head, start = _SLOT.unpack_from(self._map, _INDEX_DATA + i * _SLOT.size)
+        return h, head - 1, start - 1
+
+    def set_slot(self, i: int, h: int, head: int, start: int) -> None:
+        _SLOT.pack_into(self._map, _INDEX_DATA + i * _SLOT.size, h, head + 1, start + 1)
+
+    def probe(self, h: int) -> Iterator[int]:
+        """Yield the slots to try for a hash, ending with the first empty one."""
+        i = h & self.mask
+        while True:
+            yield i
+            if self.slot(i)[1] < 0:
+                return
+            i = (i + 1) & self.mask
+
+    def occupied(self) -> Iterator[Tuple[int, int, int]]:
+        for i in range(self.capacity):
+            h, head, start = self.slot(i)
+            if head >= 0:
+                yield h, head, start
+
+    def sync(self) -> None:
+        self._map.flush()
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+
+class _Reader:
+    """Reads records from a log file through a small LRU cache of pages."""
+
+    def __init__(self, fd: int, page_size: int, cache_pages: int) -> None:
+        self.fd = fd
+        self.page_size = page_size
+        self.cache_pages = cache_pages
+        self._pages: 'OrderedDict[int, bytes]' = OrderedDict()
+
+    def read(self, offset: int, size: int, limit: int) -> bytes:
+        """Read ``size`` bytes at ``offset``; only pages wholly below ``limit`` are cached."""
+        if not self.cache_pages:
+            return os.pread(self.fd, size, offset)
+        out = []
+        end = offset + size
+        while offset < end:
+            number, start = divmod(offset, self.page_size)
+            page = self._pages.get(number)
+            if page is not None:
+                self._pages.move_to_end(number)
+            else:
+                page = os.pread(self.fd, self.page_size, number * self.page_size)
+                if (number + 1) * self.page_size <= limit:
+                    self._pages[number] = page
+                    if len(self._pages) > self.cache_pages:
+                        self._pages.popitem(last=False)
+            chunk = page[start:start + end - offset]
+            if not chunk:
+                break
+            out.append(chunk)
+            offset += len(chunk)
+        return b''.join(out)
+
+    def clear(self) -> None:
+        self._pages.clear()
+
+
+class _Record:
+    __slots__ = ('offset', 'op', 'prev', 'payload', 'key_end')
+
+    def __init__(self, offset: int, op: int, prev: int, payload: bytes) -> None:
+        self.offset = offset
+        self.op = op
+        self.prev = prev
+        self.payload = payload
+        self.key_end = decode(payload, 0)[1]
+
+    @property
+    def size(self) -> int:
+        return _RECORD.size + len(self.payload)
+
+    @property
+    def key(self) -> Any:
+        return decode(self.payload, 0)[0]
+
+    @property
+    def value(self) -> Any:
+        return decode(self.payload, self.key_end)[0]
+
+
+def _pack_record(op: int, prev: int, payload: bytes) -> bytes:
+    body = struct.pack('>BQ', op, prev + 1) + payload
+    return struct.pack('>II', zlib.crc32(body), len(payload)) + body
+
+
+class _Segment:
+    """One generation of a store: its log file and its index."""
+
+    def __init__(self, directory: str, generation: int, page_size: int, cache_pages: int,
+                 batch_bytes: int, create: bool = False) -> None:
+        self.generation = generation
+        self.log_path = os.path.join(directory, f'log.{generation}')
+        self.index_path = os.path.join(directory, f'index.{generation}')
+        self.batch_bytes = batch_bytes
+        flags = os.O_RDWR | os.O_CREAT | os.O_APPEND | (os.O_TRUNC if create else 0)
+        self.fd = os.open(self.log_path, flags, 0o644)
+        self.flushed = os.fstat(self.fd).st_size
+        self.pending = bytearray()
+        self.reader = _Reader(self.fd, page_size, cache_pages)
+        self.index = None
+        if not create:
+            try:
+                self.index = _Index(self.index_path)
+            except (OSError, ValueError):
+                self.index = None
+        if self.index is None or not self.index.clean or self.index.log_length != self.flushed:
+            if self.index is not None:
+                self.index.close()
+            self._rebuild_index()
+        self.index.clean = False
+        self.index.write_header()
+        self.index.sync()
+
+    # -- log -------------------------------------------------------------
+
+    @property
+    def end(self) -> int:
+        return self.flushed + len(self.pending)
+
+    def append(self, op: int, key_enc: bytes, value: Any, prev: int) -> int:
+        offset = self.end
+        self.pending += _pack_record(op, prev, key_enc + encode(value))
+        self.index.records += 1
+        if len(self.pending) >= self.batch_bytes:
+            self.flush()
+        return offset
+
+    def flush(self) -> None:
+        """Write the batched records to the log file."""
+        if self.pending:
+            os.write(self.fd, self.pending)
+            self.flushed += len(self.pending)
+            self.pending = bytearray()
+
+    def read(self, offset: int, reader: Optional[_Reader] = None) -> _Record:
+        if offset >= self.flushed:
+            start = offset - self.flushed
+            head = bytes(self.pending[start:start + _RECORD.size])
+            _, length, op, prev = _RECORD.unpack(head)
+            payload = bytes(self.pending[start + _RECORD.size:start + _RECORD.size + length])
+        else:
+            reader = reader or self.reader
+            head = reader.read(offset, _RECORD.size, self.flushed)
+            _, length, op, prev = _RECORD.unpack(head)
+            payload = reader.read(offset + _RECORD.size, length, self.flushed)
+        return _Record(offset, op, prev - 1, payload)
+
+    def scan(self, start: int, end: int, chunk: int = 1 << 20) -> Iterator[_Record]:
+        """Yield the flushed records in ``[start, end)`` in log order, checking checksums.
+
+        Stops at the first torn or corrupt record.
+        """
+        buffer = b''
+        base = start
+        offset = start
+        while offset < end:
+            pos = offset - base
+            if len(buffer) - pos < _RECORD.size:
+                buffer = buffer[pos:] + os.pread(self.fd, chunk, base + len(buffer))
+                base = offset
+                pos = 0
+                if len(buffer) < _RECORD.size:
+                    return
+            crc, length, op, prev = _RECORD.unpack_from(buffer, pos)
+            size = _RECORD.size + length
+            while len(buffer) - pos < size:
+                more = os.pread(self.fd, max(chunk, size), base + len(buffer))
+                if not more:
+                    return
+                buffer += more
+            if offset + size > end or zlib.crc32(buffer[pos + 8:pos + size]) != crc:
+                return
+            yield _Record(offset, op, prev - 1, buffer[pos + _RECORD.size:pos + size])
+            offset += size
+
+    # -- index -----------------------------------------------------------
+
+    def find(self, key: Any, key_enc: bytes, h: Optional[int] = None) -> Tuple[int, int, int]:
+        """Return ``(slot, head, start)`` for a key; head is -1 if it was never stored."""
+        h = stable_hash(key) if h is None else h
+        for i in self.index.probe(h):
+            slot_hash, head, start = self.index.slot(i)
+            if head < 0:
+                return i, -1, -1
+            if slot_hash == h:
+                record = self.read(head)
+                if record.payload[:record.key_end] == key_enc or record.key == key:
+                    return i, head, start
+
+    def state(self, head: int, below: Optional[int] = None,
+              reader: Optional[_Reader] = None) -> Tuple[List[Any], int]:
+        """Follow a chain from ``head`` and return ``(values, chain start)``.
+
+        Records at or above ``below`` are skipped, giving the state as of
+        that log offset. The start is -1 if the key has no values.
+        """
+        removed: List[Any] = []
+        values: List[Any] = []
+        offset = head
+        start = -1
+        while offset >= 0:
+            record = self.read(offset, reader)
+            if below is not None and offset >= below:
+                offset = record.prev
+                continue
+            if record.op == OP_REMOVE_KEY:
+                break
+            start = offset
+            if record.op == OP_REMOVE_VALUE:
+                removed.append(record.value[0])
+            elif record.op == OP_ADD:
+                value = record.value
+                if not any(value == r for r in removed):
+                    values.append(value)
+            else:
+                values.extend(v for v in reversed(record.value) if not any(v == r for r in removed))
+            offset = record.prev
+        values.reverse()
+        return values, (start if values else -1)
+
+    def apply(self, slot: int, h: int, head: int, start: int, op: int,
+              key_enc: bytes, value: Any) -> int:
+        """Append a record for a key and update its slot and the counters."""
+        live = head >= 0 and start >= 0
+        offset = self.append(op, key_enc, value, head)
+        if op in (OP_ADD, OP_BLOCK):
+            if not live:
+                start = offset
+                self.index.live_keys += 1
+            self.index.values += 1 if op == OP_ADD else len(value)
+        elif op == OP_REMOVE_VALUE:
+            self.index.values -= value[1]
+        else:
+            self.index.live_keys -= 1
+            self.index.values -= value
+            start = -1
+        if head < 0:
+            self.index.used += 1
+        self.index.set_slot(slot, h, offset, start)
+        if self.index.used > self.index.capacity * _MAX_LOAD:
+            self._grow()
+        return offset
+
+    def _grow(self) -> None:
+        old = self.index
+        tmp = self.index_path + '.tmp'
+        new = _Index(tmp, old.capacity * 2)
+        for h, head, start in old.occupied():
+            for i in new.probe(h):
+                if new.slot(i)[1] < 0:
+                    new.set_slot(i, h, head, start)
+                    break
+        new.used, new.live_keys, new.values, new.records = old.used, old.live_keys, old.values, old.records
+        new.write_header()
+        old.close()
+        new.close()
+        os.replace(tmp, self.index_path)
+        self.index = _Index(self.index_path)
+
+    def _rebuild_index(self) -> None:
+        """Replay the whole log into a fresh index, cutting off a torn tail."""
+        self.index = _Index(self.index_path, 1024)
+        valid = 0
+        for record in self.scan(0, self.flushed):
+            key = record.key
+            key_enc = record.payload[:record.key_end]
+            h = stable_hash(key)
+            slot, head, start = self.find(key, key_enc, h)
+            live = head >= 0 and start >= 0
+            value = record.value
+            if record.op in (OP_ADD, OP_BLOCK):
+                if not live:
+                    start = record.offset
+                    self.index.live_keys += 1
+                self.index.values += 1 if record.op == OP_ADD else len(value)
+            elif record.op == OP_REMOVE_VALUE:
+                self.index.values -= value[1]
+            else:
+                self.index.live_keys -= 1
+                self.index.values -= value
+                start = -1
+            if head < 0:
+                self.index.used += 1
+            self.index.set_slot(slot, h, record.offset, start)
+            self.index.records += 1
+            if self.index.used > self.index.capacity * _MAX_LOAD:
+                self._grow()
+            valid = record.offset + record.size
+        if valid < self.flushed:
+            os.ftruncate(self.fd, valid)
+            self.flushed = valid
+            # Pages read while rebuilding may hold the bytes just cut off,
+            # which new records will overwrite.
+            self.reader.clear()
+
+    # -- lifecycle -------------------------------------------------------
+
+    def sync(self) -> None:
+        """Flush batched records and the index to stable storage."""
+        self.flush()
+        os.fsync(self.fd)
+        self.index.log_length = self.flushed
+        self.index.write_header()
+        self.index.sync()
+
+    def close(self, clean: bool = True) -> None:
+        self.sync()
+        if clean:
+            self.index.clean = True
+            self.index.write_header()
+            self.index.sync()
+        self.index.close()
+        os.close(self.fd)
+
+
+class LogStore:
+    """A persistent, thread-safe map from keys to lists of values."""
+
+    def __init__(self, path: str, page_size: int = 1 << 16, cache_pages: int = 256,
+                 batch_bytes: int = 1 << 20, compact_ratio: float = 2.0,
+                 compact_min_records: int = 100_000) -> None:
+        """Open or create a store.
+
+        Args:
+            path: Directory holding the store's files.
+            page_size: Size of the pages kept in the read cache.
+            cache_pages: Number of pages kept in the read cache.
+            batch_bytes: Records are written to the log in batches of
+                about this many bytes.
+            compact_ratio: Compact in the background once the log holds
+                this many times more records than live values and keys.
+            compact_min_records: Never compact automatically below this
+                many records.
+        """
+        self.path = path
+        self._options = (page_size, cache_pages, batch_bytes)
+        self._compact_ratio = compact_ratio
+        self._compact_min_records = compact_min_records
+        self._lock = threading.RLock()
+        self._compactor: Optional[threading.Thread] = None
+        self.compaction_error: Optional[BaseException] = None
+        os.makedirs(path, exist_ok=True)
+        current = os.path.join(path, 'CURRENT')
+        try:
+            with open(current) as f:
+                generation = int(f.read().strip())
+        except (OSError, ValueError):
+            generation = 0
+        self._remove_generations(keep=generation)
+        self._segment = _Segment(path, generation, *self._options)
+
+    def _remove_generations(self, keep: int) -> None:
+        # Leftovers of an interrupted compaction or of replaced generations.
+        for name in os.listdir(self.path):
+            base, _, suffix = name.partition('.')
+            if base in ('log', 'index') and suffix.split('.')[0].isdigit() \
+                    and int(suffix.split('.')[0]) != keep:
+                os.remove(os.path.join(self.path, name))
+
+    # -- reads -----------------------------------------------------------
+
+    def get(self, key: Any) -> List[Any]:
+        """Return the values of a key, oldest first."""
+        key_enc = encode(key)
+        with self._lock:
+            _, head, start = self._segment.find(key, key_enc)
+            if start < 0:
+                return []
+            return self._segment.state(head)[0]
+
+    def contains(self, key: Any) -> bool:
+        """Return whether a key has any values."""
+        try:
+            key_enc = encode(key)
+        except TypeError:
+            return False
+        with self._lock:
+            return self._segment.find(key, key_enc)[2] >= 0
+
+    def keys(self) -> Iterator[Any]:
+        """Yield the keys with values, in the order they were first added.
+
+        Keys added while iterating are not included.
+        """
+        with self._lock:
+            segment = self._segment
+            segment.flush()
+            end = segment.end
+        offset = 0
+        while offset < end:
+            with self._lock:
+                if self._segment is not segment:
+                    raise RuntimeError("Store was compacted during iteration")
+                batch = []
+                for record in segment.scan(offset, end):
+                    offset = record.offset + record.size
+                    if record.op in (OP_ADD, OP_BLOCK):
+                        key = record.key
+                        _, _, start = segment.find(key, record.payload[:record.key_end])
+                        if start == record.offset:
+                            batch.append(key)
+                    if len(batch) >= 1024:
+                        break
+                else:
+                    offset = end
+            yield from batch
+
+    def __len__(self) -> int:
+        return self._segment.index.live_keys
+
+    @property
+    def value_count(self) -> int:
+        """Total number of values over all keys."""
+        return self._segment.index.values
+
+    # -- writes ----------------------------------------------------------
+
+    def add(self, key: Any, value: Any) -> None:
+        """Append a value to a key."""
+        key_enc = encode(key)
+        encode(value)
+        with self._lock:
+            self._raise_compaction_error()
+            segment = self._segment
+            h = stable_hash(key)
+            slot, head, start = segment.find(key, key_enc, h)
+            segment.apply(slot, h, head, start, OP_ADD, key_enc, value)
+            self._maybe_compact()
+
+    def remove_key(self, key: Any) -> int:
+        """Remove a key and all its values, returning how many values went."""
+        try:
+            key_enc = encode(key)
+        except TypeError:
+            return 0
+        with self._lock:
+            self._raise_compaction_error()
+            segment = self._segment
+            h = stable_hash(key)
+            slot, head, start = segment.find(key, key_enc, h)
+            if start < 0:
+                return 0
+            count = len(segment.state(head)[0])
+            segment.apply(slot, h, head, start, OP_REMOVE_KEY, key_enc, count)
+            self._maybe_compact()
+            return count
+
+    def remove_value(self, key: Any, value: Any) -> int:
+        """Remove every copy of a value from a key, returning how many went."""
+        try:
+            key_enc = encode(key)
+            encode(value)
+        except TypeError:
+            return 0
+        with self._lock:
+            self._raise_compaction_error()
+            segment = self._segment
+            h = stable_hash(key)
+            slot, head, start = segment.find(key, key_enc, h)
+            if start < 0:
+                return 0
+            values = segment.state(head)[0]
+            count = sum(1 for v in values if v == value)
+            if not count:
+                return 0
+            if count == len(values):
+                segment.apply(slot, h, head, start, OP_REMOVE_KEY, key_enc, count)
+            else:
+                segment.apply(slot, h, head, start, OP_REMOVE_VALUE, key_enc, (value, count))
+            self._maybe_compact()
+            return count
+
+    # -- compaction ------------------------------------------------------
+
+    def _raise_compaction_error(self) -> None:
+        """Report a failed background compaction once, before the write it interrupts.
+
+        Raises:
+            RuntimeError: Chained to the compaction's exception. The store
+                still uses its old generation, so no data is lost.
+        """
+        if self.compaction_error is not None:
+            error, self.compaction_error = self.compaction_error, None
+            raise RuntimeError(f"Background compaction of {self.path!r} failed") from error
+
+    def _maybe_compact(self) -> None:
+        index = self._segment.index
+        if index.records >= self._compact_min_records and \
+                index.records > self._compact_ratio * (index.values + index.live_keys):
+            self.compact(wait=False)
+
+    def compact(self, wait: bool = True) -> None:
+        """Rewrite the live state into a new generation with one record per key.
+
+        Args:
+            wait: Block until done; otherwise compaction runs on a
+                background thread while the store stays usable, and an
+                error is raised by the next write or ``close``.
+
+        Raises:
+            Exception: Whatever made compaction fail, if ``wait`` is True.
+        """
+        with self._lock:
+            if self._compactor is None or not self._compactor.is_alive():
+                self._compactor = threading.Thread(target=self._compact, name='logstore-compact',
+                                                   daemon=True)
+                self._compactor.start()
+            compactor = self._compactor
+        if wait:
+            compactor.join()
+            with self._lock:
+                error, self.compaction_error = self.compaction_error, None
+            if error is not None:
+                raise error
+
+    def _compact(self) -> None:
+        try:
+            with self._lock:
+                old = self._segment
+                old.flush()
+                end = old.flushed
+            new = _Segment(self.path, old.generation + 1, *self._options, create=True)
+            try:
+                self._copy_prefix(old, new, end)
+                with self._lock:
+                    old.flush()
+                    self._replay(old, new, end, old.flushed)
+                    new.sync()
+                    new.close()
+                    tmp = os.path.join(self.path, 'CURRENT.tmp')
+                    with open(tmp, 'w') as f:
+                        f.write(str(new.generation))
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp, os.path.join(self.path, 'CURRENT'))
+                    old.close()
+                    self._segment = _Segment(self.path, new.generation, *self._options)
+                    self._remove_generations(keep=new.generation)
+            except BaseException:
+                if new.fd is not None:
+                    try:
+                        new.close(clean=False)
+                    except OSError:
+                        pass
+                raise
+        except BaseException as e:
+            with self._lock:
+                self.compaction_error = e
+
+    def _copy_prefix(self, old: _Segment, new: _Segment, end: int) -> None:
+        """Write each key's state as of log offset ``end`` as one block record."""
+        reader = _Reader(old.fd, 0, 0)
+        for record in old.scan(0, end):
+            if record.op not in (OP_ADD, OP_BLOCK):
+                continue
+            # Only the first record of a chain can be where the key starts.
+            if record.prev >= 0 and old.read(record.prev, reader).op != OP_REMOVE_KEY:
+                continue
+            key = record.key
+            key_enc = record.payload[:record.key_end]
+            with self._lock:
+                _, head, _ = old.find(key, key_enc)
+                while head >= end:
+                    head = old.read(head).prev
+            values, start = old.state(head, reader=reader)
+            if start != record.offset:
+                continue
+            h = stable_hash(key)
+            slot, new_head, new_start = new.find(key, key_enc, h)
+            new.apply(slot, h, new_head, new_start, OP_BLOCK, key_enc, tuple(values))
+
+    def _replay(self, old: _Segment, new: _Segment, start: int, end: int) -> None:
+        """Apply the records written to ``old`` during compaction to ``new``."""
+        for record in old.scan(start, end):
+            key = record.key
+            key_enc = record.payload[:record.key_end]
+            h = stable_hash(key)
+            slot, head, chain_start = new.find(key, key_enc, h)
+            new.apply(slot, h, head, chain_start, record.op, key_enc, record.value)
+
+    # -- lifecycle -------------------------------------------------------
+
+    def flush(self) -> None:
+        """Write batched records and the index to disk."""
+        with self._lock:
+            self._segment.sync()
+
+    def close(self) -> None:
+        """Wait for compaction, flush everything and mark the store clean.
+
+        Raises:
+            RuntimeError: If a background compaction failed and no write
+                has reported it yet; the store is closed regardless.
+        """
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+        with self._lock:
+            if self._segment is not None:
+                self._segment.close()
+                self._segment = None
+            self._raise_compaction_error()
@@ -1,19 +1,52 @@
-from typing import Any, List, TypeVar, Generic
+import sys
+import time
+from typing import Any, Iterator, List, Tuple, TypeVar, Generic
+
+from .chunked import ChunkedMap
 
 KT = TypeVar('KT')
 VT = TypeVar('VT')
 
 class MultiDict(Generic[KT, VT]):
-    """A dictionary that can store multiple values for each key."""
+    """A dictionary that can store multiple values for each key.
+
+    ``snapshot`` returns a read-only view in O(1) that shares the storage.
+    Writers copy what they change afterwards: the first write copies the
+    outer lists of the chunked key storage, each write copies the hash
+    bucket and order chunk it changes, and each key's list is copied on
+    its first change, so snapshots never change and readers need no lock.
+    """
     
     def __init__(self):
-        self._items = {}
+        self._items = ChunkedMap()
+        self._writing = False  # A write is in progress; snapshot() waits for it
+        self._shared = False  # _items is referenced by a snapshot
+        self._owned = None  # Keys whose lists were copied since the last snapshot; None = all
+    
+    def _writable(self) -> ChunkedMap:
+        if self._shared:
+            self._items = self._items.copy()
+            self._shared = False
+        return self._items
     
     def add(self, key: KT, value: VT) -> None:
         """Add a value to a key."""
-        if key not in self._items:
-            self._items[key] = []
-        self._items[key].append(value)
+        self._writing = True
+        try:
+            items = self._writable() if self._shared else self._items
+            values = items.get(key)
+            owned = self._owned
+            if values is None:
+                items[key] = [value]
+                if owned is not None:
+                    owned.add(key)
+            elif owned is None or key in owned:
+                values.append(value)
+            else:
+                items[key] = values + [value]
+                owned.add(key)
+        finally:
+            self._writing = False
     
     def get(self, key: KT) -> List[VT]:
         """Get all values for a key."""
@@ -28,13 +61,24 @@ class MultiDict(Generic[KT, VT]):
     
     def remove(self, key: KT, value: VT = None) -> None:
         """Remove a specific value for a key, or all values if value is None."""
-        if value is None:
-            self._items.pop(key, None)
-        else:
-            if key in self._items:
-                self._items[key] = [v for v in self._items[key] if v != value]
-                if not self._items[key]:
-                    del self._items[key]
+        if key not in self._items:
+            return
+        self._writing = True
+        try:
+            items = self._writable()
+            if value is None:
+                del items[key]
+            else:
+                # Always a new list, so a snapshot's list is never touched.
+                values = [v for v in items[key] if v != value]
+                if values:
+                    items[key] = values
+                    if self._owned is not None:
+                        self._owned.add(key)
+                else:
+                    del items[key]
+        finally:
+            self._writing = False
     
     def items(self):
         """Return all key-value pairs."""
@@ -43,7 +87,79 @@ class MultiDict(Generic[KT, VT]):
                 yield key, value
     
     def __len__(self) -> int:
-        return sum(len(values) for values in self._items.values())
+        return sum(map(len, self._items.values()))
     
     def __str__(self) -> str:
         return str(dict(self.items()))
+
+    def snapshot(self) -> 'MultiDictSnapshot[KT, VT]':
+        """Return a read-only view of the current contents in O(1).
+
+        The view stays consistent however the dictionary changes later and
+        can be read from other threads without locking. Writers are not
+        locked either, so changes must come from one thread at a time, as
+        without snapshots. Lists returned by ``get`` must not be modified
+        in place, as they may be shared with a snapshot.
+        """
+        while True:
+            # A write that saw _shared still False finishes in place before
+            # the items are taken; one starting later copies them.
+            self._shared = True
+            while self._writing:
+                time.sleep(0)
+            self._owned = set()
+            items = self._items
+            if self._shared and not self._writing:
+                return MultiDictSnapshot(items)
+    
+    def __getstate__(self) -> dict:
+        return {'_items': dict(self._items.items())}
+    
+    def __setstate__(self, state: dict) -> None:
+        self._items = ChunkedMap(state['_items'])
+        self._writing = False
+        self._shared = False
+        self._owned = None
+    
+    def __sizeof__(self) -> int:
+        return (object.__sizeof__(self) + sys.getsizeof(self._items)
+                + sum(sys.getsizeof(values) for values in self._items.values()))
+
+
+class MultiDictSnapshot(Generic[KT, VT]):
+    """A read-only view of a ``MultiDict`` taken by ``MultiDict.snapshot``."""
+    
+    def __init__(self, items: ChunkedMap):
+        self._items = items
+        self._len = None
+    
+    def get(self, key: KT) -> Tuple[VT, ...]:
+        """Get all values for a key."""
+        return tuple(self._items.get(key, ()))
+    
+    def get_one(self, key: KT) -> VT:
+        """Get the first value for a key."""
+        values = self._items.get(key)
+        if not values:
+            raise KeyError(key)
+        return values[0]
+    
+    def items(self) -> Iterator[Tuple[KT, VT]]:
+        """Return all key-value pairs."""
+        for key, values in self._items.items():
+            for value in values:
+                yield key, value
+    
+    def __contains__(self, key: KT) -> bool:
+        return key in self._items
+    
+    def __len__(self) -> int:
+        if self._len is None:
+            self._len = sum(map(len, self._items.values()))
+        return self._len
+    
+    def __str__(self) -> str:
+        return str(dict(self.items()))
+    
+    def __repr__(self) -> str:
+        return f"MultiDictSnapshot({self})"
@@ -1,27 +1,75 @@
+import sys
+import time
+from collections.abc import Set
+from itertools import islice
+
+from .chunked import ChunkedSet
+
+_BATCH = 64  # Items update() adds under one write flag
+
+
 class OrderedSet:
-    """An ordered set implementation that maintains insertion order."""
+    """An ordered set implementation that maintains insertion order.
+
+    ``snapshot`` returns a read-only view in O(1) that shares the storage.
+    Writers copy what they change afterwards: the first write copies the
+    outer lists of the chunked storage, and each write copies the hash
+    bucket and order chunk it changes, so snapshots never change and
+    readers need no lock.
+    """
     
     def __init__(self, iterable=None):
-        self._items = dict()
-        if iterable is not None:
-            self.update(iterable)
+        self._items = ChunkedSet(() if iterable is None else iterable)
+        self._writing = False  # A write is in progress; snapshot() waits for it
+        self._shared = False  # _items is referenced by a snapshot
+    
+    def _writable(self):
+        if self._shared:
+            self._items = self._items.copy()
+            self._shared = False
+        return self._items
     
     def add(self, item):
         """Add an item to the set."""
-        self._items[item] = None
+        self._writing = True
+        try:
+            if self._shared:
+                self._writable()
+            self._items.add(item)
+        finally:
+            self._writing = False
     
     def discard(self, item):
         """Remove an item from the set if it exists."""
-        self._items.pop(item, None)
+        if item in self._items:
+            self._writing = True
+            try:
+                self._writable().discard(item)
+            finally:
+                self._writing = False
     
     def remove(self, item):
         """Remove an item from the set, raising KeyError if not found."""
-        del self._items[item]
+        if item not in self._items:
+            raise KeyError(item)
+        self.discard(item)
     
     def update(self, iterable):
         """Update the set with items from an iterable."""
-        for item in iterable:
-            self.add(item)
+        iterator = iter(iterable)
+        try:
+            while True:
+                # Flagged per batch, so snapshot() never waits for the whole update.
+                batch = list(islice(iterator, _BATCH))
+                if not batch:
+                    break
+                self._writing = True
+                if self._shared:
+                    self._writable()
+                self._items.update(batch)
+                self._writing = False
+        finally:
+            self._writing = False
     
     def __iter__(self):
         return iter(self._items)
@@ -34,3 +82,55 @@ class OrderedSet:
     
     def __repr__(self):
         return f"OrderedSet({list(self)})"
+
+    def snapshot(self):
+        """Return a read-only view of the current items in O(1).
+
+        The view stays consistent however the set changes later and can be
+        read from other threads without locking. Writers are not locked
+        either, so changes must come from one thread at a time, as without
+        snapshots.
+        """
+        while True:
+            # Same handshake with writers as MultiDict.snapshot.
+            self._shared = True
+            while self._writing:
+                time.sleep(0)
+            items = self._items
+            if self._shared and not self._writing:
+                return OrderedSetSnapshot(items)
+    
+    def __getstate__(self):
+        return {'_items': dict.fromkeys(self._items)}
+    
+    def __setstate__(self, state):
+        self._items = ChunkedSet(state['_items'])
+        self._writing = False
+        self._shared = False
+    
+    def __sizeof__(self):
+        return object.__sizeof__(self) + sys.getsizeof(self._items)
+
+
+class OrderedSetSnapshot(Set):
+    """A read-only view of an ``OrderedSet`` taken by ``OrderedSet.snapshot``."""
+    
+    def __init__(self, items):
+        self._items = items
+    
+    @classmethod
+    def _from_iterable(cls, iterable):
+        # Results of &, |, - and ^ are new snapshots, in iteration order.
+        return cls(ChunkedSet(iterable))
+    
+    def __iter__(self):
+        return iter(self._items)
+    
+    def __len__(self):
+        return len(self._items)
+    
+    def __contains__(self, item):
+        return item in self._items
+    
+    def __repr__(self):
+        return f"OrderedSetSnapshot({list(self)})"
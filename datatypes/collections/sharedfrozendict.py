@@ -0,0 +1,306 @@
+"""A read-only mapping stored in shared memory or a memory-mapped file.
+
+A ``SharedFrozenDict`` is frozen once into an open-addressing hash table
+inside a ``multiprocessing.shared_memory`` segment (or a file). Other
+processes attach to it by name and look keys up directly in the shared
+pages, without copying or unpickling the table, so N workers cost the RAM
+of one table.
+
+Keys and values are limited to ``None``, ``bool``, ``int``, ``float``,
+``str``, ``bytes`` and tuples of those. Hashes are computed with BLAKE2b
+over a canonical encoding, so they are identical in every process, and
+``1``, ``1.0`` and ``True`` find the same key just as in a dict.
+"""
+import hashlib
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+from multiprocessing import shared_memory
+from typing import Any, Iterator, Optional, Tuple
+
+_MAGIC = b'SFD1'
+_HEADER = struct.Struct('>4sIQQQ')  # magic, version, count, capacity, data offset
+_SLOT = struct.Struct('>QQ')        # key hash, entry offset + 1 (0 = empty)
+_ENTRY = struct.Struct('>II')       # key length, value length
+_LENGTH = struct.Struct('>I')
+_FLOAT = struct.Struct('>d')
+_VERSION = 1
+
+
+def _encode(value: Any, out: bytearray) -> None:
+    if value is None:
+        out += b'n'
+    elif value is True:
+        out += b't'
+    elif value is False:
+        out += b'f'
+    elif type(value) is int:
+        data = value.to_bytes((value.bit_length() + 8) // 8, 'big', signed=True)
+        out += b'i' + _LENGTH.pack(len(data)) + data
+    elif type(value) is float:
+        out += b'd' + _FLOAT.pack(value)
+    elif type(value) is str:
+        data = value.encode('utf-8', 'surrogatepass')
+        out += b's' + _LENGTH.pack(len(data)) + data
+    elif type(value) is bytes:
+        out += b'b' + _LENGTH.pack(len(value)) + value
+    elif type(value) is tuple:
+        out += b'u' + _LENGTH.pack(len(value))
+        for item in value:
+            _encode(item, out)
+    else:
+        raise TypeError(f"SharedFrozenDict cannot store {type(value).__name__!r} values; "
+                        f"supported types are None, bool, int, float, str, bytes and tuples of them")
+
+
+def encode(value: Any) -> bytes:
+    """Encode a supported value to its binary form.
+
+    Raises:
+        TypeError: If the value or anything inside it is of an unsupported type.
+    """
+    out = bytearray()
+    _encode(value, out)
+    return bytes(out)
+
+
+def decode(buffer, offset: int = 0) -> Tuple[Any, int]:
+    """Decode one value from ``buffer`` at ``offset``.
+
+    Returns:
+        tuple: The value and the offset just past it.
+    """
+    tag = buffer[offset]
+    offset += 1
+    if tag == 0x6e:  # n
+        return None, offset
+    if tag == 0x74:  # t
+        return True, offset
+    if tag == 0x66:  # f
+        return False, offset
+    if tag == 0x64:  # d
+        return _FLOAT.unpack_from(buffer, offset)[0], offset + 8
+    (length,) = _LENGTH.unpack_from(buffer, offset)
+    offset += 4
+    if tag == 0x69:  # i
+        return int.from_bytes(buffer[offset:offset + length], 'big', signed=True), offset + length
+    if tag == 0x73:  # s
+        return str(buffer[offset:offset + length], 'utf-8', 'surrogatepass'), offset + length
+    if tag == 0x62:  # b
+        return bytes(buffer[offset:offset + length]), offset + length
+    if tag == 0x75:  # u
+        items = []
+        for _ in range(length):
+            item, offset = decode(buffer, offset)
+            items.append(item)
+        return tuple(items), offset
+    raise ValueError(f"Corrupt SharedFrozenDict data: unknown tag {tag!r}")
+
+
+def _canonical(key: Any) -> Any:
+    # Equal keys must hash equally: True == 1 == 1.0 in a dict.
+    if type(key) is bool:
+        return int(key)
+    if type(key) is float and key.is_integer():
+        return int(key)
+    if type(key) is tuple:
+        return tuple(_canonical(k) for k in key)
+    return key
+
+
+def stable_hash(key: Any) -> int:
+    """Return a 64-bit hash of a key that is the same in every process."""
+    return _hash_encoded(encode(_canonical(key)))
+
+
+def _hash_encoded(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big')
+
+
+def _build(data: Mapping) -> bytearray:
+    entries = [(encode(k), encode(v), stable_hash(k)) for k, v in data.items()]
+    capacity = 8
+    while capacity < 2 * len(entries):
+        capacity *= 2
+    data_offset = _HEADER.size + capacity * _SLOT.size
+    slots = [(0, 0)] * capacity
+    out = bytearray(_HEADER.pack(_MAGIC, _VERSION, len(entries), capacity, data_offset))
+    out += bytes(capacity * _SLOT.size)
+    mask = capacity - 1
+    for key, value, h in entries:
+        i = h & mask
+        while slots[i][1]:
+            i = (i + 1) & mask
+        slots[i] = (h, len(out) + 1)
+        out += _ENTRY.pack(len(key), len(value)) + key + value
+    for i, (h, ref) in enumerate(slots):
+        if ref:
+            _SLOT.pack_into(out, _HEADER.size + i * _SLOT.size, h, ref)
+    return out
+
+
+class SharedFrozenDict(Mapping):
+    """An immutable mapping whose hash table lives in shared memory.
+
+    Create one with ``create`` (shared memory) or ``write`` (a file), then
+    ``attach`` or ``open`` it from other processes. Pickling an instance
+    pickles only its name or path, so passing it to a worker attaches
+    instead of copying.
+    """
+
+    def __init__(self, buffer, name: Optional[str] = None, path: Optional[str] = None,
+                 _owner=None, _mapping=None) -> None:
+        """Wrap an already mapped table; use the classmethods instead."""
+        self._buf = memoryview(buffer).cast('B')
+        self.name = name
+        self.path = path
+        self._shm = _owner
+        self._mmap = _mapping
+        magic, version, self._count, self._capacity, self._data = _HEADER.unpack_from(self._buf, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError("Not a SharedFrozenDict table")
+        self._mask = self._capacity - 1
+
+    @classmethod
+    def create(cls, data: Mapping, name: Optional[str] = None) -> 'SharedFrozenDict':
+        """Freeze a mapping into a new shared memory segment.
+
+        The creating process owns the segment and should ``unlink`` it once
+        no process needs it any more.
+
+        Args:
+            data: The mapping to freeze, e.g. a ``FrozenDict``.
+            name: Name of the segment; a random one is chosen if omitted.
+
+        Raises:
+            TypeError: If a key or value is of an unsupported type.
+        """
+        table = _build(data)
+        shm = shared_memory.SharedMemory(name=name, create=True, size=len(table))
+        shm.buf[:len(table)] = table
+        return cls(shm.buf[:len(table)], name=shm.name, _owner=shm)
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedFrozenDict':
+        """Attach read-only to a segment made by ``create`` in another process."""
+        if os.name != 'posix':
+            shm = shared_memory.SharedMemory(name=name)
+            return cls(shm.buf, name=name, _owner=shm)
+        # SharedMemory would register the segment with this process's
+        # resource tracker (before Python 3.13), which unlinks it when this
+        # process exits, so the segment is mapped directly instead.
+        import _posixshmem
+        fd = _posixshmem.shm_open(name if name.startswith('/') else '/' + name, os.O_RDONLY, mode=0)
+        try:
+            mapping = mmap.mmap(fd, os.fstat(fd).st_size, prot=mmap.PROT_READ)
+        finally:
+            os.close(fd)
+        return cls(mapping, name=name, _mapping=mapping)
+
+    @classmethod
+    def write(cls, data: Mapping, path: str) -> None:
+        """Freeze a mapping into a file that ``open`` can map.
+
+        Raises:
+            TypeError: If a key or value is of an unsupported type.
+        """
+        tmp = f"{path}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(_build(data))
+        os.replace(tmp, path)
+
+    @classmethod
+    def open(cls, path: str) -> 'SharedFrozenDict':
+        """Map a file written by ``write`` read-only."""
+        with open(path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapping, path=path, _mapping=mapping)
+
+    def _find(self, key: Any) -> int:
+        """Return the offset of the entry for ``key``, or -1."""
+        try:
+            raw = encode(key)
+            canonical = _canonical(key)
+            h = _hash_encoded(raw if canonical is key else encode(canonical))
+        except TypeError:
+            return -1
+        buf = self._buf
+        i = h & self._mask
+        while True:
+            slot_hash, ref = _SLOT.unpack_from(buf, _HEADER.size + i * _SLOT.size)
+            if not ref:
+                return -1
+            if slot_hash == h:
+                offset = ref - 1
+                key_len = _ENTRY.unpack_from(buf, offset)[0]
+                start = offset + _ENTRY.size
+                if buf[start:start + key_len] == raw or decode(buf, start)[0] == key:
+                    return offset
+            i = (i + 1) & self._mask
+
+    def _entries(self) -> Iterator[int]:
+        offset = self._data
+        for _ in range(self._count):
+            yield offset
+            key_len, value_len = _ENTRY.unpack_from(self._buf, offset)
+            offset += _ENTRY.size + key_len + value_len
+
+    def __getitem__(self, key: Any) -> Any:
+        offset = self._find(key)
+        if offset < 0:
+            raise KeyError(key)
+        key_len = _ENTRY.unpack_from(self._buf, offset)[0]
+        return decode(self._buf, offset + _ENTRY.size + key_len)[0]
+
+    def __contains__(self, key: Any) -> bool:
+        return self._find(key) >= 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Any]:
+        for offset in self._entries():
+            yield decode(self._buf, offset + _ENTRY.size)[0]
+
+    def items(self):
+        """Return the ``(key, value)`` pairs in insertion order."""
+        return [self._item(offset) for offset in self._entries()]
+
+    def _item(self, offset: int) -> Tuple[Any, Any]:
+        key, end = decode(self._buf, offset + _ENTRY.size)
+        return key, decode(self._buf, end)[0]
+
+    def to_frozendict(self):
+        """Copy the table into a process-local ``FrozenDict``."""
+        from .frozendict import FrozenDict
+        return FrozenDict(self.items())
+
+    def close(self) -> None:
+        """Unmap the table in this process."""
+        self._buf.release()
+        if self._shm is not None:
+            self._shm.close()
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def unlink(self) -> None:
+        """Destroy the shared memory segment; only the creator should call this."""
+        if self._shm is None:
+            raise ValueError("Only the process that created the segment can unlink it")
+        self._shm.unlink()
+
+    def __enter__(self) -> 'SharedFrozenDict':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __reduce__(self):
+        if self.path is not None:
+            return SharedFrozenDict.open, (self.path,)
+        return SharedFrozenDict.attach, (self.name,)
+
+    def __repr__(self) -> str:
+        where = f"path={self.path!r}" if self.path is not None else f"name={self.name!r}"
+        return f"SharedFrozenDict({where}, len={self._count})"
@@ -1,80 +1,350 @@
+import argparse
+import json
 import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
 
-def find_and_delete_empty_files(start_path):
+PROTECTED_NAMES = frozenset({'__devonly__.py'})
+LOG_BATCH = 1000
+
+
+@dataclass
+class ScanStats:
+    """Counters collected while scanning and cleaning a tree."""
+    directories: int = 0
+    reused: int = 0
+    files: int = 0
+    deleted: int = 0
+    skipped: int = 0
+    errors: int = 0
+    started: float = field(default_factory=time.perf_counter)
+    finished: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds spent so far, or in total once the scan has finished."""
+        return (self.finished or time.perf_counter()) - self.started
+
+    def __str__(self) -> str:
+        elapsed = self.elapsed or 1e-9
+        return (f"Scanned {self.files} files in {self.directories} directories in {elapsed:.2f}s "
+                f"({self.files / elapsed:,.0f} files/s, {self.directories / elapsed:,.0f} dirs/s, "
+                f"{self.reused} dirs unchanged); "
+                f"{self.deleted} empty, {self.skipped} skipped, {self.errors} errors")
+
+
+@dataclass
+class _DirScan:
+    """What one ``os.scandir`` pass over a single directory found."""
+    path: str
+    subdirs: List[str] = field(default_factory=list)
+    empty: List[str] = field(default_factory=list)
+    protected: List[str] = field(default_factory=list)
+    files: int = 0
+    error: Optional[OSError] = None
+    mtime_ns: Optional[int] = None
+    reused: bool = False
+
+
+class ScanIndex:
+    """On-disk record of directory mtimes and what the last scan found in them.
+
+    Adding, removing or renaming an entry updates a directory's mtime, so a
+    directory whose mtime is unchanged has the same files and subdirectories
+    as last time and its listing can be reused instead of scanned. Each
+    directory still costs one stat call, since a change deep in a subtree
+    does not touch the mtimes of its ancestors.
+
+    A file truncated to zero bytes in place leaves its directory's mtime
+    alone, so it is only found once that directory changes for another
+    reason or the index is discarded.
+    """
+
+    VERSION = 2
+    # Directories modified this close to the scan may change again within
+    # the same mtime tick, so their listings are not trusted next time.
+    RACY_NS = 2 * 10 ** 9
+
+    def __init__(self, path: str, root: str) -> None:
+        """Load the index, starting empty if it is missing, stale or unreadable.
+
+        Args:
+            path (str): Location of the index file.
+            root (str): Directory the scan starts from; an index written for
+                        another root is ignored.
+        """
+        self.path = path
+        self.root = os.path.abspath(root)
+        self.started_ns = time.time_ns()
+        self._entries: Dict[str, dict] = {}
+        self._visited: Dict[str, dict] = {}
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION and data.get('root') == self.root:
+                self._entries = data['directories']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def lookup(self, path: str, mtime_ns: int) -> Optional[_DirScan]:
+        """Return the cached scan of a directory if its mtime is unchanged."""
+        entry = self._entries.get(path)
+        if entry is None or entry['mtime_ns'] != mtime_ns:
+            return None
+        return _DirScan(path, [os.path.join(path, n) for n in entry['subdirs']],
+                        [os.path.join(path, n) for n in entry['empty']],
+                        [os.path.join(path, n) for n in entry['protected']],
+                        entry['files'], None, mtime_ns, True)
+
+    def record(self, result: _DirScan) -> None:
+        """Remember the scan of a directory for the next run."""
+        if result.error is not None or result.mtime_ns is None:
+            return
+        if result.mtime_ns >= self.started_ns - self.RACY_NS:
+            return
+        self._visited[result.path] = {
+            'mtime_ns': result.mtime_ns,
+            'subdirs': [os.path.basename(p) for p in result.subdirs],
+            'empty': [os.path.basename(p) for p in result.empty],
+            'protected': [os.path.basename(p) for p in result.protected],
+            'files': result.files,
+        }
+
+    def forget(self, path: str) -> None:
+        """Drop a directory, e.g. after files were deleted from it."""
+        self._visited.pop(path, None)
+
+    def save(self) -> None:
+        """Write the directories seen in this run, replacing the old index."""
+        data = {'version': self.VERSION, 'root': self.root, 'directories': self._visited}
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+
+def _scan_directory(path: str, index: Optional[ScanIndex] = None) -> _DirScan:
+    try:
+        # Stat before listing, so a change made during the scan leaves a
+        # newer mtime than the one recorded.
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError as e:
+        return _DirScan(path, error=e)
+    if index is not None:
+        cached = index.lookup(path, mtime_ns)
+        if cached is not None:
+            return cached
+    result = _DirScan(path, mtime_ns=mtime_ns)
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                # DirEntry answers is_dir/is_file from the directory listing
+                # itself; only the size needs a stat call.
+                if entry.is_dir(follow_symlinks=False):
+                    result.subdirs.append(entry.path)
+                elif entry.name in PROTECTED_NAMES:
+                    # Reported whatever their size, without a stat call.
+                    result.files += 1
+                    result.protected.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    result.files += 1
+                    if not entry.stat(follow_symlinks=False).st_size:
+                        result.empty.append(entry.path)
+    except OSError as e:
+        result.error = e
+    return result
+
+
+def _walk(start_path: str, max_workers: Optional[int],
+          index: Optional[ScanIndex] = None) -> Iterator[_DirScan]:
+    """Scan a tree on a thread pool, yielding each directory as it finishes."""
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = {pool.submit(_scan_directory, start_path, index)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if index is not None:
+                    index.record(result)
+                pending.update(pool.submit(_scan_directory, d, index) for d in result.subdirs)
+                yield result
+
+
+def iter_empty_files(start_path: str, max_workers: Optional[int] = None,
+                     stats: Optional[ScanStats] = None,
+                     index: Optional[ScanIndex] = None) -> Iterator[Tuple[str, bool]]:
+    """Yield the empty regular files and the protected files under a directory.
+
+    Subdirectories are scanned in parallel, so the order of the results is
+    not deterministic. Symbolic links are neither followed nor reported.
+
+    Args:
+        start_path (str): The starting directory to search.
+        max_workers (int, optional): Threads scanning directories.
+        stats (ScanStats, optional): Counters to update while scanning.
+        index (ScanIndex, optional): Reuse the listings of unchanged
+                                     directories and record the new ones.
+
+    Yields:
+        tuple: ``(path, protected)``, where ``protected`` is True for files
+               that must never be deleted, such as '__devonly__.py'; those
+               are yielded whether or not they are empty.
+    """
+    stats = stats if stats is not None else ScanStats()
+    for result in _walk(start_path, max_workers, index):
+        stats.directories += 1
+        stats.reused += result.reused
+        stats.files += result.files
+        if result.error is not None:
+            stats.errors += 1
+            print(f"ERROR: Could not scan {result.path} - {result.error}")
+        for path in result.empty:
+            yield path, False
+        for path in result.protected:
+            yield path, True
+
+
+def clean_empty_files(start_path: str, dry_run: bool = False, max_workers: Optional[int] = None,
+                      stats: Optional[ScanStats] = None,
+                      index: Optional[ScanIndex] = None) -> Iterator[Tuple[str, str]]:
+    """Delete empty files under a directory, yielding what happened to each.
+
+    Args:
+        start_path (str): The starting directory to search.
+        dry_run (bool): Report the files that would be deleted without
+                        deleting them.
+        max_workers (int, optional): Threads scanning directories.
+        stats (ScanStats, optional): Counters to update while cleaning.
+        index (ScanIndex, optional): Index of unchanged directories; it is
+                                     saved once the whole tree is done.
+
+    Yields:
+        tuple: ``(status, path)`` with status 'deleted', 'would delete',
+               'skipped' (a protected file) or 'error'.
+    """
+    stats = stats if stats is not None else ScanStats()
+    for path, protected in iter_empty_files(start_path, max_workers, stats, index):
+        if protected:
+            stats.skipped += 1
+            yield 'skipped', path
+        elif dry_run:
+            stats.deleted += 1
+            yield 'would delete', path
+        else:
+            try:
+                # The file may have been written to since it was listed.
+                if os.stat(path, follow_symlinks=False).st_size:
+                    continue
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                stats.errors += 1
+                print(f"ERROR: Could not delete {path} - {e}")
+                yield 'error', path
+            else:
+                stats.deleted += 1
+                if index is not None:
+                    index.forget(os.path.dirname(path))
+                yield 'deleted', path
+    stats.finished = time.perf_counter()
+    if index is not None:
+        index.save()
+
+
+def find_and_delete_empty_files(start_path, dry_run=False, max_workers=None, stats=None, index_path=None):
     """
     Finds empty files (0 bytes) within a given directory and its subdirectories,
     excluding files named '__devonly__.py', and deletes them.
 
+    Progress is logged once per LOG_BATCH files instead of once per file,
+    followed by a summary with throughput figures.
+
     Args:
         start_path (str): The starting directory to search.
+        dry_run (bool): Only report the files that would be deleted.
+        max_workers (int, optional): Threads scanning directories.
+        stats (ScanStats, optional): Counters to fill in; useful to read the
+                                     throughput afterwards.
+        index_path (str, optional): Index file used to skip rescanning
+                                    directories that have not changed.
 
     Returns:
         tuple: A tuple containing two lists:
-               - deleted_files (list): Paths of files that were deleted.
+               - deleted_files (list): Paths of files that were deleted (or
+                 would be, in a dry run).
                - skipped_files (list): Paths of __devonly__.py files that were skipped.
     """
     deleted_files = []
     skipped_files = []
-    
+    stats = stats if stats is not None else ScanStats()
+
     print(f"Searching for empty files in: {start_path} and its subfolders...")
-    print("WARNING: This script will DELETE empty files (excluding __devonly__.py).")
-    print("         Ensure you have backed up any critical data before proceeding.")
+    if dry_run:
+        print("DRY RUN: No files will be deleted.")
+    else:
+        print("WARNING: This script will DELETE empty files (excluding __devonly__.py).")
+        print("         Ensure you have backed up any critical data before proceeding.")
     print("-" * 60)
 
-    for root, _, files in os.walk(start_path):
-        for file in files:
-            file_path = os.path.join(root, file)
-            
-            if file == '__devonly__.py':
-                skipped_files.append(file_path)
-                continue # Skip __devonly__.py files
-            
-            if os.path.isfile(file_path) and os.path.getsize(file_path) == 0:
-                try:
-                    os.remove(file_path)
-                    deleted_files.append(file_path)
-                    print(f"DELETED: {file_path}")
-                except OSError as e:
-                    print(f"ERROR: Could not delete {file_path} - {e}")
-            # else:
-            #     # Optional: Uncomment the line below if you want to see files that are not empty or are not regular files
-            #     # print(f"SKIPPED (not empty or not file): {file_path}")
-    
+    index = ScanIndex(index_path, start_path) if index_path else None
+    for status, path in clean_empty_files(start_path, dry_run, max_workers, stats, index):
+        if status == 'skipped':
+            skipped_files.append(path)
+        elif status != 'error':
+            deleted_files.append(path)
+            if len(deleted_files) % LOG_BATCH == 0:
+                print(f"{status.upper()}: {len(deleted_files)} files so far ({stats})")
+
+    print(stats)
     return deleted_files, skipped_files
 
-if __name__ == "__main__":
-    # Get the directory where the script is located
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-
-    # IMPORTANT: Before running this, consider testing in a dummy folder
-    # or uncommenting the line below and changing it to a specific test path:
-    # script_dir = "/path/to/your/test/folder" 
-    
-    # CONFIRMATION STEP: Highly recommended to avoid accidental deletion
-    print("\n")
-    user_confirm = input(f"Are you sure you want to delete empty files in '{script_dir}' and its subfolders? (yes/no): ").lower().strip()
-
-    if user_confirm == 'yes':
-        deleted_files, skipped_files = find_and_delete_empty_files(script_dir)
-
-        print("\n" + "=" * 60)
-        print("Deletion Summary:")
-        print("=" * 60)
-
-        if deleted_files:
-            print(f"\nSuccessfully deleted {len(deleted_files)} empty files:")
-            for f in deleted_files:
-                print(f"- {f}")
-        else:
-            print("\nNo empty files were found and deleted.")
 
-        if skipped_files:
-            print(f"\nSkipped {len(skipped_files)} '__devonly__.py' files:")
-            for f in skipped_files:
-                print(f"- {f}")
-        else:
-            print("\nNo '__devonly__.py' files were encountered.")
+def _print_paths(paths, limit=20):
+    for f in paths[:limit]:
+        print(f"- {f}")
+    if len(paths) > limit:
+        print(f"... and {len(paths) - limit} more")
+
+
+def main(argv=None):
+    """Command line entry point; returns the exit status."""
+    parser = argparse.ArgumentParser(
+        description="Delete empty files (excluding __devonly__.py) under a directory.")
+    parser.add_argument('path', help="directory to clean")
+    parser.add_argument('--dry-run', action='store_true', help="list the files without deleting them")
+    parser.add_argument('--index', metavar='FILE',
+                        help="index of directory mtimes; unchanged directories are not rescanned")
+    parser.add_argument('--jobs', type=int, metavar='N', help="threads scanning directories")
+    args = parser.parse_args(argv)
 
-        print("\nOperation complete.")
+    if not os.path.isdir(args.path):
+        parser.error(f"not a directory: {args.path}")
+    stats = ScanStats()
+    deleted_files, skipped_files = find_and_delete_empty_files(
+        args.path, args.dry_run, args.jobs, stats, args.index)
+
+    print("\n" + "=" * 60)
+    print("Dry Run Summary:" if args.dry_run else "Deletion Summary:")
+    print("=" * 60)
+
+    if deleted_files:
+        verb = "Would delete" if args.dry_run else "Successfully deleted"
+        print(f"\n{verb} {len(deleted_files)} empty files:")
+        _print_paths(sorted(deleted_files))
     else:
-        print("\nOperation cancelled by user. No files were deleted.")
\ No newline at end of file
+        print("\nNo empty files were found.")
+
+    if skipped_files:
+        print(f"\nSkipped {len(skipped_files)} '__devonly__.py' files:")
+        _print_paths(sorted(skipped_files))
+
+    print("\nOperation complete.")
+    return 1 if stats.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,6 @@
 """
 TODO Features by Group:
     Others:
-        - Implement Caching
         - Implement pickle compatibility
 
 
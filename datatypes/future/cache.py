@@ -0,0 +1,287 @@
+"""A two-tier (memory + disk) cache for expensive values."""
+import functools
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from ..others.pickler import BaseDataTypesPickler, BaseDataTypesUnpickler
+
+_MISSING = object()
+_LITERALS = (type(None), bool, int, float, complex, str, bytes)
+# Memory-tier hits are written back to the ``accessed`` column in batches.
+_TOUCH_BATCH = 64
+
+
+def default_cache_path() -> Path:
+    """Return the default location of the on-disk cache.
+
+    The directory can be overridden with the ``DATATYPES_CACHE_DIR``
+    environment variable.
+
+    Returns:
+        Path: Path of the SQLite cache file.
+    """
+    base = os.environ.get('DATATYPES_CACHE_DIR')
+    if base is None:
+        base = Path.home() / '.cache' / 'datatypes'
+    return Path(base) / 'cache.sqlite3'
+
+
+def _tagged(value: Any) -> Any:
+    """Pair a literal value and everything inside it with its type.
+
+    Only the exact builtin literal types are accepted, since their reprs
+    identify the value: any other object may share its repr with a
+    different one (a default or truncated repr), which would make two
+    different calls share a key. Sets and dicts are sorted, so equal ones
+    give the same key in every process.
+
+    Raises:
+        TypeError: If the value is or contains a non-literal.
+    """
+    kind = type(value)
+    if kind in _LITERALS:
+        return kind.__name__, value
+    if kind is tuple or kind is list:
+        return kind.__name__, tuple(_tagged(v) for v in value)
+    if kind is set or kind is frozenset:
+        return kind.__name__, tuple(sorted(repr(_tagged(v)) for v in value))
+    if kind is dict:
+        return kind.__name__, tuple(sorted(((repr(_tagged(k)), _tagged(v)) for k, v in value.items()),
+                                           key=lambda item: item[0]))
+    raise TypeError(f"Cannot build a cache key from a {kind.__qualname__!r}: "
+                    f"only literal values identify a call")
+
+
+def make_key(*args: Any, **kwargs: Any) -> str:
+    """Build a stable content hash for a set of arguments.
+
+    The arguments are serialized with the package pickler together with
+    their types, so the key is the same across processes and interpreter
+    restarts. Only literal values (numbers, strings, bytes, and tuples,
+    lists, sets and dicts of them) are accepted.
+
+    Returns:
+        str: A hex SHA-256 digest of the arguments.
+
+    Raises:
+        TypeError: If an argument is not a literal.
+    """
+    payload = _tagged((args, tuple(sorted(kwargs.items()))))
+    pickled = BaseDataTypesPickler(payload).get_pickled_value()
+    return hashlib.sha256(pickled).hexdigest()
+
+
+class PersistentCache:
+    """A cache with an in-memory LRU front and a size-capped SQLite store.
+
+    Reads check the memory tier first and fall back to disk; disk hits are
+    promoted into memory. When the disk store grows past ``max_bytes`` the
+    least recently used entries are evicted.
+    """
+
+    def __init__(self, path: Union[str, Path, None] = None,
+                 max_bytes: int = 64 * 1024 * 1024,
+                 memory_items: int = 128) -> None:
+        """Open (or create) a persistent cache.
+
+        Args:
+            path: Location of the SQLite file. Defaults to
+                ``default_cache_path()``.
+            max_bytes: Maximum total size of the stored values on disk.
+            memory_items: Number of entries kept in the memory tier.
+        """
+        self.path = Path(path) if path is not None else default_cache_path()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.memory_items = memory_items
+        self._memory = OrderedDict()
+        self._touched = {}  # key -> last memory-tier hit not yet on disk
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            'key TEXT PRIMARY KEY, value BLOB NOT NULL, '
+            'size INTEGER NOT NULL, accessed REAL NOT NULL)'
+        )
+        self._db.commit()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value for a key, or ``default`` if missing."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._touched[key] = time.time()
+                if len(self._touched) >= _TOUCH_BATCH:
+                    self._flush_touched()
+                self.hits += 1
+                return self._memory[key]
+            row = self._db.execute(
+                'SELECT value FROM entries WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+            try:
+                value = BaseDataTypesUnpickler(row[0]).get_unpickled_value()
+            except ValueError:
+                # Written by an older version or damaged: drop it and miss.
+                self._db.execute('DELETE FROM entries WHERE key = ?', (key,))
+                self._db.commit()
+                self.misses += 1
+                return default
+            self._db.execute(
+                'UPDATE entries SET accessed = ? WHERE key = ?', (time.time(), key)
+            )
+            self._db.commit()
+            self._remember(key, value)
+            self.disk_hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value in both tiers, evicting old entries if needed.
+
+        Raises:
+            ValueError: If the value does not survive the package pickler,
+                i.e. it is not made of literals (``Decimal('1.5')`` and
+                ``float('nan')`` are not).
+        """
+        blob = BaseDataTypesPickler(value).get_pickled_value()
+        try:
+            stored = BaseDataTypesUnpickler(blob).get_unpickled_value()
+        except ValueError:
+            stored = _MISSING
+        if stored is _MISSING or type(stored) is not type(value) or stored != value:
+            raise ValueError(f"Cannot cache {type(value).__name__!r} value: "
+                             f"only literal values survive a restart")
+        with self._lock:
+            self._remember(key, value)
+            self._touched.pop(key, None)
+            self._db.execute(
+                'INSERT OR REPLACE INTO entries (key, value, size, accessed) '
+                'VALUES (?, ?, ?, ?)', (key, blob, len(blob), time.time())
+            )
+            self._evict()
+            self._db.commit()
+
+    def _flush_touched(self) -> None:
+        """Write pending memory-tier access times, so eviction sees hot entries."""
+        if self._touched:
+            self._db.executemany('UPDATE entries SET accessed = ? WHERE key = ?',
+                                 [(accessed, key) for key, accessed in self._touched.items()])
+            self._touched.clear()
+            self._db.commit()
+
+    def _evict(self) -> None:
+        self._flush_touched()
+        total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute('SELECT key, size FROM entries ORDER BY accessed').fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._db.execute('DELETE FROM entries WHERE key = ?', (key,))
+            self._memory.pop(key, None)
+            self._touched.pop(key, None)
+            total -= size
+
+    def delete(self, key: str) -> None:
+        """Remove a key from both tiers."""
+        with self._lock:
+            self._memory.pop(key, None)
+            self._touched.pop(key, None)
+            self._db.execute('DELETE FROM entries WHERE key = ?', (key,))
+            self._db.commit()
+
+    def clear(self) -> None:
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            self._db.execute('DELETE FROM entries')
+            self._db.commit()
+
+    def disk_size(self) -> int:
+        """Return the total size in bytes of the values stored on disk."""
+        with self._lock:
+            return self._db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._flush_touched()
+            self._db.close()
+
+    def __contains__(self, key: str) -> bool:
+        # An existence check, not a read: it leaves the statistics and the
+        # access times alone.
+        with self._lock:
+            if key in self._memory:
+                return True
+            return self._db.execute('SELECT 1 FROM entries WHERE key = ?', (key,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def __repr__(self) -> str:
+        return f"PersistentCache({str(self.path)!r}, max_bytes={self.max_bytes})"
+
+
+def memoize(cache: Optional[PersistentCache] = None,
+            namespace: Optional[str] = None) -> Callable:
+    """Decorator that memoizes a function in a ``PersistentCache``.
+
+    Args:
+        cache: The cache to use. A cache at the default path is opened on
+            first call if omitted.
+        namespace: Prefix mixed into every key. Defaults to the function's
+            qualified name, so different functions never share entries.
+
+    Calls with non-literal arguments are not cached (see ``make_key``),
+    nor are non-literal results (see ``PersistentCache.set``).
+
+    Returns:
+        Callable: The decorator.
+    """
+    def decorator(func: Callable) -> Callable:
+        prefix = namespace or f"{func.__module__}.{func.__qualname__}"
+        state = {'cache': cache}
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if state['cache'] is None:
+                state['cache'] = PersistentCache()
+            try:
+                key = make_key(prefix, *args, **kwargs)
+            except TypeError:
+                return func(*args, **kwargs)  # Not literal arguments; call uncached.
+            value = state['cache'].get(key, _MISSING)
+            if value is _MISSING:
+                value = func(*args, **kwargs)
+                try:
+                    state['cache'].set(key, value)
+                except ValueError:
+                    pass  # Not a literal; return it uncached.
+            return value
+
+        wrapper.cache = lambda: state['cache']
+        return wrapper
+
+    return decorator
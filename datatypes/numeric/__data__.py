@@ -1,2 +1,3 @@
 disabled = False
-disabletype = '_'
\ No newline at end of file
+disabletype = '_'
+instrument = False  # Count calls, sizes and timings; see others/instrument.py
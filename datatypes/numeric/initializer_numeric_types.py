@@ -1,8 +1,5 @@
-from __data__ import disabled, disabletype
-import sys
-from pathlib import Path
-sys.path.append(str(Path(__file__).parent.parent))
-from others.errors.errordevfile import ImportDisabledError, ImportDisabledWarning
+from .__data__ import disabled, disabletype
+from ..others.errors.errordevfile import ImportDisabledError, ImportDisabledWarning
 
 if disabled:
     match disabletype.lower():
@@ -0,0 +1 @@
+instrument = False  # Count calls, sizes and timings; see others/instrument.py
@@ -0,0 +1,262 @@
+"""Opt-in instrumentation of the package's hot paths.
+
+Classes register the methods worth watching with ``register``; the
+package's own classes are registered from ``registry``. Nothing is patched
+unless instrumentation is on for the class's group, so when it is off the
+methods are the original functions and cost nothing extra.
+
+Instrumentation is switched on per group by ``instrument = True`` in the
+group's ``__data__`` module, or for any groups by the ``DATATYPES_INSTRUMENT``
+environment variable (``1``/``all``, or a comma separated list of groups
+such as ``collections,numeric``). ``enable`` and ``disable`` switch it at
+runtime.
+
+Every instrumented call is counted; sizes go into power-of-two histograms,
+and one call in ``SAMPLE_EVERY`` is timed. Counters are updated without a
+lock, so under heavy multithreading they are approximate.
+"""
+import atexit
+import importlib
+import inspect
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+ENV_VAR = 'DATATYPES_INSTRUMENT'
+SAMPLE_EVERY = 64
+
+SizeProbe = Callable[..., int]
+
+
+class OperationStats:
+    """Counters for one method of one class."""
+
+    __slots__ = ('calls', 'sizes', 'samples', 'total_ns', 'max_ns')
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.sizes: Dict[int, int] = {}
+        self.samples = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def add_size(self, size: int) -> None:
+        bucket = size.bit_length()
+        self.sizes[bucket] = self.sizes.get(bucket, 0) + 1
+
+    def add_time(self, elapsed_ns: int) -> None:
+        self.samples += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counters; size buckets are keyed by their upper bound."""
+        return {
+            'calls': self.calls,
+            'sizes': {(1 << b) - 1 if b else 0: n for b, n in sorted(self.sizes.items())},
+            'timing': {
+                'samples': self.samples,
+                'mean_s': self.total_ns / self.samples / 1e9 if self.samples else 0.0,
+                'max_s': self.max_ns / 1e9,
+            },
+        }
+
+
+class _Target:
+    """A registered class and the methods to instrument on it."""
+
+    def __init__(self, cls: type, group: str, methods: Iterable[str],
+                 sizes: Dict[str, SizeProbe], timed: Iterable[str]) -> None:
+        self.cls = cls
+        self.group = group
+        self.methods = tuple(methods)
+        self.sizes = sizes
+        self.timed = frozenset(timed)
+        self.originals: Dict[str, Any] = {}
+
+    @property
+    def patched(self) -> bool:
+        return bool(self.originals)
+
+    def patch(self) -> None:
+        if self.patched:
+            return
+        for name in self.methods:
+            original = self.cls.__dict__[name]
+            stats = _stats_for(self.cls.__qualname__, name)
+            wrapper = _wrap(original, stats, self.sizes.get(name), name in self.timed)
+            self.originals[name] = original
+            setattr(self.cls, name, wrapper)
+
+    def unpatch(self) -> None:
+        for name, original in self.originals.items():
+            setattr(self.cls, name, original)
+        self.originals.clear()
+
+
+_targets: List[_Target] = []
+_stats: Dict[Tuple[str, str], OperationStats] = {}
+_stats_lock = threading.Lock()
+_exporters: List[Callable[[Dict[str, Any]], None]] = []
+_forced: Optional[frozenset] = None
+
+
+def length(self, result, *args, **kwargs) -> int:
+    """Size probe recording the length of the instance after the call."""
+    return len(self)
+
+
+def result_length(self, result, *args, **kwargs) -> int:
+    """Size probe recording the length of the returned value."""
+    return len(result)
+
+
+def _stats_for(cls_name: str, method: str) -> OperationStats:
+    with _stats_lock:
+        stats = _stats.get((cls_name, method))
+        if stats is None:
+            stats = _stats[(cls_name, method)] = OperationStats()
+        return stats
+
+
+def _timed_iteration(iterator, stats: OperationStats, start: int):
+    try:
+        yield from iterator
+    finally:
+        stats.add_time(time.perf_counter_ns() - start)
+
+
+def _wrap(func: Callable, stats: OperationStats, size: Optional[SizeProbe], timed: bool) -> Callable:
+    def wrapper(self, *args, **kwargs):
+        stats.calls += 1
+        if timed and stats.calls % SAMPLE_EVERY == 1:
+            start = time.perf_counter_ns()
+            result = func(self, *args, **kwargs)
+            if inspect.isgenerator(result):
+                # Generators do their work while being consumed.
+                result = _timed_iteration(result, stats, start)
+            else:
+                stats.add_time(time.perf_counter_ns() - start)
+        else:
+            result = func(self, *args, **kwargs)
+        if size is not None:
+            stats.add_size(size(self, result, *args, **kwargs))
+        return result
+
+    wrapper.__name__ = func.__name__
+    wrapper.__qualname__ = func.__qualname__
+    wrapper.__doc__ = func.__doc__
+    wrapper.__wrapped__ = func
+    return wrapper
+
+
+def is_enabled(group: str) -> bool:
+    """Return whether instrumentation is switched on for a group."""
+    if _forced is not None:
+        return group in _forced or 'all' in _forced
+    setting = os.environ.get(ENV_VAR, '').strip().lower()
+    if setting in ('1', 'true', 'yes', 'all'):
+        return True
+    if setting and group in {g.strip() for g in setting.split(',')}:
+        return True
+    try:
+        data = importlib.import_module(f'..{group}.__data__', __package__)
+    except ImportError:
+        return False
+    return bool(getattr(data, 'instrument', False))
+
+
+def register(cls: type, group: str, methods: Iterable[str],
+             sizes: Optional[Dict[str, SizeProbe]] = None,
+             timed: Iterable[str] = ()) -> type:
+    """Declare the methods of a class to instrument.
+
+    Args:
+        cls: The class.
+        group: Its group, which decides whether instrumentation is on.
+        methods: Names of the methods to count, defined on ``cls`` itself.
+        sizes: Method name to a probe called as ``probe(self, result,
+            *args, **kwargs)`` after each call; the returned size goes into
+            the method's histogram.
+        timed: Methods of which every ``SAMPLE_EVERY``-th call is timed.
+            Generators are timed until they are exhausted or closed.
+
+    Returns:
+        type: ``cls``, patched if instrumentation is on for ``group``.
+    """
+    target = _Target(cls, group, methods, sizes or {}, timed)
+    _targets.append(target)
+    if is_enabled(group):
+        target.patch()
+    return cls
+
+
+def enable(groups: Iterable[str] = ('all',)) -> None:
+    """Instrument the registered classes of ``groups`` (default: all groups).
+
+    From then on the environment variable and the ``__data__`` settings
+    are ignored; classes registered later follow the same choice.
+    """
+    global _forced
+    _forced = frozenset(groups)
+    for target in _targets:
+        if is_enabled(target.group):
+            target.patch()
+        else:
+            target.unpatch()
+
+
+def disable() -> None:
+    """Restore the original methods of every registered class.
+
+    Classes registered later are left uninstrumented as well.
+    """
+    global _forced
+    _forced = frozenset()
+    for target in _targets:
+        target.unpatch()
+
+
+def snapshot() -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Return the counters collected so far, keyed by class and method name."""
+    with _stats_lock:
+        items = list(_stats.items())
+    result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for (cls_name, method), stats in sorted(items):
+        result.setdefault(cls_name, {})[method] = stats.as_dict()
+    return result
+
+
+def reset() -> None:
+    """Zero all counters, keeping the instrumented methods in place."""
+    with _stats_lock:
+        for stats in _stats.values():
+            stats.__init__()
+
+
+def add_exporter(exporter: Callable[[Dict[str, Any]], None]) -> None:
+    """Register a callable that receives a ``snapshot`` on every ``export``.
+
+    Exporters also run once at interpreter exit, so short-lived processes
+    still report.
+    """
+    if not _exporters:
+        atexit.register(export)
+    _exporters.append(exporter)
+
+
+def remove_exporter(exporter: Callable[[Dict[str, Any]], None]) -> None:
+    """Unregister an exporter."""
+    _exporters.remove(exporter)
+    if not _exporters:
+        atexit.unregister(export)
+
+
+def export() -> Dict[str, Any]:
+    """Send a snapshot to every exporter and return it."""
+    data = snapshot()
+    for exporter in list(_exporters):
+        exporter(data)
+    return data
@@ -0,0 +1,150 @@
+"""Deep memory accounting for the package's containers.
+
+``sys.getsizeof`` only counts the outer object. ``deep_sizeof`` follows
+everything an object holds, counting every object once however often it
+is referenced, so shared values and cycles are handled. ``memory_report``
+splits the total into structural overhead (the containers themselves:
+their headers, pointer arrays and hash tables) and payload (the leaf
+values they hold).
+
+Classes whose storage lives in private attributes register with
+``register`` (the package's own from ``registry``): their ``__sizeof__`` already includes those internal
+containers, and the registration tells the walker which objects they hold
+and which internals not to count a second time. Builtin containers and
+plain objects with a ``__dict__`` or ``__slots__`` are followed without
+registration. Classes, modules, functions and the ``None``/``True``/``False``
+singletons are shared by the whole process and never counted.
+"""
+import sys
+import types
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+Internals = Callable[[Any], Iterable[Any]]
+Children = Callable[[Any], Iterable[Any]]
+
+_registry: Dict[type, Tuple[Internals, Children]] = {}
+
+_SHARED = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+           types.MethodType, types.CodeType)
+_SINGLETONS = frozenset(map(id, (None, True, False, Ellipsis, NotImplemented)))
+
+
+@dataclass
+class MemoryReport:
+    """The deep size of an object, broken down."""
+    total: int = 0
+    structural: int = 0
+    payload: int = 0
+    objects: int = 0
+    by_type: Dict[str, List[int]] = field(default_factory=dict)  # type name -> [count, bytes]
+
+    def add(self, obj: Any, size: int, structural: bool) -> None:
+        self.total += size
+        self.objects += 1
+        if structural:
+            self.structural += size
+        else:
+            self.payload += size
+        entry = self.by_type.setdefault(type(obj).__qualname__, [0, 0])
+        entry[0] += 1
+        entry[1] += size
+
+    def __str__(self) -> str:
+        lines = [f"{self.total:,} bytes in {self.objects:,} objects "
+                 f"({self.structural:,} structural, {self.payload:,} payload)"]
+        for name, (count, size) in sorted(self.by_type.items(), key=lambda item: -item[1][1]):
+            lines.append(f"  {name:<24} {count:>10,} objects {size:>14,} bytes")
+        return "\n".join(lines)
+
+
+def register(cls: type, internals: Internals, children: Children) -> type:
+    """Declare how to walk the instances of a container class.
+
+    Args:
+        cls: The class; its ``__sizeof__`` must include the internal
+            containers returned by ``internals``.
+        internals: Returns the private containers counted by ``__sizeof__``.
+        children: Returns the objects the instance holds, e.g. its keys
+            and values.
+
+    Returns:
+        type: ``cls``.
+    """
+    _registry[cls] = (internals, children)
+    return cls
+
+
+def _lookup(cls: type):
+    for base in cls.__mro__:
+        entry = _registry.get(base)
+        if entry is not None:
+            return entry
+    return None
+
+
+def _builtin_children(obj: Any):
+    """Return the children of a builtin container, or None for a leaf."""
+    if isinstance(obj, dict):
+        return [x for item in obj.items() for x in item]
+    if isinstance(obj, (list, tuple, set, frozenset, deque)):
+        return obj
+    return None
+
+
+def _attributes(obj: Any) -> List[Any]:
+    found = []
+    for cls in type(obj).__mro__:
+        for name in cls.__dict__.get('__slots__', ()):
+            try:
+                found.append(getattr(obj, name))
+            except AttributeError:
+                pass
+    return found
+
+
+def memory_report(obj: Any) -> MemoryReport:
+    """Measure everything reachable from ``obj``, counting each object once.
+
+    The walk is iterative, so deeply nested structures do not hit the
+    recursion limit.
+    """
+    report = MemoryReport()
+    seen = set(_SINGLETONS)
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, _SHARED):
+            continue
+        seen.add(id(current))
+        size = sys.getsizeof(current)
+        entry = _lookup(type(current))
+        if entry is not None:
+            internals, children = entry
+            seen.update(id(x) for x in internals(current))
+            stack.extend(children(current))
+            structural = True
+        else:
+            children = _builtin_children(current)
+            structural = children is not None
+            if structural:
+                stack.extend(children)
+        # Attributes of user classes and of builtin subclasses.
+        instance_dict = getattr(current, '__dict__', None)
+        if isinstance(instance_dict, dict) and id(instance_dict) not in seen:
+            seen.add(id(instance_dict))
+            report.add(instance_dict, sys.getsizeof(instance_dict), True)
+            stack.extend(v for v in instance_dict.values() if id(v) not in seen)
+            structural = True
+        slots = _attributes(current)
+        if slots:
+            stack.extend(slots)
+            structural = True
+        report.add(current, size, structural)
+    return report
+
+
+def deep_sizeof(obj: Any) -> int:
+    """Return the bytes used by ``obj`` and everything it holds."""
+    return memory_report(obj).total
@@ -0,0 +1,175 @@
+"""Simultaneous multi-exponentiation modulo a prime.
+
+All functions compute ``prod(base ** exponent) mod modulus``. Doing the
+exponentiations together shares the squarings between the bases, which
+is where most of the cost of separate ``pow`` calls goes.
+"""
+from typing import List, Optional, Sequence
+
+
+def _normalize(exponents: Sequence[int], order: Optional[int]) -> List[int]:
+    if order is not None:
+        return [e % order for e in exponents]
+    if any(e < 0 for e in exponents):
+        raise ValueError("Negative exponents need the group order to be given")
+    return list(exponents)
+
+
+def _window_for(bits: int, bases: int) -> int:
+    # Joint (Shamir) tables grow as 2 ** (window * bases), so they use
+    # narrower windows than the per-base interleaved tables.
+    if bits <= 32:
+        return 1 if bases > 1 else 2
+    if bits <= 256:
+        return 2 if bases > 1 else 3
+    return 3 if bases > 1 else 5
+
+
+def shamir_exp(a: int, x: int, b: int, y: int, modulus: int,
+               order: Optional[int] = None, window: Optional[int] = None) -> int:
+    """Compute ``a ** x * b ** y mod modulus`` with Shamir's trick.
+
+    Both exponents are scanned together, ``window`` bits at a time, against
+    a joint table of ``a ** i * b ** j``, so the two exponentiations share
+    one chain of squarings.
+
+    Args:
+        a, b: The bases.
+        x, y: The exponents.
+        modulus: The modulus.
+        order: Optional group order; exponents are reduced modulo it, which
+            also allows negative exponents.
+        window: Bits scanned per step. Chosen from the exponent size if
+            omitted.
+
+    Returns:
+        int: The product of the two powers.
+    """
+    x, y = _normalize((x, y), order)
+    bits = max(x.bit_length(), y.bit_length())
+    if bits == 0:
+        return 1 % modulus
+    w = window or _window_for(bits, 2)
+    size = 1 << w
+    mask = size - 1
+    a_powers = [1, a % modulus]
+    b_powers = [1, b % modulus]
+    for _ in range(2, size):
+        a_powers.append(a_powers[-1] * a_powers[1] % modulus)
+        b_powers.append(b_powers[-1] * b_powers[1] % modulus)
+    table = [ap * bp % modulus if i and j else (ap if i else bp)
+             for j, bp in enumerate(b_powers) for i, ap in enumerate(a_powers)]
+    result = 1
+    for shift in range(-(-bits // w) * w - w, -1, -w):
+        if result != 1:
+            for _ in range(w):
+                result = result * result % modulus
+        index = ((x >> shift) & mask) | (((y >> shift) & mask) << w)
+        if index:
+            result = result * table[index] % modulus
+    return result
+
+
+def interleaved_exp(bases: Sequence[int], exponents: Sequence[int], modulus: int,
+                    order: Optional[int] = None, window: Optional[int] = None) -> int:
+    """Compute a multi-exponentiation with interleaved fixed windows (Straus).
+
+    Every base gets its own small table of ``2 ** window`` powers; all
+    exponents are scanned together so the squarings are shared. This is
+    the best choice for a handful of bases.
+    """
+    exponents = _normalize(exponents, order)
+    bits = max((e.bit_length() for e in exponents), default=0)
+    if bits == 0:
+        return 1 % modulus
+    w = window or _window_for(bits, 1)
+    mask = (1 << w) - 1
+    tables = []
+    for base in bases:
+        row = [1, base % modulus]
+        for _ in range(2, mask + 1):
+            row.append(row[-1] * row[1] % modulus)
+        tables.append(row)
+    pairs = list(zip(tables, exponents))
+    result = 1
+    for shift in range(-(-bits // w) * w - w, -1, -w):
+        if result != 1:
+            for _ in range(w):
+                result = result * result % modulus
+        for row, exponent in pairs:
+            digit = (exponent >> shift) & mask
+            if digit:
+                result = result * row[digit] % modulus
+    return result
+
+
+def bucket_exp(bases: Sequence[int], exponents: Sequence[int], modulus: int,
+               order: Optional[int] = None) -> int:
+    """Compute a multi-exponentiation with the bucket method (Pippenger).
+
+    Each window of c exponent bits costs one multiplication per base plus
+    about ``2 ** (c + 1)`` to combine the buckets, with c chosen to
+    minimize the total. This wins for many bases with short exponents,
+    e.g. the random weights of batch verification.
+    """
+    exponents = _normalize(exponents, order)
+    bits = max((e.bit_length() for e in exponents), default=0)
+    if bits == 0:
+        return 1 % modulus
+    n = len(bases)
+    c = min(range(1, 17), key=lambda w: -(-bits // w) * (n + (1 << (w + 1))))
+    mask = (1 << c) - 1
+    result = 1
+    for shift in range(-(-bits // c) * c - c, -1, -c):
+        if result != 1:
+            for _ in range(c):
+                result = result * result % modulus
+        buckets = [None] * (mask + 1)
+        for base, exponent in zip(bases, exponents):
+            digit = (exponent >> shift) & mask
+            if digit:
+                bucket = buckets[digit]
+                buckets[digit] = base if bucket is None else bucket * base % modulus
+        running = None
+        acc = None
+        for digit in range(mask, 0, -1):
+            bucket = buckets[digit]
+            if bucket is not None:
+                running = bucket if running is None else running * bucket % modulus
+            if running is not None:
+                acc = running if acc is None else acc * running % modulus
+        if acc is not None:
+            result = result * acc % modulus
+    return result
+
+
+def multi_exp(bases: Sequence[int], exponents: Sequence[int], modulus: int,
+              order: Optional[int] = None) -> int:
+    """Compute ``prod(base ** exponent) mod modulus`` with the best method.
+
+    Uses ``pow`` for one base, Shamir's trick for two, interleaved windows
+    for a few and the bucket method for many.
+
+    Args:
+        bases: The bases.
+        exponents: One exponent per base.
+        modulus: The modulus.
+        order: Optional group order used to reduce (and allow negative)
+            exponents.
+
+    Returns:
+        int: The product of the powers.
+
+    Raises:
+        ValueError: If the sequences differ in length, or an exponent is
+            negative and no order is given.
+    """
+    if len(bases) != len(exponents):
+        raise ValueError("Need exactly one exponent per base")
+    if len(bases) == 1:
+        return pow(bases[0], _normalize(exponents, order)[0], modulus)
+    if len(bases) == 2:
+        return shamir_exp(bases[0], exponents[0], bases[1], exponents[1], modulus, order)
+    if len(bases) <= 16:
+        return interleaved_exp(bases, exponents, modulus, order)
+    return bucket_exp(bases, exponents, modulus, order)
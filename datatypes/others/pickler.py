@@ -73,4 +73,3 @@ class BaseDataTypesUnpickler:
             ValueError: If the data cannot be safely unpickled.
         """
         return self.__unpickle(self.pickled_value)
-
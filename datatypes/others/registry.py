@@ -0,0 +1,163 @@
+"""Every class the instrumentation and memory walker know about, in one place.
+
+``instrument.register`` and ``memory.register`` are told about the
+package's classes here rather than at the bottom of each module. The
+declarations are keyed by module name and run right after that module is
+executed, by an import hook that ``import datatypes`` installs, so they
+apply whether a class is reached through ``datatypes.MultiDict`` or
+imported straight from its module.
+
+To cover a new class, add a function taking its module and an entry in
+``DECLARATIONS``. This module imports nothing from the package up front,
+so installing the hook keeps ``import datatypes`` cheap.
+"""
+import sys
+from importlib.machinery import PathFinder
+
+
+def _pickler(module, instrument, memory):
+    instrument.register(module.BaseDataTypesPickler, 'others', ('get_pickled_value',),
+                        sizes={'get_pickled_value': instrument.result_length},
+                        timed=('get_pickled_value',))
+    instrument.register(module.BaseDataTypesUnpickler, 'others', ('get_unpickled_value',),
+                        sizes={'get_unpickled_value': lambda self, result: len(self.pickled_value)},
+                        timed=('get_unpickled_value',))
+
+
+def _chunked(module, instrument, memory):
+    memory.register(module.ChunkedSet, lambda self: self.parts(), lambda self: self)
+    memory.register(module.ChunkedMap, lambda self: self.parts(),
+                    lambda self: [x for item in self.items() for x in item])
+
+
+def _circularlist(module, instrument, memory):
+    cls = module.CircularList
+    instrument.register(cls, 'collections',
+                        ('__getitem__', '__setitem__', 'append', 'pop', 'rotate'),
+                        sizes={'append': instrument.length, 'rotate': instrument.length},
+                        timed=('rotate',))
+    memory.register(cls, lambda self: (self._items,), lambda self: self._items)
+
+
+def _defaultlist(module, instrument, memory):
+    memory.register(module.DefaultList, lambda self: (self.__dict__,),
+                    lambda self: [*self, self.default])
+
+
+def _diskmultidict(module, instrument, memory):
+    instrument.register(module.DiskMultiDict, 'collections',
+                        ('add', 'get', 'get_one', 'remove', 'items'),
+                        sizes={'get': instrument.result_length},
+                        timed=('add', 'get', 'remove', 'items'))
+
+
+def _diskorderedset(module, instrument, memory):
+    instrument.register(module.DiskOrderedSet, 'collections',
+                        ('add', 'discard', 'remove', 'update', '__contains__', '__iter__'),
+                        sizes={'add': instrument.length, 'update': instrument.length},
+                        timed=('add', 'update', '__contains__'))
+
+
+def _frozendict(module, instrument, memory):
+    cls = module.FrozenDict
+    instrument.register(cls, 'collections', ('__getitem__', '__contains__', '__eq__'))
+    memory.register(cls, lambda self: (self._dict,),
+                    lambda self: [x for item in self._dict.items() for x in item])
+
+
+def _multidict(module, instrument, memory):
+    cls = module.MultiDict
+    instrument.register(cls, 'collections',
+                        ('add', 'get', 'get_one', 'remove', 'items', '__len__', 'snapshot'),
+                        sizes={'add': lambda self, result, key, value: len(self._items[key])},
+                        timed=('remove', 'items', '__len__', 'snapshot'))
+    memory.register(cls, lambda self: [self._items, *self._items.parts(), *self._items.values()],
+                    lambda self: [x for key, values in self._items.items() for x in (key, *values)])
+
+
+def _orderedset(module, instrument, memory):
+    cls = module.OrderedSet
+    instrument.register(cls, 'collections',
+                        ('add', 'discard', 'remove', 'update', '__contains__', '__iter__', 'snapshot'),
+                        sizes={'add': instrument.length, 'update': instrument.length},
+                        timed=('update',))
+    memory.register(cls, lambda self: (self._items, *self._items.parts()), lambda self: self._items)
+
+
+def _complex(module, instrument, memory):
+    instrument.register(module.Complex, 'numeric',
+                        ('__add__', '__sub__', '__mul__', '__truediv__', '__abs__'))
+
+
+def _decimalrange(module, instrument, memory):
+    instrument.register(module.DecimalRange, 'numeric', ('__iter__', '__getitem__', '__contains__'),
+                        sizes={'__iter__': instrument.length},
+                        timed=('__iter__', '__contains__'))
+
+
+# Module name to the function declaring its classes.
+DECLARATIONS = {
+    'datatypes.collections.DefaultList_NewList': _defaultlist,
+    'datatypes.collections.chunked': _chunked,
+    'datatypes.collections.circularlist': _circularlist,
+    'datatypes.collections.diskmultidict': _diskmultidict,
+    'datatypes.collections.diskorderedset': _diskorderedset,
+    'datatypes.collections.frozendict': _frozendict,
+    'datatypes.collections.multidict': _multidict,
+    'datatypes.collections.orderedset': _orderedset,
+    'datatypes.numeric.complex': _complex,
+    'datatypes.numeric.decimalrange': _decimalrange,
+    'datatypes.others.pickler': _pickler,
+}
+
+
+def declare(module) -> None:
+    """Run the declarations of a freshly executed module, if it has any."""
+    declaration = DECLARATIONS.get(module.__name__)
+    if declaration is not None:
+        from . import instrument, memory
+        declaration(module, instrument, memory)
+
+
+class _DeclaringLoader:
+    """Wraps a module's loader to run its declarations after executing it."""
+
+    def __init__(self, loader) -> None:
+        self._loader = loader
+
+    def __getattr__(self, name: str):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        self._loader.exec_module(module)
+        declare(module)
+
+
+class _DeclaringFinder:
+    """Finds the modules in ``DECLARATIONS`` and wraps their loaders."""
+
+    @staticmethod
+    def find_spec(fullname: str, path=None, target=None):
+        if fullname not in DECLARATIONS:
+            return None
+        spec = PathFinder.find_spec(fullname, path, target)
+        if spec is not None and spec.loader is not None:
+            spec.loader = _DeclaringLoader(spec.loader)
+        return spec
+
+
+def install() -> None:
+    """Put the import hook in front of ``sys.meta_path``, once.
+
+    Modules imported before this are declared on the spot.
+    """
+    if any(isinstance(finder, _DeclaringFinder) for finder in sys.meta_path):
+        return
+    sys.meta_path.insert(0, _DeclaringFinder())
+    for name in DECLARATIONS:
+        module = sys.modules.get(name)
+        if module is not None:
+            declare(module)
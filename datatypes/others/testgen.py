@@ -1,13 +1,57 @@
 import inspect
 import ast
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Type, Union
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Type, Union
 import unittest
 import random
 import string
 import datetime
 from decimal import Decimal
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Bump when the generated output changes, so existing manifests are ignored.
+GENERATOR_VERSION = 1
+MANIFEST_NAME = '.testgen-manifest.json'
+
+
+@dataclass
+class GenerationSummary:
+    """What a ``generate_project_tests`` run did, with timings in seconds."""
+    parsed: List[Path] = field(default_factory=list)
+    skipped: List[Path] = field(default_factory=list)
+    written: List[Path] = field(default_factory=list)
+    unchanged: List[Path] = field(default_factory=list)
+    errors: Dict[Path, str] = field(default_factory=dict)
+    scan_time: float = 0.0
+    generate_time: float = 0.0
+    write_time: float = 0.0
+    total_time: float = 0.0
+
+    def __str__(self) -> str:
+        return (f"{len(self.parsed)} parsed, {len(self.skipped)} skipped (unchanged source), "
+                f"{len(self.written)} written, {len(self.unchanged)} unchanged output, "
+                f"{len(self.errors)} errors in {self.total_time:.2f}s "
+                f"(scan {self.scan_time:.2f}s, generate {self.generate_time:.2f}s, "
+                f"write {self.write_time:.2f}s)")
+
+
+def _generate_worker(root_path: str, module_path: str) -> Tuple[str, Optional[str], Optional[str]]:
+    """Generate one test file in a worker process."""
+    try:
+        return module_path, TestGenerator(root_path).generate_test_file(module_path), None
+    except Exception as e:
+        return module_path, None, str(e)
+
 class TestGenerator:
     """Generate unit tests for Python modules."""
     
@@ -151,16 +195,91 @@ class TestGenerator:
                 return self._get_default_value('str')
         return 'None'
     
-    def generate_project_tests(self) -> None:
-        """Generate test files for all modules in the project."""
+    def generate_project_tests(self, incremental: bool = True,
+                               max_workers: Optional[int] = None,
+                               manifest_path: Optional[Union[str, Path]] = None) -> GenerationSummary:
+        """Generate test files for all modules in the project.
+
+        A manifest of source hashes lets unchanged modules be skipped on the
+        next run, changed modules are parsed on a process pool, and a test
+        file is only rewritten when its generated text actually changes.
+
+        Args:
+            incremental: Skip modules whose source hash matches the manifest.
+            max_workers: Worker processes for parsing; 1 runs in-process.
+            manifest_path: Where to keep the manifest. Defaults to
+                ``MANIFEST_NAME`` in the project root.
+
+        Returns:
+            GenerationSummary: Modules parsed, skipped and written, with timings.
+        """
+        summary = GenerationSummary()
+        start = time.perf_counter()
+        manifest_path = Path(manifest_path) if manifest_path else self.root_path / MANIFEST_NAME
+        manifest = self._load_manifest(manifest_path) if incremental else {}
+        new_manifest = {}
+
+        todo = []
         for py_file in self.root_path.rglob('*.py'):
-            if not any(part.startswith('_') for part in py_file.parts):
-                try:
-                    test_content = self.generate_test_file(py_file)
-                    test_path = py_file.parent / f"test_{py_file.name}"
-                    test_path.write_text(test_content)
-                except Exception as e:
-                    print(f"Error generating tests for {py_file}: {str(e)}")
+            if any(part.startswith('_') for part in py_file.parts) or py_file.name.startswith('test_'):
+                continue
+            key = str(py_file.relative_to(self.root_path))
+            digest = hashlib.sha256(py_file.read_bytes()).hexdigest()
+            new_manifest[key] = digest
+            test_path = py_file.parent / f"test_{py_file.name}"
+            if manifest.get(key) == digest and test_path.exists():
+                summary.skipped.append(py_file)
+            else:
+                todo.append(py_file)
+        summary.scan_time = time.perf_counter() - start
+
+        start_generate = time.perf_counter()
+        if max_workers == 1 or len(todo) < 2:
+            generated = [_generate_worker(str(self.root_path), str(f)) for f in todo]
+        else:
+            with ProcessPoolExecutor(max_workers) as pool:
+                generated = list(pool.map(_generate_worker, [str(self.root_path)] * len(todo),
+                                          [str(f) for f in todo], chunksize=8))
+        summary.generate_time = time.perf_counter() - start_generate
+
+        start_write = time.perf_counter()
+        for module_path, test_content, error in generated:
+            py_file = Path(module_path)
+            if error is not None:
+                print(f"Error generating tests for {py_file}: {error}")
+                summary.errors[py_file] = error
+                new_manifest.pop(str(py_file.relative_to(self.root_path)), None)
+                continue
+            summary.parsed.append(py_file)
+            test_path = py_file.parent / f"test_{py_file.name}"
+            if test_path.exists() and test_path.read_text() == test_content:
+                summary.unchanged.append(test_path)
+            else:
+                test_path.write_text(test_content)
+                summary.written.append(test_path)
+        self._save_manifest(manifest_path, new_manifest)
+        summary.write_time = time.perf_counter() - start_write
+        summary.total_time = time.perf_counter() - start
+        return summary
+
+    @staticmethod
+    def _load_manifest(path: Path) -> Dict[str, str]:
+        """Load the source-hash manifest, ignoring missing or stale ones."""
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if data.get('version') != GENERATOR_VERSION:
+            return {}
+        return data.get('modules', {})
+
+    @staticmethod
+    def _save_manifest(path: Path, modules: Dict[str, str]) -> None:
+        """Write the manifest atomically so an interrupted run cannot corrupt it."""
+        tmp = path.with_name(path.name + '.tmp')
+        tmp.write_text(json.dumps({'version': GENERATOR_VERSION, 'modules': modules},
+                                  indent=1, sort_keys=True))
+        os.replace(tmp, path)
 
 class DataGenerator:
     """Generate test data for different types."""
@@ -199,7 +318,7 @@ class DataGenerator:
     @staticmethod
     def random_bytes(length: int = 10) -> bytes:
         """Generate random bytes."""
-        return bytes(random.getrandbits(8) for _ in range(length))
+        return random.randbytes(length)
     
     @staticmethod
     def random_list(
@@ -216,6 +335,15 @@ class DataGenerator:
             datetime.datetime: DataGenerator.random_datetime,
             bytes: DataGenerator.random_bytes
         }
+        # Draw ints and strings in one block instead of one call per element.
+        if value_type is int and set(kwargs) <= {'min_val', 'max_val'}:
+            low = kwargs.get('min_val', -1000)
+            high = kwargs.get('max_val', 1000)
+            if type(low) is int and type(high) is int and length > 0:
+                return _random_ints(random, low, high, length)
+        if value_type is str and set(kwargs) <= {'length'}:
+            return _split_letters(random.choices(string.ascii_letters, k=length * kwargs.get('length', 10)),
+                                  length, kwargs.get('length', 10))
         generator = generators.get(value_type, DataGenerator.random_string)
         return [generator(**kwargs) for _ in range(length)]
     
@@ -230,3 +358,198 @@ class DataGenerator:
         keys = DataGenerator.random_list(length, key_type, **kwargs)
         values = DataGenerator.random_list(length, value_type, **kwargs)
         return dict(zip(keys, values))
+
+
+def _random_ints(rng: Any, low: int, high: int, count: int) -> List[int]:
+    """Draw ``count`` ints in ``[low, high]`` from ``rng`` (``random`` or a ``Random``).
+
+    ``choices`` draws in one call but picks with ``floor(random() * n)``,
+    which only has 53 bits, so wider spans go through ``randrange``.
+
+    Raises:
+        ValueError: If ``low > high``, as ``random.randint`` does.
+    """
+    if low > high:
+        raise ValueError(f"empty range for randrange() ({low}, {high + 1}, {high + 1 - low})")
+    if high - low < 2 ** 53:
+        return rng.choices(range(low, high + 1), k=count)
+    randrange = rng.randrange
+    return [randrange(low, high + 1) for _ in range(count)]
+
+
+def _split_letters(letters: List[str], count: int, length: int) -> List[str]:
+    """Cut a flat list of characters into ``count`` strings of ``length``."""
+    if length == 0:
+        return [''] * count
+    joined = ''.join(letters)
+    return [joined[i:i + length] for i in range(0, count * length, length)]
+
+
+def _package_types():
+    """Import the package types that BulkDataGenerator builds, on first use."""
+    from .. import Complex, DecimalRange, MultiDict, OrderedSet
+    return Complex, DecimalRange, MultiDict, OrderedSet
+
+
+class BulkDataGenerator:
+    """Generate large volumes of test data in blocks, reproducibly.
+
+    Every generator draws whole blocks at once (``randbytes``, ``choices``
+    with ``k`` for spans of up to 53 bits, or NumPy when it is installed) and yields them in chunks of
+    at most ``chunk_size`` items, so datasets of any size can be streamed
+    without holding them in memory. Each instance has its own seeded
+    stream; ``spawn`` derives independent child streams for workers.
+    """
+
+    def __init__(self, seed: Optional[int] = None, chunk_size: int = 65536,
+                 use_numpy: Optional[bool] = None) -> None:
+        """Initialize the generator.
+
+        Args:
+            seed: Seed of the stream. A random one is drawn if omitted; it
+                is kept in ``self.seed`` so the run can be reproduced.
+                Streams are reproducible for the same seed and backend.
+            chunk_size: Maximum number of items per yielded chunk.
+            use_numpy: Force NumPy on or off. Defaults to using it when it
+                is installed.
+
+        Raises:
+            ImportError: If ``use_numpy`` is True and NumPy is missing.
+        """
+        if use_numpy and np is None:
+            raise ImportError("NumPy is not installed")
+        self.seed = seed if seed is not None else int.from_bytes(os.urandom(16), 'big')
+        self.chunk_size = chunk_size
+        self.use_numpy = np is not None if use_numpy is None else use_numpy
+        self._random = random.Random(self.seed)
+        self._np_random = np.random.default_rng(self.seed) if self.use_numpy else None
+
+    def spawn(self, count: int) -> List['BulkDataGenerator']:
+        """Derive ``count`` independent generators, e.g. one per worker process.
+
+        Child seeds are hashes of the parent seed and the child index, so
+        the same parent seed always gives the same children and their
+        streams do not overlap.
+        """
+        children = []
+        for index in range(count):
+            digest = hashlib.sha256(f"{self.seed}:{index}".encode()).digest()
+            children.append(BulkDataGenerator(int.from_bytes(digest[:16], 'big'),
+                                              self.chunk_size, self.use_numpy))
+        return children
+
+    def _chunks(self, count: int) -> Iterator[int]:
+        while count > 0:
+            size = min(count, self.chunk_size)
+            yield size
+            count -= size
+
+    def bytes_chunks(self, total: int) -> Iterator[bytes]:
+        """Yield ``total`` random bytes in chunks of up to ``chunk_size``."""
+        for size in self._chunks(total):
+            if self._np_random is not None:
+                yield self._np_random.bytes(size)
+            else:
+                yield self._random.randbytes(size)
+
+    def int_chunks(self, count: int, min_val: int = -1000, max_val: int = 1000) -> Iterator[List[int]]:
+        """Yield ``count`` random ints in ``[min_val, max_val]``.
+
+        Raises:
+            ValueError: If ``min_val > max_val``.
+        """
+        for size in self._chunks(count):
+            if self._np_random is not None and -2 ** 63 <= min_val and max_val < 2 ** 63 - 1:
+                yield self._np_random.integers(min_val, max_val + 1, size=size).tolist()
+            else:
+                yield _random_ints(self._random, min_val, max_val, size)
+
+    def float_chunks(self, count: int, min_val: float = -1000.0,
+                     max_val: float = 1000.0) -> Iterator[List[float]]:
+        """Yield ``count`` random floats in ``[min_val, max_val)``."""
+        span = max_val - min_val
+        for size in self._chunks(count):
+            if self._np_random is not None:
+                yield self._np_random.uniform(min_val, max_val, size=size).tolist()
+            else:
+                r = self._random.random
+                yield [min_val + span * r() for _ in range(size)]
+
+    def string_chunks(self, count: int, length: int = 10) -> Iterator[List[str]]:
+        """Yield ``count`` random ASCII-letter strings of ``length``."""
+        for size in self._chunks(count):
+            if self._np_random is not None and length:
+                alphabet = np.frombuffer(string.ascii_letters.encode(), dtype=np.uint8)
+                codes = alphabet[self._np_random.integers(0, len(alphabet), size=(size, length))]
+                yield [v.decode() for v in codes.view(f'S{length}').ravel().tolist()]
+            else:
+                yield _split_letters(self._random.choices(string.ascii_letters, k=size * length),
+                                     size, length)
+
+    def records(self, count: int, schema: Dict[str, Type]) -> Iterator[List[Dict[str, Any]]]:
+        """Yield ``count`` records as chunks of dicts.
+
+        Args:
+            count: Number of records.
+            schema: Field name to type; ``int``, ``float``, ``str`` and
+                ``bytes`` (10 bytes per value) are supported.
+
+        Raises:
+            TypeError: For an unsupported field type.
+        """
+        column_makers = {
+            int: lambda n: next(self.int_chunks(n)),
+            float: lambda n: next(self.float_chunks(n)),
+            str: lambda n: next(self.string_chunks(n)),
+            bytes: lambda n: self._split_bytes(n, 10),
+        }
+        for name, value_type in schema.items():
+            if value_type not in column_makers:
+                raise TypeError(f"Unsupported field type for {name!r}: {value_type!r}")
+        names = list(schema)
+        for size in self._chunks(count):
+            columns = [column_makers[schema[name]](size) for name in names]
+            yield [dict(zip(names, row)) for row in zip(*columns)]
+
+    def _split_bytes(self, count: int, length: int) -> List[bytes]:
+        data = b''.join(self.bytes_chunks(count * length))
+        return [data[i:i + length] for i in range(0, count * length, length)]
+
+    def complex_chunks(self, count: int, min_val: float = -1000.0,
+                       max_val: float = 1000.0) -> Iterator[List[Any]]:
+        """Yield ``count`` random ``Complex`` numbers."""
+        Complex = _package_types()[0]
+        for size in self._chunks(count):
+            reals = next(self.float_chunks(size, min_val, max_val))
+            imags = next(self.float_chunks(size, min_val, max_val))
+            yield [Complex(real, imag) for real, imag in zip(reals, imags)]
+
+    def decimal_ranges(self, count: int, max_length: int = 1000) -> Iterator[List[Any]]:
+        """Yield ``count`` random ``DecimalRange`` objects with up to ``max_length`` items."""
+        DecimalRange = _package_types()[1]
+        for size in self._chunks(count):
+            starts = next(self.int_chunks(size, -10 ** 6, 10 ** 6))
+            steps = next(self.int_chunks(size, 1, 1000))
+            lengths = next(self.int_chunks(size, 0, max_length))
+            yield [DecimalRange(Decimal(start) / 100, Decimal(start + step * length) / 100, Decimal(step) / 100)
+                   for start, step, length in zip(starts, steps, lengths)]
+
+    def multidict(self, size: int, key_count: Optional[int] = None) -> Any:
+        """Build a ``MultiDict`` holding ``size`` values spread over ``key_count`` string keys."""
+        MultiDict = _package_types()[2]
+        key_count = key_count or max(1, size // 4)
+        keys = [k for chunk in self.string_chunks(key_count) for k in chunk]
+        result = MultiDict()
+        for chunk in self.int_chunks(size, 0, key_count - 1):
+            for index in chunk:
+                result.add(keys[index], index)
+        return result
+
+    def orderedset(self, size: int, value_type: Type = int) -> Any:
+        """Build an ``OrderedSet`` from ``size`` random ints or strings (duplicates collapse)."""
+        OrderedSet = _package_types()[3]
+        result = OrderedSet()
+        chunks = self.string_chunks(size) if value_type is str else self.int_chunks(size, 0, 2 ** 62)
+        for chunk in chunks:
+            result.update(chunk)
+        return result
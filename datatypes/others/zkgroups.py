@@ -0,0 +1,317 @@
+"""Prime-order group backends for the zero-knowledge proof protocols.
+
+The protocols only need a handful of operations from a group: the group
+law, scalar multiplication, a canonical fixed-width encoding and a way to
+hash into the scalar field. ``Group`` captures those, with one backend for
+the multiplicative groups modulo a safe prime and one for the NIST P-256
+elliptic curve.
+"""
+import copyreg
+import hashlib
+import secrets
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Sequence, Union
+
+from Crypto.PublicKey.ECC import EccPoint
+
+from .multiexp import multi_exp
+from .zkparams import GroupParams, standard_group
+
+
+def _jacobi(a: int, n: int) -> int:
+    """Return the Jacobi symbol (a/n) for odd positive ``n``."""
+    a %= n
+    result = 1
+    while a:
+        twos = (a & -a).bit_length() - 1
+        a >>= twos
+        if twos & 1 and n & 7 in (3, 5):
+            result = -result
+        if a & n & 3 == 3:
+            result = -result
+        a, n = n % a, a
+    return result if n == 1 else 0
+
+
+def in_safe_prime_subgroup(a: int, p: int) -> bool:
+    """Return whether ``a`` lies in the order-q subgroup modulo a safe prime p = 2q + 1.
+
+    That subgroup is the quadratic residues, so the Legendre symbol decides
+    membership; computed as a Jacobi symbol it costs a small fraction of
+    the exponentiation ``a ** q``.
+    """
+    return 0 < a < p and _jacobi(a, p) == 1
+
+
+class Group(ABC):
+    """A cyclic group of prime order, written additively."""
+
+    name: str
+    order: int
+
+    @property
+    def description(self) -> bytes:
+        """Bytes identifying the group, bound into hashes and transcripts.
+
+        The name, plus the parameters for backends whose name does not
+        determine them.
+        """
+        return self.name.encode()
+
+    @property
+    def scalar_size(self) -> int:
+        """Number of bytes needed to encode a scalar."""
+        return (self.order.bit_length() + 7) // 8
+
+    @property
+    @abstractmethod
+    def element_size(self) -> int:
+        """Number of bytes in an encoded element."""
+
+    @property
+    @abstractmethod
+    def generator(self) -> Any:
+        """The standard generator."""
+
+    @abstractmethod
+    def identity(self) -> Any:
+        """Return the neutral element."""
+
+    @abstractmethod
+    def add(self, a: Any, b: Any) -> Any:
+        """Apply the group law."""
+
+    @abstractmethod
+    def neg(self, a: Any) -> Any:
+        """Return the inverse of an element."""
+
+    @abstractmethod
+    def scalar_mul(self, a: Any, k: int) -> Any:
+        """Return ``k`` times ``a``."""
+
+    def multi_scalar_mul(self, elements: Sequence[Any], scalars: Sequence[int]) -> Any:
+        """Return the sum of ``k_i`` times ``a_i``."""
+        result = self.identity()
+        for a, k in zip(elements, scalars):
+            result = self.add(result, self.scalar_mul(a, k))
+        return result
+
+    @abstractmethod
+    def encode(self, a: Any) -> bytes:
+        """Encode an element to exactly ``element_size`` bytes."""
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Any:
+        """Decode and validate an element.
+
+        Raises:
+            ValueError: If the bytes do not encode an element of the group.
+        """
+
+    def hash_to_scalar(self, *parts: bytes) -> int:
+        """Hash length-prefixed byte strings to a scalar modulo the order."""
+        h = hashlib.sha512(self.description)
+        for part in parts:
+            h.update(len(part).to_bytes(4, 'big'))
+            h.update(part)
+        return int.from_bytes(h.digest(), 'big') % self.order
+
+    @abstractmethod
+    def derive_generator(self, label: bytes) -> Any:
+        """Derive a generator whose discrete log base ``generator`` is unknown."""
+
+    def random_scalar(self) -> int:
+        """Return a uniformly random non-zero scalar."""
+        return secrets.randbelow(self.order - 1) + 1
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Group) and type(self) is type(other) and self.description == other.description
+
+    def __hash__(self) -> int:
+        return hash((type(self).__name__, self.description))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r})"
+
+
+class ModPGroup(Group):
+    """The order-q subgroup of the integers modulo a safe prime p = 2q + 1."""
+
+    def __init__(self, params: GroupParams) -> None:
+        self.params = params
+        self.name = params.name
+        self.order = params.q
+        # Every generated group is named 'generated', so the name alone
+        # does not tell groups apart. Built once: bytes cache their hash.
+        self._description = f"{params.name}:{params.p:x}:{params.q:x}:{params.g:x}".encode()
+
+    @property
+    def description(self) -> bytes:
+        return self._description
+
+    @property
+    def element_size(self) -> int:
+        return self.params.element_size
+
+    @property
+    def generator(self) -> int:
+        return self.params.g
+
+    def identity(self) -> int:
+        return 1
+
+    def add(self, a: int, b: int) -> int:
+        return a * b % self.params.p
+
+    def neg(self, a: int) -> int:
+        return pow(a, -1, self.params.p)
+
+    def scalar_mul(self, a: int, k: int) -> int:
+        return pow(a, k % self.order, self.params.p)
+
+    def multi_scalar_mul(self, elements: Sequence[int], scalars: Sequence[int]) -> int:
+        return multi_exp(list(elements), list(scalars), self.params.p, self.order)
+
+    def encode(self, a: int) -> bytes:
+        return a.to_bytes(self.element_size, 'big')
+
+    def decode(self, data: bytes) -> int:
+        """Decode an element, checking its length, range and subgroup."""
+        if len(data) != self.element_size:
+            raise ValueError(f"Expected {self.element_size} bytes, got {len(data)}")
+        a = int.from_bytes(data, 'big')
+        if not 0 < a < self.params.p:
+            raise ValueError("Element out of range")
+        if not in_safe_prime_subgroup(a, self.params.p):
+            raise ValueError("Element is not in the order-q subgroup")
+        return a
+
+    def derive_generator(self, label: bytes) -> int:
+        return self.params.derive_generator(label)
+
+    def __reduce__(self):
+        return ModPGroup, (self.params,)
+
+
+# NIST P-256 (SEC 2 secp256r1), y^2 = x^3 - 3x + b over GF(p).
+_P256 = {
+    'p': 0xffffffff00000001000000000000000000000000ffffffffffffffffffffffff,
+    'b': 0x5ac635d8aa3a93e7b3ebbd55769886bc651d06b0cc53b0f63bce3c3e27d2604b,
+    'n': 0xffffffff00000000ffffffffffffffffbce6faada7179e84f3b9cac2fc632551,
+    'gx': 0x6b17d1f2e12c4247f8bce6e563a440f277037d812deb33a0f4a13945d898c296,
+    'gy': 0x4fe342e2fe1a7f9b8ee7eb4a7c0f9e162bce33576b315ececbb6406837bf51f5,
+}
+
+
+class EllipticCurveGroup(Group):
+    """The NIST P-256 curve, using PyCryptodome's point arithmetic.
+
+    Elements are ``EccPoint`` objects and encode to 33-byte compressed
+    SEC1 points, so proofs are a fraction of the size of the mod-p ones.
+    """
+
+    name = 'p256'
+    order = _P256['n']
+
+    @property
+    def element_size(self) -> int:
+        return 33
+
+    @property
+    def generator(self) -> EccPoint:
+        return EccPoint(_P256['gx'], _P256['gy'], 'P-256')
+
+    def identity(self) -> EccPoint:
+        return EccPoint(0, 0, 'P-256')
+
+    def add(self, a: EccPoint, b: EccPoint) -> EccPoint:
+        return a + b
+
+    def neg(self, a: EccPoint) -> EccPoint:
+        return -a
+
+    def scalar_mul(self, a: EccPoint, k: int) -> EccPoint:
+        return a * (k % self.order)
+
+    def encode(self, a: EccPoint) -> bytes:
+        if a.is_point_at_infinity():
+            return bytes(33)
+        x, y = (int(v) for v in a.xy)
+        return bytes([2 + (y & 1)]) + x.to_bytes(32, 'big')
+
+    def decode(self, data: bytes) -> EccPoint:
+        if len(data) != 33:
+            raise ValueError(f"Expected 33 bytes, got {len(data)}")
+        if data == bytes(33):
+            return self.identity()
+        if data[0] not in (2, 3):
+            raise ValueError("Not a compressed SEC1 point")
+        p = _P256['p']
+        x = int.from_bytes(data[1:], 'big')
+        if x >= p:
+            raise ValueError("Point coordinate out of range")
+        y = self._sqrt((pow(x, 3, p) - 3 * x + _P256['b']) % p)
+        if y is None:
+            raise ValueError("Point is not on the curve")
+        if (y & 1) != (data[0] & 1):
+            y = p - y
+        return EccPoint(x, y, 'P-256')
+
+    @staticmethod
+    def _sqrt(value: int):
+        p = _P256['p']
+        # p = 3 mod 4, so a square root is value ** ((p + 1) / 4).
+        root = pow(value, (p + 1) // 4, p)
+        return root if root * root % p == value else None
+
+    def derive_generator(self, label: bytes) -> EccPoint:
+        """Hash-and-increment a label onto the curve (try-and-increment)."""
+        counter = 0
+        while True:
+            digest = hashlib.sha256(b'p256' + label + counter.to_bytes(4, 'big')).digest()
+            try:
+                return self.decode(b'\x02' + digest)
+            except ValueError:
+                counter += 1
+
+    def __reduce__(self):
+        return EllipticCurveGroup, ()
+
+
+def _reduce_point(point: EccPoint):
+    x, y = (int(v) for v in point.xy)
+    return EccPoint, (x, y, point.curve)
+
+
+# EccPoint wraps a C handle and is not picklable on its own; elements
+# need to cross process boundaries for ZeroKnowledgeProofs.prove_many.
+# The reducer applies to every EccPoint, so it keeps each point's curve.
+copyreg.pickle(EccPoint, _reduce_point)
+
+
+def get_group(group: Union[str, GroupParams, Group] = 'p256') -> Group:
+    """Return a group backend.
+
+    Args:
+        group: A ``Group`` (returned as is), a ``GroupParams``, ``'p256'``,
+            or a standard mod-p group name such as ``'modp2048'`` or
+            ``'ffdhe3072'``.
+
+    Raises:
+        ValueError: If the name is unknown.
+    """
+    if isinstance(group, Group):
+        return group
+    if isinstance(group, GroupParams):
+        return ModPGroup(group)
+    name = group.lower().replace('-', '')
+    if name in _groups:
+        return _groups[name]
+    for family in ('modp', 'ffdhe'):
+        if name.startswith(family) and name[len(family):].isdigit():
+            _groups[name] = ModPGroup(standard_group(int(name[len(family):]), family))
+            return _groups[name]
+    raise ValueError(f"Unknown group {group!r}")
+
+
+_groups: Dict[str, Group] = {'p256': EllipticCurveGroup()}
@@ -0,0 +1,347 @@
+"""Group parameters for the zero-knowledge proof protocols."""
+import hashlib
+import secrets
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from Crypto.Util.number import isPrime
+
+# Safe primes p = 2q + 1 from RFC 3526 (MODP) and RFC 7919 (FFDHE).
+# All of them are 7 mod 8, so 2 generates the subgroup of order q.
+_STANDARD_PRIMES = {
+    ('modp', 2048): (
+        'FFFFFFFFFFFFFFFFC90FDAA22168C234C4C6628B80DC1CD129024E088A67CC74'
+        '020BBEA63B139B22514A08798E3404DDEF9519B3CD3A431B302B0A6DF25F1437'
+        '4FE1356D6D51C245E485B576625E7EC6F44C42E9A637ED6B0BFF5CB6F406B7ED'
+        'EE386BFB5A899FA5AE9F24117C4B1FE649286651ECE45B3DC2007CB8A163BF05'
+        '98DA48361C55D39A69163FA8FD24CF5F83655D23DCA3AD961C62F356208552BB'
+        '9ED529077096966D670C354E4ABC9804F1746C08CA18217C32905E462E36CE3B'
+        'E39E772C180E86039B2783A2EC07A28FB5C55DF06F4C52C9DE2BCBF695581718'
+        '3995497CEA956AE515D2261898FA051015728E5A8AACAA68FFFFFFFFFFFFFFFF'
+    ),
+    ('modp', 3072): (
+        'FFFFFFFFFFFFFFFFC90FDAA22168C234C4C6628B80DC1CD129024E088A67CC74'
+        '020BBEA63B139B22514A08798E3404DDEF9519B3CD3A431B302B0A6DF25F1437'
+        '4FE1356D6D51C245E485B576625E7EC6F44C42E9A637ED6B0BFF5CB6F406B7ED'
+        'EE386BFB5A899FA5AE9F24117C4B1FE649286651ECE45B3DC2007CB8A163BF05'
+        '98DA48361C55D39A69163FA8FD24CF5F83655D23DCA3AD961C62F356208552BB'
+        '9ED529077096966D670C354E4ABC9804F1746C08CA18217C32905E462E36CE3B'
+        'E39E772C180E86039B2783A2EC07A28FB5C55DF06F4C52C9DE2BCBF695581718'
+        '3995497CEA956AE515D2261898FA051015728E5A8AAAC42DAD33170D04507A33'
+        'A85521ABDF1CBA64ECFB850458DBEF0A8AEA71575D060C7DB3970F85A6E1E4C7'
+        'ABF5AE8CDB0933D71E8C94E04A25619DCEE3D2261AD2EE6BF12FFA06D98A0864'
+        'D87602733EC86A64521F2B18177B200CBBE117577A615D6C770988C0BAD946E2'
+        '08E24FA074E5AB3143DB5BFCE0FD108E4B82D120A93AD2CAFFFFFFFFFFFFFFFF'
+    ),
+    ('modp', 4096): (
+        'FFFFFFFFFFFFFFFFC90FDAA22168C234C4C6628B80DC1CD129024E088A67CC74'
+        '020BBEA63B139B22514A08798E3404DDEF9519B3CD3A431B302B0A6DF25F1437'
+        '4FE1356D6D51C245E485B576625E7EC6F44C42E9A637ED6B0BFF5CB6F406B7ED'
+        'EE386BFB5A899FA5AE9F24117C4B1FE649286651ECE45B3DC2007CB8A163BF05'
+        '98DA48361C55D39A69163FA8FD24CF5F83655D23DCA3AD961C62F356208552BB'
+        '9ED529077096966D670C354E4ABC9804F1746C08CA18217C32905E462E36CE3B'
+        'E39E772C180E86039B2783A2EC07A28FB5C55DF06F4C52C9DE2BCBF695581718'
+        '3995497CEA956AE515D2261898FA051015728E5A8AAAC42DAD33170D04507A33'
+        'A85521ABDF1CBA64ECFB850458DBEF0A8AEA71575D060C7DB3970F85A6E1E4C7'
+        'ABF5AE8CDB0933D71E8C94E04A25619DCEE3D2261AD2EE6BF12FFA06D98A0864'
+        'D87602733EC86A64521F2B18177B200CBBE117577A615D6C770988C0BAD946E2'
+        '08E24FA074E5AB3143DB5BFCE0FD108E4B82D120A92108011A723C12A787E6D7'
+        '88719A10BDBA5B2699C327186AF4E23C1A946834B6150BDA2583E9CA2AD44CE8'
+        'DBBBC2DB04DE8EF92E8EFC141FBECAA6287C59474E6BC05D99B2964FA090C3A2'
+        '233BA186515BE7ED1F612970CEE2D7AFB81BDD762170481CD0069127D5B05AA9'
+        '93B4EA988D8FDDC186FFB7DC90A6C08F4DF435C934063199FFFFFFFFFFFFFFFF'
+    ),
+    ('ffdhe', 2048): (
+        'FFFFFFFFFFFFFFFFADF85458A2BB4A9AAFDC5620273D3CF1D8B9C583CE2D3695'
+        'A9E13641146433FBCC939DCE249B3EF97D2FE363630C75D8F681B202AEC4617A'
+        'D3DF1ED5D5FD65612433F51F5F066ED0856365553DED1AF3B557135E7F57C935'
+        '984F0C70E0E68B77E2A689DAF3EFE8721DF158A136ADE73530ACCA4F483A797A'
+        'BC0AB182B324FB61D108A94BB2C8E3FBB96ADAB760D7F4681D4F42A3DE394DF4'
+        'AE56EDE76372BB190B07A7C8EE0A6D709E02FCE1CDF7E2ECC03404CD28342F61'
+        '9172FE9CE98583FF8E4F1232EEF28183C3FE3B1B4C6FAD733BB5FCBC2EC22005'
+        'C58EF1837D1683B2C6F34A26C1B2EFFA886B423861285C97FFFFFFFFFFFFFFFF'
+    ),
+    ('ffdhe', 3072): (
+        'FFFFFFFFFFFFFFFFADF85458A2BB4A9AAFDC5620273D3CF1D8B9C583CE2D3695'
+        'A9E13641146433FBCC939DCE249B3EF97D2FE363630C75D8F681B202AEC4617A'
+        'D3DF1ED5D5FD65612433F51F5F066ED0856365553DED1AF3B557135E7F57C935'
+        '984F0C70E0E68B77E2A689DAF3EFE8721DF158A136ADE73530ACCA4F483A797A'
+        'BC0AB182B324FB61D108A94BB2C8E3FBB96ADAB760D7F4681D4F42A3DE394DF4'
+        'AE56EDE76372BB190B07A7C8EE0A6D709E02FCE1CDF7E2ECC03404CD28342F61'
+        '9172FE9CE98583FF8E4F1232EEF28183C3FE3B1B4C6FAD733BB5FCBC2EC22005'
+        'C58EF1837D1683B2C6F34A26C1B2EFFA886B4238611FCFDCDE355B3B6519035B'
+        'BC34F4DEF99C023861B46FC9D6E6C9077AD91D2691F7F7EE598CB0FAC186D91C'
+        'AEFE130985139270B4130C93BC437944F4FD4452E2D74DD364F2E21E71F54BFF'
+        '5CAE82AB9C9DF69EE86D2BC522363A0DABC521979B0DEADA1DBF9A42D5C4484E'
+        '0ABCD06BFA53DDEF3C1B20EE3FD59D7C25E41D2B66C62E37FFFFFFFFFFFFFFFF'
+    ),
+    ('ffdhe', 4096): (
+        'FFFFFFFFFFFFFFFFADF85458A2BB4A9AAFDC5620273D3CF1D8B9C583CE2D3695'
+        'A9E13641146433FBCC939DCE249B3EF97D2FE363630C75D8F681B202AEC4617A'
+        'D3DF1ED5D5FD65612433F51F5F066ED0856365553DED1AF3B557135E7F57C935'
+        '984F0C70E0E68B77E2A689DAF3EFE8721DF158A136ADE73530ACCA4F483A797A'
+        'BC0AB182B324FB61D108A94BB2C8E3FBB96ADAB760D7F4681D4F42A3DE394DF4'
+        'AE56EDE76372BB190B07A7C8EE0A6D709E02FCE1CDF7E2ECC03404CD28342F61'
+        '9172FE9CE98583FF8E4F1232EEF28183C3FE3B1B4C6FAD733BB5FCBC2EC22005'
+        'C58EF1837D1683B2C6F34A26C1B2EFFA886B4238611FCFDCDE355B3B6519035B'
+        'BC34F4DEF99C023861B46FC9D6E6C9077AD91D2691F7F7EE598CB0FAC186D91C'
+        'AEFE130985139270B4130C93BC437944F4FD4452E2D74DD364F2E21E71F54BFF'
+        '5CAE82AB9C9DF69EE86D2BC522363A0DABC521979B0DEADA1DBF9A42D5C4484E'
+        '0ABCD06BFA53DDEF3C1B20EE3FD59D7C25E41D2B669E1EF16E6F52C3164DF4FB'
+        '7930E9E4E58857B6AC7D5F42D69F6D187763CF1D5503400487F55BA57E31CC7A'
+        '7135C886EFB4318AED6A1E012D9E6832A907600A918130C46DC778F971AD0038'
+        '092999A333CB8B7A1A1DB93D7140003C2A4ECEA9F98D0ACC0A8291CDCEC97DCF'
+        '8EC9B55A7F88A46B4DB5A851F44182E1C68A007E5E655F6AFFFFFFFFFFFFFFFF'
+    ),
+}
+
+_SMALL_PRIMES = [n for n in range(3, 2000, 2) if all(n % d for d in range(3, int(n ** 0.5) + 1, 2))]
+
+
+@dataclass(frozen=True)
+class GroupParams:
+    """A prime-order subgroup of the integers modulo a safe prime p = 2q + 1."""
+    p: int
+    q: int
+    g: int
+    name: str = 'generated'
+
+    @property
+    def element_size(self) -> int:
+        """Number of bytes needed to encode a group element."""
+        return (self.p.bit_length() + 7) // 8
+
+    def derive_generator(self, label: bytes) -> int:
+        """Derive a second generator whose discrete log base g is unknown.
+
+        The label is hashed to an integer modulo p and squared, which maps
+        it into the subgroup of order q.
+
+        Args:
+            label: Domain separation label, e.g. ``b'pedersen-h'``.
+
+        Returns:
+            int: A generator of the order-q subgroup.
+        """
+        prefix = self.p.to_bytes(self.element_size, 'big') + label
+        counter = 0
+        while True:
+            stream = b''
+            block = 0
+            while len(stream) < self.element_size + 16:
+                stream += hashlib.sha256(
+                    prefix + counter.to_bytes(4, 'big') + block.to_bytes(4, 'big')
+                ).digest()
+                block += 1
+            h = pow(int.from_bytes(stream, 'big') % self.p, 2, self.p)
+            if h not in (0, 1, self.g):
+                return h
+            counter += 1
+
+    def as_tuple(self) -> Tuple[int, int, int]:
+        """Return ``(p, q, g)``."""
+        return self.p, self.q, self.g
+
+
+def standard_group(bits: int = 2048, family: str = 'modp') -> GroupParams:
+    """Return a built-in standard group.
+
+    Args:
+        bits: Size of the modulus (2048, 3072 or 4096).
+        family: ``'modp'`` for RFC 3526 or ``'ffdhe'`` for RFC 7919.
+
+    Returns:
+        GroupParams: The group with generator 2.
+
+    Raises:
+        ValueError: If no standard group of that size exists.
+    """
+    try:
+        p = int(''.join(_STANDARD_PRIMES[(family.lower(), bits)]), 16)
+    except KeyError:
+        sizes = sorted(b for f, b in _STANDARD_PRIMES if f == family.lower())
+        raise ValueError(f"No standard {family} group of {bits} bits (available: {sizes})")
+    return GroupParams(p, (p - 1) // 2, 2, f"{family.lower()}{bits}")
+
+
+def generate_safe_prime(bits: int) -> int:
+    """Generate a random safe prime p = 2q + 1 of exactly ``bits`` bits.
+
+    Candidates are sieved against small primes for both q and p before the
+    (expensive) probabilistic primality tests run.
+    """
+    if bits < 16:
+        raise ValueError("Safe primes need at least 16 bits")
+    window = 4096
+    while True:
+        q0 = secrets.randbits(bits - 1) | (1 << (bits - 2)) | 1
+        sieve = bytearray([1]) * window
+        for s in _SMALL_PRIMES:
+            # q = q0 + 2i is divisible by s
+            start = (-q0 * pow(2, -1, s)) % s
+            sieve[start::s] = bytes(len(range(start, window, s)))
+            # p = 2q + 1 = 2q0 + 1 + 4i is divisible by s
+            start = (-(2 * q0 + 1) * pow(4, -1, s)) % s
+            sieve[start::s] = bytes(len(range(start, window, s)))
+        for i in range(window):
+            if not sieve[i]:
+                continue
+            q = q0 + 2 * i
+            p = 2 * q + 1
+            if p.bit_length() != bits:
+                break
+            if pow(2, p - 1, p) == 1 and isPrime(q) and isPrime(p):
+                return p
+
+
+def generate_group(bits: int) -> GroupParams:
+    """Generate a fresh group modulo a random safe prime.
+
+    The generator is 4, a quadratic residue and therefore of order q.
+    """
+    p = generate_safe_prime(bits)
+    return GroupParams(p, (p - 1) // 2, 4)
+
+
+def _generate_group_tuple(bits: int) -> Tuple[int, int, int]:
+    return generate_group(bits).as_tuple()
+
+
+class ParameterProvider:
+    """Hands out group parameters, caching generated ones in memory and on disk.
+
+    Standard groups are returned immediately. Generated groups are looked
+    up in the memory cache, then in the persistent cache if disk caching
+    is on, and only then generated; ``prefetch`` starts generation on a
+    process pool so the result is ready by the time it is needed.
+    """
+
+    def __init__(self, cache: Optional[Any] = None,
+                 use_disk: bool = False, max_workers: Optional[int] = None) -> None:
+        """Initialize the provider.
+
+        Args:
+            cache: ``PersistentCache`` for generated groups; implies
+                ``use_disk``.
+            use_disk: Also keep generated groups in a ``PersistentCache`` at
+                the default location, opened on first use. The cache lives
+                in the future group, whose ``__data__`` checks apply.
+            max_workers: Size of the background generation pool.
+
+        Raises:
+            ImportDisabledError: If ``use_disk`` is set but the future group
+                is disabled.
+        """
+        self._cache = cache
+        self._cache_module = _cache_module() if use_disk or cache is not None else None
+        self._use_disk = self._cache_module is not None
+        self._max_workers = max_workers
+        self._memory: Dict[int, GroupParams] = {}
+        self._pending: Dict[int, Future] = {}
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _disk(self) -> Optional[Any]:
+        if not self._use_disk:
+            return None
+        if self._cache is None:
+            try:
+                self._cache = self._cache_module.PersistentCache()
+            except OSError:
+                self._use_disk = False
+                return None
+        return self._cache
+
+    def group(self, bits: int = 2048, standard: bool = True, family: str = 'modp') -> GroupParams:
+        """Return group parameters of the requested size.
+
+        Args:
+            bits: Size of the modulus.
+            standard: Use a built-in RFC group when True and one of that
+                size exists; otherwise a generated (and cached) safe-prime
+                group.
+            family: Standard group family, ``'modp'`` or ``'ffdhe'``.
+
+        Returns:
+            GroupParams: The group parameters.
+        """
+        if standard and (family.lower(), bits) in _STANDARD_PRIMES:
+            return standard_group(bits, family)
+        return self.generated_group(bits)
+
+    def generated_group(self, bits: int) -> GroupParams:
+        """Return a generated group, generating it only if nothing is cached."""
+        with self._lock:
+            if bits in self._memory:
+                return self._memory[bits]
+            pending = self._pending.get(bits)
+        if pending is not None:
+            return self._store(bits, GroupParams(*pending.result()))
+        disk = self._disk()
+        if disk is not None:
+            cached = disk.get(self._cache_module.make_key('zkparams.group', bits))
+            if cached is not None:
+                return self._store(bits, GroupParams(*cached), persist=False)
+        return self._store(bits, generate_group(bits))
+
+    def _store(self, bits: int, group: GroupParams, persist: bool = True) -> GroupParams:
+        with self._lock:
+            self._memory[bits] = group
+            self._pending.pop(bits, None)
+        disk = self._disk() if persist else None
+        if disk is not None:
+            disk.set(self._cache_module.make_key('zkparams.group', bits), group.as_tuple())
+        return group
+
+    def prefetch(self, bits: int) -> Future:
+        """Start generating a group of ``bits`` bits in a background process.
+
+        Returns:
+            Future: Resolves to ``(p, q, g)``. ``generated_group`` waits on it
+            instead of starting a second generation.
+        """
+        with self._lock:
+            if bits in self._pending:
+                return self._pending[bits]
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self._max_workers)
+            future = self._executor.submit(_generate_group_tuple, bits)
+            self._pending[bits] = future
+        return future
+
+    def shutdown(self) -> None:
+        """Stop the background generation pool."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            self._pending.clear()
+
+
+def _cache_module():
+    # Through the package, so a disabled future group is honoured.
+    from .. import PersistentCache  # noqa: F401
+    from ..future import cache
+    return cache
+
+
+_default_provider: Optional[ParameterProvider] = None
+
+
+def default_provider() -> ParameterProvider:
+    """Return the process-wide parameter provider."""
+    global _default_provider
+    if _default_provider is None:
+        _default_provider = ParameterProvider()
+    return _default_provider
+
+
+def set_default_provider(provider: ParameterProvider) -> None:
+    """Replace the process-wide provider, e.g. with one caching on disk::
+
+        set_default_provider(ParameterProvider(use_disk=True))
+    """
+    global _default_provider
+    _default_provider = provider
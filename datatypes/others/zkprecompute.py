@@ -0,0 +1,242 @@
+"""Fixed-base exponentiation tables for the zero-knowledge proof protocols."""
+import struct
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from .multiexp import multi_exp
+
+_MAGIC = b'FBT1'
+
+
+class FixedBaseTable:
+    """Precomputed powers of one base for fast fixed-base exponentiation.
+
+    Row i holds ``base ** (d * 2 ** (window * i))`` for every window digit
+    d, so an exponentiation is one table lookup and one modular
+    multiplication per window, with no squarings at all.
+    """
+
+    def __init__(self, base: int, modulus: int, window: int = 5,
+                 order: Optional[int] = None, rows: Optional[list] = None) -> None:
+        """Build the table.
+
+        Args:
+            base: The fixed base.
+            modulus: The prime modulus.
+            window: Window width in bits. Larger windows mean fewer
+                multiplications per exponentiation but bigger tables.
+            order: Exponents are reduced modulo this value. Defaults to
+                ``modulus - 1``, which is valid for any base coprime to it.
+            rows: Already computed rows, used when deserializing.
+        """
+        if window < 1:
+            raise ValueError("Window must be at least 1 bit")
+        self.base = base % modulus
+        self.modulus = modulus
+        self.window = window
+        self.order = order if order is not None else modulus - 1
+        self.rows = rows if rows is not None else self._build()
+
+    def _build(self) -> list:
+        p = self.modulus
+        count = -(-self.order.bit_length() // self.window)
+        rows = []
+        b = self.base
+        for _ in range(count):
+            row = [1, b]
+            for _ in range(2, 1 << self.window):
+                row.append(row[-1] * b % p)
+            rows.append(row)
+            b = row[-1] * b % p
+        return rows
+
+    def pow(self, exponent: int) -> int:
+        """Return ``base ** exponent mod modulus``."""
+        e = exponent % self.order
+        p = self.modulus
+        w = self.window
+        mask = (1 << w) - 1
+        acc = 1
+        for row in self.rows:
+            if not e:
+                break
+            digit = e & mask
+            if digit:
+                acc = acc * row[digit] % p
+            e >>= w
+        return acc
+
+    def to_bytes(self) -> bytes:
+        """Serialize the table to a compact fixed-width binary form."""
+        size = (self.modulus.bit_length() + 7) // 8
+        out = [_MAGIC, struct.pack('>BII', self.window, len(self.rows), size),
+               self.modulus.to_bytes(size, 'big'), self.order.to_bytes(size, 'big'),
+               self.base.to_bytes(size, 'big')]
+        for row in self.rows:
+            out.extend(v.to_bytes(size, 'big') for v in row[1:])
+        return b''.join(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'FixedBaseTable':
+        """Rebuild a table serialized with ``to_bytes``.
+
+        Raises:
+            ValueError: If the data is not a serialized table.
+        """
+        if data[:4] != _MAGIC:
+            raise ValueError("Not a serialized FixedBaseTable")
+        window, count, size = struct.unpack_from('>BII', data, 4)
+        offset = 4 + struct.calcsize('>BII')
+        per_row = (1 << window) - 1
+        if len(data) - offset != (3 + count * per_row) * size:
+            raise ValueError("Truncated FixedBaseTable data")
+        values = [int.from_bytes(data[i:i + size], 'big')
+                  for i in range(offset, len(data), size)]
+        modulus, order, base = values[:3]
+        rows = [[1] + values[3 + i * per_row:3 + (i + 1) * per_row] for i in range(count)]
+        return cls(base, modulus, window, order, rows)
+
+    def __reduce__(self):
+        return FixedBaseTable.from_bytes, (self.to_bytes(),)
+
+    def __repr__(self) -> str:
+        return f"FixedBaseTable(bits={self.modulus.bit_length()}, window={self.window})"
+
+
+# Positions of the modulus and the public bases in each protocol's params tuple.
+_LAYOUTS = {
+    3: (0, (1, 2)),        # Pedersen: (p, g, h)
+    4: (0, (1, 3)),        # Schnorr: (p, g, x, y)
+    5: (4, (0, 1, 2, 3)),  # Chaum-Pedersen: (g1, h1, g2, h2, p)
+}
+
+
+class PrecomputedParams(tuple):
+    """A protocol params tuple carrying fixed-base tables for its bases.
+
+    It unpacks exactly like the tuple it wraps, so it can be passed to any
+    ``ZeroKnowledgeProofs`` function in place of the plain params.
+    """
+
+    def __new__(cls, params: Iterable[int], window: int = 5,
+                tables: Optional[Dict[int, FixedBaseTable]] = None) -> 'PrecomputedParams':
+        self = super().__new__(cls, params)
+        if len(self) not in _LAYOUTS:
+            raise ValueError(f"Unsupported params layout of length {len(self)}")
+        mod_index, base_indexes = _LAYOUTS[len(self)]
+        self.modulus = self[mod_index]
+        self.window = window
+        if tables is None:
+            tables = {}
+            for i in base_indexes:
+                if self[i] not in tables:
+                    tables[self[i]] = FixedBaseTable(self[i], self.modulus, window)
+        self.tables = tables
+        return self
+
+    def pow(self, base: int, exponent: int) -> int:
+        """Exponentiate, using a table when ``base`` has one."""
+        table = self.tables.get(base)
+        if table is None:
+            return pow(base, exponent, self.modulus)
+        return table.pow(exponent)
+
+    def to_bytes(self) -> bytes:
+        """Serialize the params and their tables.
+
+        Note that Schnorr params include the private key x, which is
+        serialized along with everything else.
+        """
+        size = (self.modulus.bit_length() + 7) // 8
+        blobs = [t.to_bytes() for t in self.tables.values()]
+        out = [struct.pack('>BBI', len(self), len(blobs), size)]
+        out.extend(v.to_bytes(size, 'big') for v in self)
+        for blob in blobs:
+            out.append(struct.pack('>Q', len(blob)))
+            out.append(blob)
+        return b''.join(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'PrecomputedParams':
+        """Rebuild params serialized with ``to_bytes``."""
+        length, count, size = struct.unpack_from('>BBI', data, 0)
+        offset = struct.calcsize('>BBI')
+        params = []
+        for _ in range(length):
+            params.append(int.from_bytes(data[offset:offset + size], 'big'))
+            offset += size
+        tables = {}
+        for _ in range(count):
+            (blob_len,) = struct.unpack_from('>Q', data, offset)
+            offset += 8
+            table = FixedBaseTable.from_bytes(data[offset:offset + blob_len])
+            tables[table.base] = table
+            offset += blob_len
+        window = next(iter(tables.values())).window if tables else 5
+        return cls(params, window, tables)
+
+    def __reduce__(self):
+        return PrecomputedParams.from_bytes, (self.to_bytes(),)
+
+    def __repr__(self) -> str:
+        return f"PrecomputedParams(bits={self.modulus.bit_length()}, bases={len(self.tables)}, window={self.window})"
+
+
+_cache: 'OrderedDict[Tuple[Tuple[int, ...], int], PrecomputedParams]' = OrderedDict()
+_cache_lock = threading.Lock()
+CACHE_SIZE = 8
+
+
+def precompute(params: Iterable[int], window: int = 5) -> PrecomputedParams:
+    """Return precomputed params, reusing a cached instance when possible.
+
+    Args:
+        params: A Pedersen, Schnorr or Chaum-Pedersen params tuple.
+        window: Window width of the tables.
+
+    Returns:
+        PrecomputedParams: The params with tables for all public bases.
+    """
+    key = (tuple(params), window)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    result = params if isinstance(params, PrecomputedParams) and params.window == window \
+        else PrecomputedParams(key[0], window)
+    with _cache_lock:
+        _cache[key] = result
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+
+def fixed_pow(params: Tuple[int, ...], base: int, exponent: int, modulus: int) -> int:
+    """``pow(base, exponent, modulus)`` that uses a table if ``params`` has one."""
+    if isinstance(params, PrecomputedParams):
+        return params.pow(base, exponent)
+    return pow(base, exponent, modulus)
+
+
+def fixed_multi_pow(params: Tuple[int, ...], bases: Sequence[int],
+                    exponents: Sequence[int], modulus: int) -> int:
+    """Product of ``base ** exponent mod modulus`` over several bases.
+
+    Bases with a table in ``params`` use it; the rest share a single
+    simultaneous multi-exponentiation.
+    """
+    order = modulus - 1
+    tables = params.tables if isinstance(params, PrecomputedParams) else {}
+    result = 1
+    rest_bases, rest_exponents = [], []
+    for base, exponent in zip(bases, exponents):
+        table = tables.get(base)
+        if table is not None:
+            result = result * table.pow(exponent) % modulus
+        else:
+            rest_bases.append(base)
+            rest_exponents.append(exponent)
+    if rest_bases:
+        result = result * multi_exp(rest_bases, rest_exponents, modulus, order) % modulus
+    return result
@@ -1,10 +1,18 @@
-from typing import Tuple, List, Optional
+from typing import Any, Callable, Iterable, Iterator, Tuple, List, Optional, Sequence, Union
 import hashlib
+import itertools
+import os
 import random
+import secrets
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from dataclasses import dataclass
-from Crypto.PublicKey import RSA
 from Crypto.Random import get_random_bytes
-from Crypto.Hash import SHA256
+from .zkgroups import Group, get_group, in_safe_prime_subgroup
+from .zkparams import default_provider
+from .multiexp import bucket_exp
+from .zkprecompute import PrecomputedParams, fixed_multi_pow, fixed_pow, precompute
+from .zktranscript import Transcript
 
 @dataclass
 class Commitment:
@@ -12,65 +20,241 @@ class Commitment:
     value: bytes
     randomness: bytes
 
+
+# Batches at or below this size are verified proof by proof.
+_BISECT_CUTOFF = 2
+# Bit length of the random weights in the small-exponent batch test.
+_BATCH_WEIGHT_BITS = 64
+
+
+# Domain separation labels for the Fiat-Shamir transcripts.
+_SCHNORR_LABEL = b'datatypes.zkproofs.schnorr.v1'
+_CHAUM_PEDERSEN_LABEL = b'datatypes.zkproofs.chaum-pedersen.v1'
+
+# Wire format version and protocol tags (see ZeroKnowledgeProofs.encode_proof).
+_WIRE_VERSION = 1
+_WIRE_PEDERSEN, _WIRE_SCHNORR, _WIRE_CHAUM_PEDERSEN = 1, 2, 3
+
+
+def _schnorr_challenge(g: int, y: int, r: int, p: int) -> int:
+    size = (p.bit_length() + 7) // 8
+    transcript = Transcript.with_prefix(_SCHNORR_LABEL, (p, g, y), lambda: (
+        (b'p', p.to_bytes(size, 'big')), (b'g', g.to_bytes(size, 'big')), (b'y', y.to_bytes(size, 'big'))))
+    return transcript.absorb(b'r', r.to_bytes(size, 'big')).challenge(p - 1)
+
+
+def _chaum_pedersen_challenge(g1: int, h1: int, g2: int, h2: int, r1: int, r2: int, p: int) -> int:
+    size = (p.bit_length() + 7) // 8
+    transcript = Transcript.with_prefix(_CHAUM_PEDERSEN_LABEL, (p, g1, h1, g2, h2), lambda: (
+        (b'p', p.to_bytes(size, 'big')), (b'g1', g1.to_bytes(size, 'big')), (b'h1', h1.to_bytes(size, 'big')),
+        (b'g2', g2.to_bytes(size, 'big')), (b'h2', h2.to_bytes(size, 'big'))))
+    transcript.absorb(b'r1', r1.to_bytes(size, 'big')).absorb(b'r2', r2.to_bytes(size, 'big'))
+    return transcript.challenge(p - 1)
+
+
+def _element_key(group: Group, a: Any) -> Any:
+    # Mod-p elements are ints and key themselves; curve points are not
+    # hashable, but their encodings are only 33 bytes.
+    return a if isinstance(a, int) else group.encode(a)
+
+
+def _group_schnorr_challenge(group: Group, g: Any, y: Any, r: bytes) -> int:
+    key = (group, _element_key(group, g), _element_key(group, y))
+    transcript = Transcript.with_prefix(_SCHNORR_LABEL, key, lambda: (
+        (b'group', group.description), (b'g', group.encode(g)), (b'y', group.encode(y))))
+    return transcript.absorb(b'r', r).challenge(group.order, group.scalar_size + 16)
+
+
+def _group_chaum_pedersen_challenge(params: Tuple[Any, Any, Any, Any, Group], r1: bytes, r2: bytes) -> int:
+    g1, h1, g2, h2, group = params
+    key = (group,) + tuple(_element_key(group, a) for a in (g1, h1, g2, h2))
+    transcript = Transcript.with_prefix(_CHAUM_PEDERSEN_LABEL, key, lambda: (
+        (b'group', group.description), (b'g1', group.encode(g1)), (b'h1', group.encode(h1)),
+        (b'g2', group.encode(g2)), (b'h2', group.encode(h2))))
+    transcript.absorb(b'r1', r1).absorb(b'r2', r2)
+    return transcript.challenge(group.order, group.scalar_size + 16)
+
+
+def _batch_weights(count: int) -> List[int]:
+    return [secrets.randbits(_BATCH_WEIGHT_BITS) | 1 for _ in range(count)]
+
+
+def _bisect_verify(indices: List[int], batch_check: Callable[[List[int]], bool],
+                   single_check: Callable[[int], bool], results: List[bool]) -> None:
+    """Fill ``results`` for ``indices``, splitting failed batches in half."""
+    if len(indices) <= _BISECT_CUTOFF:
+        for i in indices:
+            results[i] = single_check(i)
+        return
+    if batch_check(indices):
+        for i in indices:
+            results[i] = True
+        return
+    mid = len(indices) // 2
+    _bisect_verify(indices[:mid], batch_check, single_check, results)
+    _bisect_verify(indices[mid:], batch_check, single_check, results)
+
+
+def _batchable(indices: Iterable[int], bases: Sequence[int], elements: Callable[[int], Sequence[int]],
+               p: int, single_check: Callable[[int], bool], results: List[bool]) -> List[int]:
+    """Return the indices whose elements may go through the small-exponent test.
+
+    The test only holds in a group of prime order, so elements outside the
+    order-q subgroup of the safe prime (such as ``p - c``) are checked on
+    their own here, with their results written to ``results``. If a public
+    base lies outside the subgroup, every index is checked on its own.
+    """
+    indices = list(indices)
+    if not all(in_safe_prime_subgroup(b, p) for b in bases):
+        batchable = []
+    else:
+        batchable = [i for i in indices if all(in_safe_prime_subgroup(x, p) for x in elements(i))]
+    rest = set(indices).difference(batchable)
+    for i in indices:
+        if i in rest:
+            results[i] = single_check(i)
+    return batchable
+
+
+def _group_of(params: Tuple[Any, ...]) -> Optional[Group]:
+    """Return the ``Group`` backend of a params tuple, or None for plain mod-p ints."""
+    candidate = params[4] if len(params) == 5 else params[0]
+    return candidate if isinstance(candidate, Group) else None
+
+
+def _group_pedersen_commit(value: int, params: Tuple[Any, Any, Any]) -> 'Commitment':
+    group, g, h = params
+    r = group.random_scalar()
+    c = group.multi_scalar_mul((g, h), (value, r))
+    return Commitment(group.encode(c), r.to_bytes(group.scalar_size, 'big'))
+
+
+def _group_pedersen_verify(commitment: 'Commitment', value: int, params: Tuple[Any, Any, Any]) -> bool:
+    group, g, h = params
+    r = int.from_bytes(commitment.randomness, 'big')
+    return group.encode(group.multi_scalar_mul((g, h), (value, r))) == commitment.value
+
+
+def _group_schnorr_prove(params: Tuple[Any, Any, int, Any]) -> Tuple[bytes, bytes, bytes]:
+    group, g, x, y = params
+    k = group.random_scalar()
+    r = group.encode(group.scalar_mul(g, k))
+    e = _group_schnorr_challenge(group, g, y, r)
+    s = (k - e * x) % group.order
+    return r, e.to_bytes(group.scalar_size, 'big'), s.to_bytes(group.scalar_size, 'big')
+
+
+def _group_schnorr_verify(proof: Tuple[bytes, bytes, bytes], params: Tuple[Any, Any, int, Any]) -> bool:
+    group, g, _, y = params
+    r_bytes, e_bytes, s_bytes = proof
+    e = int.from_bytes(e_bytes, 'big')
+    s = int.from_bytes(s_bytes, 'big')
+    if e >= group.order or s >= group.order:
+        return False
+    if e != _group_schnorr_challenge(group, g, y, r_bytes):
+        return False
+    return group.encode(group.multi_scalar_mul((g, y), (s, e))) == r_bytes
+
+
+def _group_chaum_pedersen_prove(params: Tuple[Any, Any, Any, Any, Group], x: int) -> Tuple[bytes, bytes, bytes]:
+    g1, h1, g2, h2, group = params
+    k = group.random_scalar()
+    r1 = group.encode(group.scalar_mul(g1, k))
+    r2 = group.encode(group.scalar_mul(g2, k))
+    e = _group_chaum_pedersen_challenge(params, r1, r2)
+    s = (k - e * x) % group.order
+    return r1, r2, s.to_bytes(group.scalar_size, 'big')
+
+
+def _group_chaum_pedersen_verify(proof: Tuple[bytes, bytes, bytes], params: Tuple[Any, Any, Any, Any, Group]) -> bool:
+    g1, h1, g2, h2, group = params
+    r1, r2, s_bytes = proof
+    s = int.from_bytes(s_bytes, 'big')
+    if s >= group.order:
+        return False
+    e = _group_chaum_pedersen_challenge(params, r1, r2)
+    return (group.encode(group.multi_scalar_mul((g1, h1), (s, e))) == r1
+            and group.encode(group.multi_scalar_mul((g2, h2), (s, e))) == r2)
+
+
 class ZeroKnowledgeProofs:
-    """Implementation of various zero-knowledge proof protocols."""
+    """Implementation of various zero-knowledge proof protocols.
+
+    Every protocol runs either on plain integers modulo a prime (params
+    hold ``p``) or on a ``Group`` backend such as the P-256 curve (params
+    hold the group object in place of ``p``); pass ``group=`` to the setup
+    functions to get the latter.
+    """
     
     @staticmethod
-    def pedersen_setup(bits: int = 2048) -> Tuple[int, int, int]:
-        """Generate Pedersen commitment parameters."""
-        # Generate a safe prime p where p = 2q + 1
-        while True:
-            q = RSA.generate(bits - 1).n
-            p = 2 * q + 1
-            if all(p % n != 0 for n in [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]):
-                break
-                
-        # Find generators g and h
-        while True:
-            g = random.randrange(2, p - 1)
-            if pow(g, q, p) != 1:
-                break
-                
-        while True:
-            h = random.randrange(2, p - 1)
-            if pow(h, q, p) != 1 and h != g:
-                break
-                
-        return p, g, h
+    def pedersen_setup(bits: int = 2048, standard: bool = True,
+                       group: Union[str, Group, None] = None) -> Tuple[Any, Any, Any]:
+        """Generate Pedersen commitment parameters.
+
+        By default a built-in RFC 3526 group is used, so setup is instant;
+        sizes without one (other than 2048, 3072 and 4096 bits) get a freshly
+        generated safe-prime group, as does ``standard=False``. Generated
+        groups are cached in memory by the default parameter provider, and
+        on disk if it was set up with ``use_disk=True``.
+        Pass ``group`` (e.g. ``'p256'``) to run on a ``Group`` backend
+        instead, in which case ``bits`` and ``standard`` are ignored.
+        """
+        if group is not None:
+            group = get_group(group)
+            return group, group.generator, group.derive_generator(b'pedersen-h')
+        group = default_provider().group(bits, standard)
+        h = group.derive_generator(b'pedersen-h')
+        return group.p, group.g, h
+    
+    @staticmethod
+    def precompute(params: Tuple[int, ...], window: int = 5) -> PrecomputedParams:
+        """Build (or fetch cached) fixed-base tables for a params tuple.
+
+        The result can be passed anywhere the plain params are accepted and
+        makes every exponentiation with a public base several times faster.
+        Params on a ``Group`` backend are returned unchanged.
+        """
+        if _group_of(params) is not None:
+            return params
+        return precompute(params, window)
     
     @staticmethod
     def pedersen_commit(value: int, params: Tuple[int, int, int]) -> Commitment:
         """Create a Pedersen commitment."""
+        if _group_of(params) is not None:
+            return _group_pedersen_commit(value, params)
         p, g, h = params
         r = random.randrange(2, p - 1)
-        commitment = (pow(g, value, p) * pow(h, r, p)) % p
+        commitment = fixed_multi_pow(params, (g, h), (value, r), p)
         return Commitment(commitment.to_bytes((p.bit_length() + 7) // 8, 'big'), 
                          r.to_bytes((p.bit_length() + 7) // 8, 'big'))
     
     @staticmethod
     def pedersen_verify(commitment: Commitment, value: int, params: Tuple[int, int, int]) -> bool:
         """Verify a Pedersen commitment."""
+        if _group_of(params) is not None:
+            return _group_pedersen_verify(commitment, value, params)
         p, g, h = params
         c = int.from_bytes(commitment.value, 'big')
         r = int.from_bytes(commitment.randomness, 'big')
-        expected = (pow(g, value, p) * pow(h, r, p)) % p
+        expected = fixed_multi_pow(params, (g, h), (value, r), p)
         return c == expected
     
     @staticmethod
-    def schnorr_setup(bits: int = 2048) -> Tuple[int, int, int, int]:
-        """Generate parameters for Schnorr protocol."""
-        # Generate prime p where p = 2q + 1
-        while True:
-            q = RSA.generate(bits - 1).n
-            p = 2 * q + 1
-            if all(p % n != 0 for n in [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]):
-                break
-                
-        # Find generator g
-        while True:
-            g = random.randrange(2, p - 1)
-            if pow(g, q, p) != 1:
-                break
+    def schnorr_setup(bits: int = 2048, standard: bool = True,
+                      group: Union[str, Group, None] = None) -> Tuple[Any, Any, int, Any]:
+        """Generate parameters for Schnorr protocol.
+
+        The group comes from the default parameter provider, or from
+        ``group`` if given (see ``pedersen_setup``); only the key pair is
+        fresh.
+        """
+        if group is not None:
+            group = get_group(group)
+            x = group.random_scalar()
+            return group, group.generator, x, group.scalar_mul(group.generator, x)
+        group = default_provider().group(bits, standard)
+        p, q, g = group.as_tuple()
                 
         # Generate private key
         x = random.randrange(2, q)
@@ -82,18 +266,16 @@ class ZeroKnowledgeProofs:
     @staticmethod
     def schnorr_prove(secret: int, params: Tuple[int, int, int, int]) -> Tuple[bytes, bytes, bytes]:
         """Generate a Schnorr proof of knowledge."""
+        if _group_of(params) is not None:
+            return _group_schnorr_prove(params)
         p, g, x, y = params
         
         # Generate random k
         k = random.randrange(2, p - 1)
-        r = pow(g, k, p)
+        r = fixed_pow(params, g, k, p)
         
         # Generate challenge
-        h = SHA256.new()
-        h.update(str(g).encode())
-        h.update(str(y).encode())
-        h.update(str(r).encode())
-        e = int.from_bytes(h.digest(), 'big') % (p - 1)
+        e = _schnorr_challenge(g, y, r, p)
         
         # Calculate response
         s = (k - e * x) % (p - 1)
@@ -105,6 +287,8 @@ class ZeroKnowledgeProofs:
     @staticmethod
     def schnorr_verify(proof: Tuple[bytes, bytes, bytes], params: Tuple[int, int, int, int]) -> bool:
         """Verify a Schnorr proof."""
+        if _group_of(params) is not None:
+            return _group_schnorr_verify(proof, params)
         p, g, _, y = params
         r_bytes, e_bytes, s_bytes = proof
         
@@ -113,36 +297,32 @@ class ZeroKnowledgeProofs:
         s = int.from_bytes(s_bytes, 'big')
         
         # Verify r = g^s * y^e mod p
-        expected_r = (pow(g, s, p) * pow(y, e, p)) % p
+        expected_r = fixed_multi_pow(params, (g, y), (s, e), p)
         
         # Verify challenge
-        h = SHA256.new()
-        h.update(str(g).encode())
-        h.update(str(y).encode())
-        h.update(str(r).encode())
-        expected_e = int.from_bytes(h.digest(), 'big') % (p - 1)
+        expected_e = _schnorr_challenge(g, y, r, p)
         
         return r == expected_r and e == expected_e
     
     @staticmethod
-    def chaum_pedersen_prove(g1: int, h1: int, g2: int, h2: int, x: int, p: int) -> Tuple[bytes, bytes, bytes]:
-        """Generate a Chaum-Pedersen proof."""
+    def chaum_pedersen_prove(g1: int, h1: int, g2: int, h2: int, x: int, p: int,
+                             params: Optional[PrecomputedParams] = None) -> Tuple[bytes, bytes, bytes]:
+        """Generate a Chaum-Pedersen proof.
+
+        ``params`` may carry precomputed tables for ``(g1, h1, g2, h2, p)``.
+        ``p`` may also be a ``Group``, with the other arguments its elements.
+        """
+        if isinstance(p, Group):
+            return _group_chaum_pedersen_prove((g1, h1, g2, h2, p), x)
         # Generate random k
         k = random.randrange(2, p - 1)
         
         # Calculate commitments
-        r1 = pow(g1, k, p)
-        r2 = pow(g2, k, p)
+        r1 = fixed_pow(params, g1, k, p)
+        r2 = fixed_pow(params, g2, k, p)
         
         # Generate challenge
-        h = SHA256.new()
-        h.update(str(g1).encode())
-        h.update(str(h1).encode())
-        h.update(str(g2).encode())
-        h.update(str(h2).encode())
-        h.update(str(r1).encode())
-        h.update(str(r2).encode())
-        e = int.from_bytes(h.digest(), 'big') % (p - 1)
+        e = _chaum_pedersen_challenge(g1, h1, g2, h2, r1, r2, p)
         
         # Calculate response
         s = (k - e * x) % (p - 1)
@@ -154,6 +334,8 @@ class ZeroKnowledgeProofs:
     @staticmethod
     def chaum_pedersen_verify(proof: Tuple[bytes, bytes, bytes], params: Tuple[int, int, int, int, int]) -> bool:
         """Verify a Chaum-Pedersen proof."""
+        if _group_of(params) is not None:
+            return _group_chaum_pedersen_verify(proof, params)
         g1, h1, g2, h2, p = params
         r1_bytes, r2_bytes, s_bytes = proof
         
@@ -162,17 +344,350 @@ class ZeroKnowledgeProofs:
         s = int.from_bytes(s_bytes, 'big')
         
         # Generate challenge
-        h = SHA256.new()
-        h.update(str(g1).encode())
-        h.update(str(h1).encode())
-        h.update(str(g2).encode())
-        h.update(str(h2).encode())
-        h.update(str(r1).encode())
-        h.update(str(r2).encode())
-        e = int.from_bytes(h.digest(), 'big') % (p - 1)
+        e = _chaum_pedersen_challenge(g1, h1, g2, h2, r1, r2, p)
         
         # Verify equations
-        v1 = (pow(g1, s, p) * pow(h1, e, p)) % p
-        v2 = (pow(g2, s, p) * pow(h2, e, p)) % p
+        v1 = fixed_multi_pow(params, (g1, h1), (s, e), p)
+        v2 = fixed_multi_pow(params, (g2, h2), (s, e), p)
         
         return r1 == v1 and r2 == v2
+    
+    @staticmethod
+    def pedersen_batch_verify(items: Sequence[Tuple[Commitment, int]],
+                              params: Tuple[int, int, int]) -> List[bool]:
+        """Verify many Pedersen openings against the same params.
+
+        Uses the small-exponent test: with random 64-bit weights d_i, all
+        openings are accepted at once if prod(c_i ** d_i) equals
+        g ** sum(d_i * v_i) * h ** sum(d_i * r_i). Failing batches are split
+        in half until the bad openings are isolated. Params must describe a
+        safe-prime group, as returned by ``pedersen_setup``. Only elements
+        of its order-q subgroup are batched; any other commitment, or all of
+        them if a generator lies outside it, is checked on its own, so no
+        element of order 2 can slip through. On a ``Group`` backend the
+        openings are simply checked one by one.
+
+        Args:
+            items: ``(commitment, value)`` pairs.
+            params: Plain or precomputed Pedersen params.
+
+        Returns:
+            List[bool]: One result per item, matching ``pedersen_verify``.
+        """
+        if _group_of(params) is not None:
+            return [ZeroKnowledgeProofs.pedersen_verify(c, v, params) for c, v in items]
+        p, g, h = params
+        order = p - 1
+        c = [int.from_bytes(com.value, 'big') for com, _ in items]
+        r = [int.from_bytes(com.randomness, 'big') for com, _ in items]
+        v = [value for _, value in items]
+        
+        def single_check(i: int) -> bool:
+            return ZeroKnowledgeProofs.pedersen_verify(items[i][0], v[i], params)
+        
+        def batch_check(indices: List[int]) -> bool:
+            weights = _batch_weights(len(indices))
+            lhs = bucket_exp([c[i] for i in indices], weights, p)
+            a = sum(d * v[i] for d, i in zip(weights, indices)) % order
+            b = sum(d * r[i] for d, i in zip(weights, indices)) % order
+            rhs = fixed_multi_pow(params, (g, h), (a, b), p)
+            return lhs == rhs
+        
+        results = [False] * len(items)
+        candidates = _batchable(range(len(items)), (g, h), lambda i: (c[i],), p,
+                                single_check, results)
+        _bisect_verify(candidates, batch_check, single_check, results)
+        return results
+    
+    @staticmethod
+    def schnorr_batch_verify(proofs: Sequence[Tuple[bytes, bytes, bytes]],
+                             params: Tuple[int, int, int, int]) -> List[bool]:
+        """Verify many Schnorr proofs for the same public key.
+
+        Challenges are checked per proof; the equations r_i = g ** s_i *
+        y ** e_i are checked together with the small-exponent test (see
+        ``pedersen_batch_verify``), with bisection on failure.
+
+        Returns:
+            List[bool]: One result per proof, matching ``schnorr_verify``.
+        """
+        if _group_of(params) is not None:
+            return [ZeroKnowledgeProofs.schnorr_verify(proof, params) for proof in proofs]
+        p, g, _, y = params
+        order = p - 1
+        results = [False] * len(proofs)
+        r, e, s = {}, {}, {}
+        for i, (r_bytes, e_bytes, s_bytes) in enumerate(proofs):
+            r[i] = int.from_bytes(r_bytes, 'big')
+            e[i] = int.from_bytes(e_bytes, 'big')
+            s[i] = int.from_bytes(s_bytes, 'big')
+        challenged = [i for i in r if e[i] == _schnorr_challenge(g, y, r[i], p)]
+        
+        def single_check(i: int) -> bool:
+            return r[i] == fixed_multi_pow(params, (g, y), (s[i], e[i]), p)
+        
+        def batch_check(indices: List[int]) -> bool:
+            weights = _batch_weights(len(indices))
+            lhs = bucket_exp([r[i] for i in indices], weights, p)
+            a = sum(d * s[i] for d, i in zip(weights, indices)) % order
+            b = sum(d * e[i] for d, i in zip(weights, indices)) % order
+            rhs = fixed_multi_pow(params, (g, y), (a, b), p)
+            return lhs == rhs
+        
+        candidates = _batchable(challenged, (g, y), lambda i: (r[i],), p, single_check, results)
+        _bisect_verify(candidates, batch_check, single_check, results)
+        return results
+    
+    @staticmethod
+    def chaum_pedersen_batch_verify(proofs: Sequence[Tuple[bytes, bytes, bytes]],
+                                    params: Tuple[int, int, int, int, int]) -> List[bool]:
+        """Verify many Chaum-Pedersen proofs for the same statement params.
+
+        Both equations of every proof are folded into one product with
+        independent random weights (see ``pedersen_batch_verify``), with
+        bisection on failure.
+
+        Returns:
+            List[bool]: One result per proof, matching ``chaum_pedersen_verify``.
+        """
+        if _group_of(params) is not None:
+            return [ZeroKnowledgeProofs.chaum_pedersen_verify(proof, params) for proof in proofs]
+        g1, h1, g2, h2, p = params
+        order = p - 1
+        results = [False] * len(proofs)
+        r1, r2, s, e = {}, {}, {}, {}
+        for i, (r1_bytes, r2_bytes, s_bytes) in enumerate(proofs):
+            r1[i] = int.from_bytes(r1_bytes, 'big')
+            r2[i] = int.from_bytes(r2_bytes, 'big')
+            s[i] = int.from_bytes(s_bytes, 'big')
+            e[i] = _chaum_pedersen_challenge(g1, h1, g2, h2, r1[i], r2[i], p)
+        
+        def single_check(i: int) -> bool:
+            return ZeroKnowledgeProofs.chaum_pedersen_verify(proofs[i], params)
+        
+        def batch_check(indices: List[int]) -> bool:
+            w1 = _batch_weights(len(indices))
+            w2 = _batch_weights(len(indices))
+            lhs = bucket_exp([r1[i] for i in indices] + [r2[i] for i in indices], w1 + w2, p)
+            exponents = [sum(d * values[i] for d, i in zip(weights, indices)) % order
+                         for weights, values in ((w1, s), (w1, e), (w2, s), (w2, e))]
+            rhs = fixed_multi_pow(params, (g1, h1, g2, h2), exponents, p)
+            return lhs == rhs
+        
+        candidates = _batchable(range(len(proofs)), (g1, h1, g2, h2),
+                                lambda i: (r1[i], r2[i]), p, single_check, results)
+        _bisect_verify(candidates, batch_check, single_check, results)
+        return results
+    
+    @staticmethod
+    def encode_proof(proof: Any, params: Tuple[Any, ...]) -> bytes:
+        """Encode a proof in the compact, versioned wire format.
+
+        The format is a version byte and a protocol tag followed by the
+        fixed-width fields of the proof. Schnorr proofs drop the challenge
+        e, which the receiver recomputes from r.
+
+        Args:
+            proof: A ``Commitment`` (Pedersen params) or a proof tuple
+                (Schnorr or Chaum-Pedersen params).
+            params: The params the proof was made with.
+
+        Returns:
+            bytes: The encoded proof.
+        """
+        if len(params) == 3:
+            tag, fields = _WIRE_PEDERSEN, (proof.value, proof.randomness)
+        elif len(params) == 4:
+            tag, fields = _WIRE_SCHNORR, (proof[0], proof[2])
+        else:
+            tag, fields = _WIRE_CHAUM_PEDERSEN, tuple(proof)
+        sizes = _wire_sizes(tag, params)
+        if tuple(len(f) for f in fields) != sizes:
+            raise ValueError("Proof fields do not match the params")
+        return bytes([_WIRE_VERSION, tag]) + b''.join(fields)
+    
+    @staticmethod
+    def decode_proof(data: bytes, params: Tuple[Any, ...]) -> Any:
+        """Decode a proof produced by ``encode_proof``.
+
+        Returns:
+            The ``Commitment`` or proof tuple, ready for the matching
+            verify function.
+
+        Raises:
+            ValueError: If the version, protocol or length is wrong, or the
+                params match no protocol.
+        """
+        if len(data) < 2 or data[0] != _WIRE_VERSION:
+            raise ValueError("Unsupported proof encoding version")
+        tag = data[1]
+        expected_tag = {3: _WIRE_PEDERSEN, 4: _WIRE_SCHNORR, 5: _WIRE_CHAUM_PEDERSEN}.get(len(params))
+        if expected_tag is None:
+            raise ValueError(f"Params of length {len(params)} match no protocol "
+                             f"(expected 3 for Pedersen, 4 for Schnorr or 5 for Chaum-Pedersen)")
+        if tag != expected_tag:
+            raise ValueError("Proof was encoded for a different protocol")
+        sizes = _wire_sizes(tag, params)
+        if len(data) != 2 + sum(sizes):
+            raise ValueError("Proof has the wrong length")
+        fields, offset = [], 2
+        for size in sizes:
+            fields.append(data[offset:offset + size])
+            offset += size
+        if tag == _WIRE_PEDERSEN:
+            return Commitment(*fields)
+        if tag == _WIRE_CHAUM_PEDERSEN:
+            return tuple(fields)
+        r, s = fields
+        group = _group_of(params)
+        if group is not None:
+            e = _group_schnorr_challenge(group, params[1], params[3], r)
+            return r, e.to_bytes(group.scalar_size, 'big'), s
+        p, g, _, y = params
+        e = _schnorr_challenge(g, y, int.from_bytes(r, 'big'), p)
+        return r, e.to_bytes(32, 'big'), s
+    
+    @staticmethod
+    def prove_many(protocol: str, inputs: Iterable[Any], params: Tuple[int, ...],
+                   max_workers: Optional[int] = None, chunk_size: int = 64,
+                   ordered: bool = True) -> Iterator[Any]:
+        """Generate many proofs on a process pool, streaming the results.
+
+        Args:
+            protocol: ``'pedersen'`` (inputs are values to commit to),
+                ``'schnorr'`` (inputs are passed as ``secret``) or
+                ``'chaum_pedersen'`` (inputs are the secret exponents x).
+            inputs: Any iterable; it is consumed lazily, chunk by chunk.
+            params: Plain or precomputed params. They are sent to each
+                worker once, when the worker starts.
+            max_workers: Number of worker processes.
+            chunk_size: Number of inputs handled per task.
+            ordered: Yield results in input order when True. Otherwise
+                yield ``(index, result)`` pairs as chunks complete.
+
+        Returns:
+            Iterator: The proofs (or ``(index, proof)`` pairs).
+        """
+        _check_parallel_args(protocol, chunk_size)
+        return _stream_chunks(protocol, 'prove', inputs, params, max_workers, chunk_size, ordered)
+    
+    @staticmethod
+    def verify_many(protocol: str, inputs: Iterable[Any], params: Tuple[int, ...],
+                    max_workers: Optional[int] = None, chunk_size: int = 256,
+                    ordered: bool = True, batch: bool = True) -> Iterator[Any]:
+        """Verify many proofs on a process pool, streaming the results.
+
+        Args:
+            protocol: ``'pedersen'`` (inputs are ``(commitment, value)``
+                pairs), ``'schnorr'`` or ``'chaum_pedersen'`` (inputs are
+                proofs).
+            inputs: Any iterable; it is consumed lazily, chunk by chunk.
+            params: Plain or precomputed params, sent to each worker once.
+            max_workers: Number of worker processes.
+            chunk_size: Number of inputs handled per task.
+            ordered: Yield results in input order when True. Otherwise
+                yield ``(index, result)`` pairs as chunks complete.
+            batch: Verify each chunk with the matching ``*_batch_verify``
+                method instead of proof by proof.
+
+        Returns:
+            Iterator: One bool per input (or ``(index, bool)`` pairs).
+        """
+        _check_parallel_args(protocol, chunk_size)
+        operation = 'batch_verify' if batch else 'verify'
+        return _stream_chunks(protocol, operation, inputs, params, max_workers, chunk_size, ordered)
+
+
+# Per-protocol (prove, verify, batch_verify) callables used by the worker processes.
+_PROTOCOLS = {
+    'pedersen': (
+        lambda value, params: ZeroKnowledgeProofs.pedersen_commit(value, params),
+        lambda item, params: ZeroKnowledgeProofs.pedersen_verify(item[0], item[1], params),
+        ZeroKnowledgeProofs.pedersen_batch_verify,
+    ),
+    'schnorr': (
+        lambda secret, params: ZeroKnowledgeProofs.schnorr_prove(secret, params),
+        lambda proof, params: ZeroKnowledgeProofs.schnorr_verify(proof, params),
+        ZeroKnowledgeProofs.schnorr_batch_verify,
+    ),
+    'chaum_pedersen': (
+        lambda x, params: ZeroKnowledgeProofs.chaum_pedersen_prove(*params[:4], x, params[4], params),
+        lambda proof, params: ZeroKnowledgeProofs.chaum_pedersen_verify(proof, params),
+        ZeroKnowledgeProofs.chaum_pedersen_batch_verify,
+    ),
+}
+
+_worker_params = None
+
+
+def _wire_sizes(tag: int, params: Tuple[Any, ...]) -> Tuple[int, ...]:
+    group = _group_of(params)
+    if group is not None:
+        element, scalar = group.element_size, group.scalar_size
+    else:
+        p = params[4] if len(params) == 5 else params[0]
+        element = scalar = (p.bit_length() + 7) // 8
+    if tag == _WIRE_CHAUM_PEDERSEN:
+        return element, element, scalar
+    return element, scalar
+
+
+def _check_parallel_args(protocol: str, chunk_size: int) -> None:
+    if protocol not in _PROTOCOLS:
+        raise ValueError(f"Unknown protocol {protocol!r} (expected one of {sorted(_PROTOCOLS)})")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+
+def _init_worker(params: Tuple[int, ...]) -> None:
+    global _worker_params
+    _worker_params = params
+
+
+def _run_chunk(protocol: str, operation: str, items: List[Any]) -> List[Any]:
+    prove, verify, batch_verify = _PROTOCOLS[protocol]
+    if operation == 'prove':
+        return [prove(item, _worker_params) for item in items]
+    if operation == 'verify':
+        return [verify(item, _worker_params) for item in items]
+    return batch_verify(items, _worker_params)
+
+
+def _stream_chunks(protocol: str, operation: str, inputs: Iterable[Any], params: Tuple[int, ...],
+                   max_workers: Optional[int], chunk_size: int, ordered: bool) -> Iterator[Any]:
+    iterator = iter(inputs)
+    chunks = iter(lambda: list(itertools.islice(iterator, chunk_size)), [])
+    workers = max_workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(params,))
+    # Keep a couple of chunks queued per worker so none of them sit idle,
+    # without pulling the whole input into memory.
+    in_flight = 2 * workers
+    start = 0
+    try:
+        if ordered:
+            pending = deque()
+            for chunk in itertools.islice(chunks, in_flight):
+                pending.append(pool.submit(_run_chunk, protocol, operation, chunk))
+            while pending:
+                results = pending.popleft().result()
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    pending.append(pool.submit(_run_chunk, protocol, operation, chunk))
+                yield from results
+        else:
+            pending = {}
+            for chunk in itertools.islice(chunks, in_flight):
+                pending[pool.submit(_run_chunk, protocol, operation, chunk)] = start
+                start += len(chunk)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    offset = pending.pop(future)
+                    chunk = next(chunks, None)
+                    if chunk is not None:
+                        pending[pool.submit(_run_chunk, protocol, operation, chunk)] = start
+                        start += len(chunk)
+                    for i, result in enumerate(future.result()):
+                        yield offset + i, result
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
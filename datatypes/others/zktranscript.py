@@ -0,0 +1,90 @@
+"""Fiat-Shamir transcripts for the zero-knowledge proof protocols."""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Sequence, Tuple
+
+PREFIX_CACHE_SIZE = 64
+
+
+class Transcript:
+    """A running hash of labelled, length-prefixed byte strings.
+
+    Values are absorbed in their fixed-width binary encoding, never as
+    decimal strings, and every absorb is framed with its label and length
+    so different messages can never hash the same way.
+    """
+
+    def __init__(self, label: bytes, _state=None) -> None:
+        """Start a transcript for one protocol.
+
+        Args:
+            label: Domain separation label, e.g. ``b'schnorr.v1'``.
+        """
+        if _state is not None:
+            self._state = _state
+        else:
+            self._state = hashlib.sha256()
+            self.absorb(b'domain', label)
+
+    def absorb(self, label: bytes, data: bytes) -> 'Transcript':
+        """Absorb one labelled message."""
+        self._state.update(len(label).to_bytes(2, 'big') + label
+                           + len(data).to_bytes(4, 'big') + data)
+        return self
+
+    def copy(self) -> 'Transcript':
+        """Return an independent transcript with the same state."""
+        return Transcript(b'', self._state.copy())
+
+    def challenge(self, modulus: int, length: int = 32) -> int:
+        """Derive a challenge modulo ``modulus`` from ``length`` hash bytes.
+
+        The transcript itself is left untouched, so more values can be
+        absorbed and further challenges derived afterwards.
+        """
+        out = b''
+        counter = 0
+        while len(out) < length:
+            state = self._state.copy()
+            state.update(b'challenge' + counter.to_bytes(4, 'big'))
+            out += state.digest()
+            counter += 1
+        return int.from_bytes(out[:length], 'big') % modulus
+
+    @classmethod
+    def with_prefix(cls, label: bytes, params: Hashable,
+                    public: Callable[[], Sequence[Tuple[bytes, bytes]]]) -> 'Transcript':
+        """Return a transcript that has already absorbed the public parameters.
+
+        The hash state after the static prefix is cached under ``params``,
+        so every proof for the same parameters only pays for hashing its
+        own values; the parameters are only encoded on a cache miss.
+
+        Args:
+            label: Domain separation label.
+            params: The parameters themselves, e.g. ``(p, g, y)``; equal
+                params must produce equal encodings.
+            public: Returns the ``(label, encoding)`` pairs to absorb.
+
+        Returns:
+            Transcript: A fresh copy of the cached prefix state.
+        """
+        key = (label, params)
+        with _prefix_lock:
+            prefix = _prefixes.get(key)
+            if prefix is not None:
+                _prefixes.move_to_end(key)
+                return prefix.copy()
+        prefix = cls(label)
+        for name, data in public():
+            prefix.absorb(name, data)
+        with _prefix_lock:
+            _prefixes[key] = prefix
+            while len(_prefixes) > PREFIX_CACHE_SIZE:
+                _prefixes.popitem(last=False)
+        return prefix.copy()
+
+
+_prefixes: 'OrderedDict[tuple, Transcript]' = OrderedDict()
+_prefix_lock = threading.Lock()
@@ -0,0 +1,99 @@
+from decimal import Decimal
+
+import pytest
+
+from datatypes.future.cache import PersistentCache, make_key, memoize
+from datatypes.others.pickler import BaseDataTypesPickler
+
+
+def test_non_literal_values_are_rejected(tmp_path):
+    cache = PersistentCache(tmp_path / 'cache.sqlite3')
+    for value in (Decimal('1.5'), {1: float('nan')}, [Decimal('2')]):
+        with pytest.raises(ValueError):
+            cache.set('key', value)
+    assert 'key' not in cache
+    cache.set('key', {'a': (1, 2.5, b'x')})
+    cache.close()
+    cache = PersistentCache(tmp_path / 'cache.sqlite3')
+    assert cache.get('key') == {'a': (1, 2.5, b'x')}
+    cache.close()
+
+
+def test_undecodable_entries_are_misses(tmp_path):
+    cache = PersistentCache(tmp_path / 'cache.sqlite3')
+    blob = BaseDataTypesPickler(Decimal('1.5')).get_pickled_value()
+    cache._db.execute("INSERT INTO entries VALUES ('bad', ?, ?, 0)", (blob, len(blob)))
+    cache._db.commit()
+    assert cache.get('bad', 'default') == 'default'
+    assert len(cache) == 0
+    cache.close()
+
+
+def test_keys_include_types():
+    class Name(str):
+        pass
+
+    assert make_key(1) != make_key(1.0) != make_key(True)
+    assert make_key((1,)) != make_key([1])
+    assert make_key({'b', 'a'}) == make_key({'a', 'b'})
+    with pytest.raises(TypeError):
+        make_key(Name('a'))
+
+
+def test_memoize_does_not_cache_non_literal_arguments(tmp_path):
+    class Opaque:
+        def __init__(self, value):
+            self.value = value
+
+        def __repr__(self):
+            return 'Opaque(...)'
+
+    @memoize(PersistentCache(tmp_path / 'cache.sqlite3'))
+    def unwrap(obj):
+        return obj.value
+
+    assert unwrap(Opaque(1)) == 1
+    assert unwrap(Opaque(2)) == 2
+    assert len(unwrap.cache()) == 0
+
+
+def test_memoize_returns_non_literal_results_uncached(tmp_path):
+    calls = []
+
+    @memoize(PersistentCache(tmp_path / 'cache.sqlite3'))
+    def half(x):
+        calls.append(x)
+        return Decimal(x) / 2
+
+    assert half(3) == Decimal('1.5')
+    assert half(3) == Decimal('1.5')
+    assert calls == [3, 3]
+
+
+def test_memory_hits_keep_entries_from_eviction(tmp_path):
+    cache = PersistentCache(tmp_path / 'cache.sqlite3', max_bytes=10 ** 6)
+    cache.set('hot', 'x' * 100)
+    for i in range(5):
+        cache.set(f'cold{i}', 'x' * 100)
+    assert cache.get('hot') == 'x' * 100  # Served from the memory tier.
+    cache.max_bytes = 450
+    cache.set('new', 'x' * 100)
+    assert 'hot' in cache
+    assert 'cold0' not in cache
+    cache.close()
+
+    cache = PersistentCache(tmp_path / 'cache.sqlite3', max_bytes=450)
+    cache.get('hot')
+    cache.close()
+    cache = PersistentCache(tmp_path / 'cache.sqlite3', max_bytes=350)
+    cache.set('newer', 'x' * 100)
+    assert 'hot' in cache
+    cache.close()
+
+
+def test_contains_leaves_statistics_alone(tmp_path):
+    cache = PersistentCache(tmp_path / 'cache.sqlite3')
+    cache.set('key', 1)
+    assert 'key' in cache and 'other' not in cache
+    assert (cache.hits, cache.disk_hits, cache.misses) == (0, 0, 0)
+    cache.close()
@@ -0,0 +1,112 @@
+import os
+
+import pytest
+
+from datatypes.delete_empty_files import ScanStats, find_and_delete_empty_files, main
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for directory in ('a', 'a/b', 'c'):
+        (tmp_path / directory).mkdir()
+    for name in ('empty.txt', 'a/empty.py', 'a/b/empty', 'c/empty.bin'):
+        (tmp_path / name).touch()
+    for name in ('full.txt', 'a/b/full.py'):
+        (tmp_path / name).write_text('data')
+    (tmp_path / '__devonly__.py').touch()
+    (tmp_path / 'a/__devonly__.py').write_text('# kept')
+    return tmp_path
+
+
+def _paths(root, names):
+    return sorted(str(root / name) for name in names)
+
+
+EMPTY = ('empty.txt', 'a/empty.py', 'a/b/empty', 'c/empty.bin')
+PROTECTED = ('__devonly__.py', 'a/__devonly__.py')
+
+
+def test_dry_run_deletes_nothing(tree):
+    deleted, skipped = find_and_delete_empty_files(str(tree), dry_run=True)
+    assert sorted(deleted) == _paths(tree, EMPTY)
+    assert sorted(skipped) == _paths(tree, PROTECTED)
+    assert all((tree / name).exists() for name in EMPTY)
+
+
+def test_deletes_empty_files_and_keeps_protected_ones(tree):
+    stats = ScanStats()
+    deleted, skipped = find_and_delete_empty_files(str(tree), stats=stats)
+    assert sorted(deleted) == _paths(tree, EMPTY)
+    assert not any((tree / name).exists() for name in EMPTY)
+    # Every __devonly__.py is reported as skipped, empty or not.
+    assert sorted(skipped) == _paths(tree, PROTECTED)
+    assert all((tree / name).exists() for name in PROTECTED + ('full.txt', 'a/b/full.py'))
+    assert (stats.directories, stats.files, stats.deleted, stats.skipped) == (4, 8, 4, 2)
+    deleted, skipped = find_and_delete_empty_files(str(tree))
+    assert deleted == [] and sorted(skipped) == _paths(tree, PROTECTED)
+
+
+@pytest.mark.parametrize('jobs', ['1', '4'])
+def test_command_line_with_jobs(tree, jobs, capsys):
+    assert main([str(tree), '--dry-run', '--jobs', jobs]) == 0
+    out = capsys.readouterr().out
+    assert 'Would delete 4 empty files' in out
+    assert "Skipped 2 '__devonly__.py' files" in out
+    assert (tree / 'empty.txt').exists()
+    assert main([str(tree), '--jobs', jobs]) == 0
+    assert 'Successfully deleted 4 empty files' in capsys.readouterr().out
+    assert not (tree / 'empty.txt').exists()
+
+
+def _age(root, seconds=100):
+    # Listings modified within ScanIndex.RACY_NS of the scan are not reused.
+    when = os.stat(root).st_mtime - seconds
+    for directory, _, _ in os.walk(root):
+        os.utime(directory, (when, when))
+
+
+def test_scan_index_reuses_unchanged_directories(tree, tmp_path_factory):
+    index = str(tmp_path_factory.mktemp('index') / 'index.json')
+    _age(tree)
+    first = ScanStats()
+    deleted, _ = find_and_delete_empty_files(str(tree), dry_run=True, stats=first, index_path=index)
+    assert first.reused == 0 and len(deleted) == 4
+
+    second = ScanStats()
+    again, skipped = find_and_delete_empty_files(str(tree), dry_run=True, stats=second, index_path=index)
+    assert second.reused == 4
+    assert sorted(again) == sorted(deleted)
+    assert sorted(skipped) == _paths(tree, PROTECTED)
+
+
+def test_scan_index_rescans_changed_directories(tree, tmp_path_factory):
+    index = str(tmp_path_factory.mktemp('index') / 'index.json')
+    _age(tree)
+    find_and_delete_empty_files(str(tree), dry_run=True, index_path=index)
+
+    (tree / 'a/b/new.txt').touch()
+    os.utime(tree / 'a/b', (os.stat(tree).st_mtime + 1,) * 2)
+    stats = ScanStats()
+    deleted, _ = find_and_delete_empty_files(str(tree), dry_run=True, stats=stats, index_path=index)
+    assert str(tree / 'a/b/new.txt') in deleted
+    assert stats.reused == 3
+
+
+def test_scan_index_forgets_directories_it_deleted_from(tree, tmp_path_factory):
+    index = str(tmp_path_factory.mktemp('index') / 'index.json')
+    _age(tree)
+    deleted, _ = find_and_delete_empty_files(str(tree), index_path=index)
+    assert len(deleted) == 4
+    _age(tree)
+    stats = ScanStats()
+    deleted, _ = find_and_delete_empty_files(str(tree), stats=stats, index_path=index)
+    assert deleted == [] and stats.reused == 0
+
+
+def test_scan_index_for_another_root_is_ignored(tree, tmp_path_factory):
+    index = str(tmp_path_factory.mktemp('index') / 'index.json')
+    _age(tree)
+    find_and_delete_empty_files(str(tree), dry_run=True, index_path=index)
+    stats = ScanStats()
+    find_and_delete_empty_files(str(tree / 'a'), dry_run=True, stats=stats, index_path=index)
+    assert stats.reused == 0
@@ -0,0 +1,73 @@
+import importlib
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from datatypes.others import instrument, memory, registry
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(code, setting):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    env.pop(instrument.ENV_VAR, None)
+    if setting is not None:
+        env[instrument.ENV_VAR] = setting
+    output = subprocess.run([sys.executable, '-c', code], env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+@pytest.mark.parametrize('group', ['collections', 'numeric', 'others'])
+def test_every_group_has_a_data_switch(monkeypatch, group):
+    monkeypatch.delenv(instrument.ENV_VAR, raising=False)
+    monkeypatch.setattr(instrument, '_forced', None)
+    data = importlib.import_module(f'datatypes.{group}.__data__')
+    assert not instrument.is_enabled(group)
+    monkeypatch.setattr(data, 'instrument', True)
+    assert instrument.is_enabled(group)
+
+
+@pytest.mark.parametrize('name', sorted(registry.DECLARATIONS))
+def test_declared_modules_register_on_import(name):
+    module = importlib.import_module(name)
+    classes = [target.cls for target in instrument._targets] + list(memory._registry)
+    assert any(cls.__module__ == module.__name__ for cls in classes)
+
+
+def test_direct_import_is_instrumented():
+    counts = _run(
+        "import json\n"
+        "from datatypes.collections.multidict import MultiDict\n"
+        "from datatypes.others import instrument\n"
+        "items = MultiDict()\n"
+        "items.add('a', 1)\n"
+        "items.add('a', 2)\n"
+        "print(json.dumps(instrument.snapshot()['MultiDict']['add']['calls']))\n",
+        'collections')
+    assert counts == 2
+
+
+def test_lazy_attribute_is_instrumented():
+    snapshot = _run(
+        "import json\n"
+        "import datatypes\n"
+        "from datatypes.others import instrument\n"
+        "value = datatypes.BaseDataTypesPickler([1, 2]).get_pickled_value()\n"
+        "datatypes.OrderedSet([1]).add(2)\n"
+        "print(json.dumps(instrument.snapshot()))\n",
+        'others')
+    assert snapshot['BaseDataTypesPickler']['get_pickled_value']['calls'] == 1
+    assert 'OrderedSet' not in snapshot
+
+
+def test_nothing_is_wrapped_when_off():
+    wrapped = _run(
+        "import json\n"
+        "from datatypes.collections.orderedset import OrderedSet\n"
+        "print(json.dumps(hasattr(OrderedSet.add, '__wrapped__')))\n",
+        None)
+    assert wrapped is False
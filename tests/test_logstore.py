@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+from datatypes.collections.diskmultidict import DiskMultiDict
+
+
+def test_reopen_after_torn_tail(tmp_path):
+    path = str(tmp_path / 'store')
+    with DiskMultiDict(path) as store:
+        for i in range(20):
+            store.add(i, i * 10)
+        # Repeated keys make the rebuild read (and cache) the log.
+        for i in range(20):
+            store.remove(i)
+            store.add(i, i * 10)
+    with open(os.path.join(path, 'log.0'), 'ab') as f:
+        f.write(bytes(100_000))
+
+    with DiskMultiDict(path) as store:
+        for i in range(20, 70):
+            store.add(i, i * 10)
+        store.flush()
+        assert [store.get(i) for i in range(70)] == [[i * 10] for i in range(70)]
+        assert len(store) == 70
+
+    with DiskMultiDict(path) as store:
+        assert list(store.items()) == [(i, i * 10) for i in range(70)]
+
+
+def _generation(path):
+    with open(os.path.join(path, 'CURRENT')) as f:
+        return int(f.read())
+
+
+def test_compaction_while_writing_and_reopening(tmp_path):
+    path = str(tmp_path / 'store')
+    expected = {}
+    for round_ in range(3):
+        with DiskMultiDict(path, compact_min_records=200) as store:
+            for i in range(2000):
+                key = i % 50
+                if i % 7 == 0:
+                    store.remove(key)
+                    expected.pop(key, None)
+                else:
+                    store.add(key, (round_, i))
+                    expected.setdefault(key, []).append((round_, i))
+                if i == 1000:
+                    store.compact(wait=False)
+            assert {k: store.get(k) for k in expected} == expected
+        with DiskMultiDict(path) as store:
+            assert {k: store.get(k) for k in range(50) if store.get(k)} == expected
+    assert _generation(path) > 0
+    assert sorted(os.listdir(path)) == sorted(['CURRENT', f'log.{_generation(path)}', f'index.{_generation(path)}'])
+
+
+def test_failed_background_compaction_is_raised_by_next_write(tmp_path, monkeypatch):
+    path = str(tmp_path / 'store')
+    store = DiskMultiDict(path)
+    for i in range(100):
+        store.add(i % 10, i)
+    logstore = store._store
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(logstore, '_copy_prefix', fail)
+    store.compact(wait=False)
+    logstore._compactor.join()
+    with pytest.raises(RuntimeError, match="compaction") as info:
+        store.add('late', 1)
+    assert isinstance(info.value.__cause__, OSError)
+    assert store.get('late') == []
+    store.add('late', 1)  # Reported once.
+
+    store.compact(wait=False)
+    logstore._compactor.join()
+    with pytest.raises(RuntimeError):
+        store.close()
+    with DiskMultiDict(path) as store:
+        assert store.get(3) == [3, 13, 23, 33, 43, 53, 63, 73, 83, 93]
+        assert store.get('late') == [1]
@@ -0,0 +1,78 @@
+import sys
+
+from datatypes.collections.multidict import MultiDict
+from datatypes.collections.orderedset import OrderedSet
+from datatypes.others.memory import deep_sizeof, memory_report
+
+
+class Node:
+    def __init__(self, value=None):
+        self.value = value
+        self.next = None
+
+
+def test_cycles_are_counted_once():
+    items = []
+    items.append(items)
+    assert deep_sizeof(items) == sys.getsizeof(items)
+
+    mapping = {}
+    mapping['self'] = mapping
+    assert deep_sizeof(mapping) == sys.getsizeof(mapping) + sys.getsizeof('self')
+
+    a, b = Node(), Node()
+    a.next, b.next = b, a
+    assert deep_sizeof(a) == deep_sizeof(b) == memory_report([a, b]).total - sys.getsizeof([a, b])
+
+
+def test_shared_references_are_counted_once():
+    big = 'x' * 10_000
+    shared = [big, big, big]
+    assert deep_sizeof(shared) == sys.getsizeof(shared) + sys.getsizeof(big)
+    nested = ([big], [big], {'k': big})
+    assert deep_sizeof(nested) < 2 * sys.getsizeof(big)
+
+    md = MultiDict()
+    md.add('k', big)
+    before = deep_sizeof(md)
+    md.add('k', big)
+    md.add('j', big)
+    assert deep_sizeof(md) - before < sys.getsizeof(big)
+    report = memory_report(md)
+    assert report.by_type['str'][0] == 3  # 'k', 'j' and big, once.
+
+
+def test_singletons_classes_and_functions_are_not_counted():
+    items = [None, True, False, Node, deep_sizeof, sys]
+    assert deep_sizeof(items) == sys.getsizeof(items)
+
+
+def test_structural_and_payload_split():
+    values = ['a' * 100, 'b' * 100]
+    report = memory_report(values)
+    assert report.structural == sys.getsizeof(values)
+    assert report.payload == sum(sys.getsizeof(v) for v in values)
+    assert report.total == report.structural + report.payload
+    assert report.objects == 3
+
+
+def test_registered_containers_count_internals_once():
+    ordered = OrderedSet(range(1000, 1100))
+    report = memory_report(ordered)
+    assert report.by_type['OrderedSet'] == [1, sys.getsizeof(ordered)]
+    assert report.by_type['int'][0] == 100
+    # Only the instance __dict__; the _items dict is part of __sizeof__.
+    assert report.by_type['dict'] == [1, sys.getsizeof(ordered.__dict__)]
+
+
+def test_deep_nesting_does_not_recurse():
+    head = Node(0)
+    node = head
+    for i in range(1, 50_000):
+        node.next = Node(i)
+        node = node.next
+    nested = []
+    for _ in range(50_000):
+        nested = [nested]
+    assert deep_sizeof(head) > 50_000 * sys.getsizeof(head)
+    assert deep_sizeof(nested) == 50_000 * sys.getsizeof([[]]) + sys.getsizeof([])
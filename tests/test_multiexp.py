@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+from datatypes.others.multiexp import bucket_exp, interleaved_exp, multi_exp, shamir_exp
+from datatypes.others.zkparams import standard_group
+
+GROUP = standard_group(2048)
+P, Q = GROUP.p, GROUP.q
+
+
+def _naive(bases, exponents, modulus):
+    result = 1
+    for base, exponent in zip(bases, exponents):
+        result = result * pow(base, exponent, modulus) % modulus
+    return result
+
+
+def _operands(k, bits):
+    bases = [random.randrange(2, P) for _ in range(k)]
+    exponents = [random.getrandbits(bits) for _ in range(k)]
+    return bases, exponents
+
+
+@pytest.mark.parametrize('k', [1, 2, 3, 16, 17, 40])
+@pytest.mark.parametrize('bits', [1, 20, 256])
+def test_multi_exp_and_bucket_exp_match_pow(k, bits):
+    bases, exponents = _operands(k, bits)
+    expected = _naive(bases, exponents, P)
+    assert multi_exp(bases, exponents, P) == expected
+    assert bucket_exp(bases, exponents, P) == expected
+    assert interleaved_exp(bases, exponents, P) == expected
+
+
+@pytest.mark.parametrize('k', [2, 17])
+def test_full_size_exponents(k):
+    bases, exponents = _operands(k, 2048)
+    assert multi_exp(bases, exponents, P) == _naive(bases, exponents, P)
+
+
+@pytest.mark.parametrize('k', [1, 2, 17])
+def test_zero_exponents_and_small_modulus(k):
+    bases, _ = _operands(k, 1)
+    assert multi_exp(bases, [0] * k, P) == 1
+    assert bucket_exp(bases, [0] * k, P) == 1
+    small = [b % 1019 for b in bases]
+    exponents = [random.randrange(10 ** 6) for _ in range(k)]
+    assert multi_exp(small, exponents, 1019) == _naive(small, exponents, 1019)
+
+
+@pytest.mark.parametrize('k', [1, 2, 17])
+def test_negative_exponents_need_the_order(k):
+    bases, exponents = _operands(k, 128)
+    negative = [-e for e in exponents]
+    expected = _naive(bases, [e % Q for e in negative], P)
+    assert multi_exp(bases, negative, P, Q) == expected
+    assert bucket_exp(bases, negative, P, Q) == expected
+    if k > 1:
+        with pytest.raises(ValueError):
+            multi_exp(bases, negative, P)
+
+
+def test_shamir_exp_matches_pow():
+    (a, b), (x, y) = _operands(2, 2048)
+    expected = pow(a, x, P) * pow(b, y, P) % P
+    assert shamir_exp(a, x, b, y, P) == expected
+    for window in (1, 2, 4):
+        assert shamir_exp(a, x, b, y, P, window=window) == expected
+
+
+def test_mismatched_lengths_are_rejected():
+    with pytest.raises(ValueError):
+        multi_exp([2, 3], [1], P)
@@ -0,0 +1,71 @@
+import multiprocessing
+import operator
+import pickle
+
+import pytest
+
+from datatypes.collections.sharedfrozendict import SharedFrozenDict
+
+DATA = {'a': 1, 2: 'two', (3, 'x'): (None, True, 2.5), b'raw': -10 ** 30, 'empty': ()}
+
+
+@pytest.fixture
+def shared():
+    table = SharedFrozenDict.create(DATA)
+    yield table
+    table.close()
+    table.unlink()
+
+
+def test_lookups(shared):
+    assert dict(shared.items()) == DATA
+    assert list(shared) == list(DATA)
+    assert len(shared) == len(DATA)
+    assert shared[(3, 'x')] == (None, True, 2.5)
+    assert 'missing' not in shared and [1] not in shared
+    with pytest.raises(KeyError):
+        shared['missing']
+
+
+def test_equal_numbers_find_the_same_key():
+    with SharedFrozenDict.create({1: 'one', (2, 3): 'pair'}) as table:
+        assert table[1.0] == table[True] == 'one'
+        assert table[(2.0, 3)] == 'pair'
+        table.unlink()
+
+
+def test_spawned_workers_attach_by_name(shared):
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(2) as pool:
+        assert pool.apply(dict, (shared,)) == DATA
+        assert pool.starmap(operator.getitem, [(shared, key) for key in DATA]) == list(DATA.values())
+    # Workers exiting must not destroy the segment.
+    assert dict(shared.items()) == DATA
+
+
+def test_file_backed_tables_pickle_by_path(tmp_path):
+    path = str(tmp_path / 'table.sfd')
+    SharedFrozenDict.write(DATA, path)
+    with SharedFrozenDict.open(path) as table:
+        copy = pickle.loads(pickle.dumps(table))
+        assert copy.path == path and dict(copy.items()) == DATA
+        copy.close()
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(1) as pool:
+            assert pool.apply(dict, (table,)) == DATA
+
+
+@pytest.mark.parametrize('data', [{'a': [1]}, {'a': {1: 2}}, {1j: 'x'}, {'a': (1, [2])}, {frozenset(): 1}])
+def test_unsupported_values_raise_type_error(data, tmp_path):
+    with pytest.raises(TypeError):
+        SharedFrozenDict.create(data)
+    with pytest.raises(TypeError):
+        SharedFrozenDict.write(data, str(tmp_path / 'table.sfd'))
+
+
+def test_only_the_creator_can_unlink(shared):
+    attached = SharedFrozenDict.attach(shared.name)
+    assert attached['a'] == 1
+    with pytest.raises(ValueError):
+        attached.unlink()
+    attached.close()
@@ -0,0 +1,111 @@
+import pickle
+import random
+
+from datatypes.collections.multidict import MultiDict
+from datatypes.collections.orderedset import OrderedSet, OrderedSetSnapshot
+
+
+def test_orderedset_snapshot_is_unaffected_by_writes():
+    items = OrderedSet([1, 2, 3])
+    snap = items.snapshot()
+    items.add(4)
+    items.discard(1)
+    assert list(snap) == [1, 2, 3]
+    assert list(items) == [2, 3, 4]
+
+
+def test_orderedset_snapshot_operators():
+    snap = OrderedSet([3, 1, 2]).snapshot()
+    for result in (snap & {1, 2}, snap | {9}, snap - {1}, snap ^ {2, 9}):
+        assert isinstance(result, OrderedSetSnapshot)
+    assert list(snap & {1, 2}) == [1, 2]
+    assert list(snap | {9}) == [3, 1, 2, 9]
+    assert list(snap - {1}) == [3, 2]
+    assert set(snap ^ {2, 9}) == {1, 3, 9}
+    assert snap == {1, 2, 3}
+
+
+def test_multidict_snapshot_is_unaffected_by_writes():
+    md = MultiDict()
+    md.add('a', 1)
+    md.add('b', 2)
+    snap = md.snapshot()
+    md.add('a', 3)
+    md.remove('b')
+    assert list(snap.items()) == [('a', 1), ('b', 2)]
+    assert list(md.items()) == [('a', 1), ('a', 3)]
+
+
+def _shared_parts(first, second):
+    ids = {id(part) for part in first.parts()}
+    return sum(id(part) in ids for part in second.parts())
+
+
+def test_orderedset_write_after_snapshot_copies_only_touched_parts():
+    items = OrderedSet(range(10_000))
+    snap = items.snapshot()
+    items.add(-1)
+    items.discard(5_000)
+    parts = items._items.parts()
+    # The two outer lists, and a bucket and a chunk per write.
+    assert len(parts) - _shared_parts(snap._items, items._items) <= 2 + 4
+    assert list(snap) == list(range(10_000))
+    assert list(items) == [i for i in range(10_000) if i != 5_000] + [-1]
+
+
+def test_multidict_write_after_snapshot_copies_only_touched_parts():
+    md = MultiDict()
+    for i in range(10_000):
+        md.add(i, i)
+    snap = md.snapshot()
+    md.add(1, 2)
+    md.add(-1, 0)
+    md.remove(7)
+    parts = md._items.parts()
+    # The three outer lists; a value bucket for the append, and a value
+    # bucket, an index bucket and a chunk each for the new and removed keys.
+    assert len(parts) - _shared_parts(snap._items, md._items) <= 3 + 7
+    assert snap.get(1) == (1,) and 7 in snap and -1 not in snap
+    assert md.get(1) == [1, 2] and md.get(7) == [] and md.get(-1) == [0]
+
+
+def test_snapshots_match_a_plain_dict_under_random_writes():
+    rng = random.Random(5)
+    items, md = OrderedSet(), MultiDict()
+    expected_set, expected_md = {}, {}
+    views = []
+    for step in range(20_000):
+        key = rng.randrange(3_000)
+        if step % 500 == 0:
+            batch = [rng.randrange(3_000) for _ in range(200)]
+            items.update(batch)
+            expected_set.update(dict.fromkeys(batch))
+        elif rng.random() < 0.6:
+            items.add(key)
+            expected_set[key] = None
+            md.add(key, step)
+            expected_md.setdefault(key, []).append(step)
+        else:
+            items.discard(key)
+            expected_set.pop(key, None)
+            md.remove(key)
+            expected_md.pop(key, None)
+        if step % 1_000 == 0:
+            views.append((items.snapshot(), list(expected_set), md.snapshot(),
+                          [(k, v) for k, values in expected_md.items() for v in values]))
+    assert list(items) == list(expected_set) and len(items) == len(expected_set)
+    assert all(key in items for key in expected_set)
+    assert list(md.items()) == [(k, v) for k, values in expected_md.items() for v in values]
+    for snap, keys, md_snap, pairs in views:
+        assert list(snap) == keys and len(snap) == len(keys)
+        assert list(md_snap.items()) == pairs
+
+
+def test_pickles_keep_the_dict_state():
+    items = OrderedSet(['a', 'b'])
+    md = MultiDict()
+    md.add('a', 1)
+    assert items.__getstate__() == {'_items': {'a': None, 'b': None}}
+    assert md.__getstate__() == {'_items': {'a': [1]}}
+    assert list(pickle.loads(pickle.dumps(items))) == ['a', 'b']
+    assert list(pickle.loads(pickle.dumps(md)).items()) == [('a', 1)]
@@ -0,0 +1,131 @@
+import pytest
+
+from datatypes.others import testgen
+from datatypes.others.testgen import BulkDataGenerator, DataGenerator
+
+BACKENDS = [False, pytest.param(True, marks=pytest.mark.skipif(testgen.np is None, reason="NumPy is not installed"))]
+
+
+def test_random_list_int_bounds():
+    values = DataGenerator.random_list(50, int, min_val=3, max_val=5)
+    assert len(values) == 50 and set(values) <= {3, 4, 5}
+    assert DataGenerator.random_list(0, int, min_val=5, max_val=3) == []
+    with pytest.raises(ValueError):
+        DataGenerator.random_int(min_val=5, max_val=3)
+    with pytest.raises(ValueError):
+        DataGenerator.random_list(4, int, min_val=5, max_val=3)
+
+
+def test_random_list_wide_range_uses_every_bit():
+    values = DataGenerator.random_list(200, int, min_val=0, max_val=2 ** 62)
+    assert any(v % 2 for v in values)
+    huge = DataGenerator.random_list(20, int, min_val=0, max_val=2 ** 64)
+    assert all(0 <= v <= 2 ** 64 for v in huge)
+
+
+@pytest.mark.parametrize('use_numpy', BACKENDS)
+def test_int_chunks(use_numpy):
+    gen = BulkDataGenerator(seed=1, chunk_size=7, use_numpy=use_numpy)
+    chunks = list(gen.int_chunks(20, -3, 3))
+    assert [len(c) for c in chunks] == [7, 7, 6]
+    assert all(-3 <= v <= 3 for c in chunks for v in c)
+    wide = [v for c in gen.int_chunks(300, 0, 2 ** 100) for v in c]
+    assert all(0 <= v <= 2 ** 100 for v in wide)
+    assert any(v % 2 for v in wide)
+    assert max(wide) > 2 ** 90
+    with pytest.raises(ValueError):
+        next(gen.int_chunks(3, 5, 4))
+
+
+@pytest.mark.parametrize('use_numpy', BACKENDS)
+def test_streams_are_reproducible(use_numpy):
+    first, second = (BulkDataGenerator(seed=42, chunk_size=16, use_numpy=use_numpy) for _ in range(2))
+    assert list(first.int_chunks(40, 0, 2 ** 70)) == list(second.int_chunks(40, 0, 2 ** 70))
+    assert list(first.bytes_chunks(40)) == list(second.bytes_chunks(40))
+    assert list(first.string_chunks(10, 4)) == list(second.string_chunks(10, 4))
+    children = first.spawn(2)
+    assert children[0].seed != children[1].seed
+    assert [c.seed for c in children] == [c.seed for c in second.spawn(2)]
+
+
+@pytest.mark.parametrize('use_numpy', BACKENDS)
+def test_records_and_containers(use_numpy):
+    gen = BulkDataGenerator(seed=3, chunk_size=8, use_numpy=use_numpy)
+    rows = [row for chunk in gen.records(10, {'a': int, 'b': str, 'c': bytes}) for row in chunk]
+    assert len(rows) == 10
+    assert all(len(row['b']) == 10 and len(row['c']) == 10 for row in rows)
+    with pytest.raises(TypeError):
+        next(gen.records(1, {'a': list}))
+    values = list(gen.orderedset(500))
+    assert all(0 <= v <= 2 ** 62 for v in values)
+    assert any(v % 256 for v in values)
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / 'pkg').mkdir()
+    (tmp_path / 'alpha.py').write_text("def double(x: int) -> int:\n    return 2 * x\n")
+    (tmp_path / 'beta.py').write_text("class Thing:\n    def run(self, name: str):\n        return name\n")
+    (tmp_path / 'pkg' / 'gamma.py').write_text("def hello():\n    return 'hi'\n")
+    (tmp_path / 'broken.py').write_text("def oops(:\n")
+    return tmp_path
+
+
+def _names(paths):
+    return sorted(path.name for path in paths)
+
+
+def test_generate_project_tests_skips_unchanged_modules(project):
+    generator = testgen.TestGenerator(project)
+    first = generator.generate_project_tests(max_workers=1)
+    assert _names(first.parsed) == ['alpha.py', 'beta.py', 'gamma.py']
+    assert _names(first.written) == ['test_alpha.py', 'test_beta.py', 'test_gamma.py']
+    assert _names(first.errors) == ['broken.py']
+    assert 'def test_double' in (project / 'test_alpha.py').read_text()
+
+    second = generator.generate_project_tests(max_workers=1)
+    assert _names(second.skipped) == ['alpha.py', 'beta.py', 'gamma.py']
+    assert second.parsed == [] and second.written == []
+    assert _names(second.errors) == ['broken.py']  # Errors are retried.
+
+    full = generator.generate_project_tests(incremental=False, max_workers=1)
+    assert full.skipped == [] and _names(full.unchanged) == ['test_alpha.py', 'test_beta.py', 'test_gamma.py']
+
+
+def test_generate_project_tests_rewrites_changed_modules(project):
+    generator = testgen.TestGenerator(project)
+    generator.generate_project_tests(max_workers=1)
+
+    (project / 'alpha.py').write_text("def double(x: int) -> int:\n    return 2 * x\n\n"
+                                      "def triple(x: int) -> int:\n    return 3 * x\n")
+    (project / 'beta.py').write_text("# A comment changes the hash but not the tests.\n"
+                                     + (project / 'beta.py').read_text())
+    (project / 'pkg' / 'test_gamma.py').unlink()
+    summary = generator.generate_project_tests(max_workers=1)
+    assert _names(summary.parsed) == ['alpha.py', 'beta.py', 'gamma.py']
+    assert _names(summary.written) == ['test_alpha.py', 'test_gamma.py']
+    assert _names(summary.unchanged) == ['test_beta.py']
+    assert 'def test_triple' in (project / 'test_alpha.py').read_text()
+
+
+def test_generate_project_tests_ignores_stale_manifests(project):
+    generator = testgen.TestGenerator(project)
+    generator.generate_project_tests(max_workers=1)
+    manifest = project / testgen.MANIFEST_NAME
+    manifest.write_text(manifest.read_text().replace(f'"version": {testgen.GENERATOR_VERSION}', '"version": -1'))
+    assert _names(generator.generate_project_tests(max_workers=1).parsed) == ['alpha.py', 'beta.py', 'gamma.py']
+
+
+def test_generate_project_tests_in_parallel_matches_serial(project, tmp_path_factory):
+    serial = tmp_path_factory.mktemp('serial')
+    for path in project.rglob('*.py'):
+        target = serial / path.relative_to(project)
+        target.parent.mkdir(exist_ok=True)
+        target.write_text(path.read_text())
+
+    parallel_summary = testgen.TestGenerator(project).generate_project_tests(max_workers=2)
+    testgen.TestGenerator(serial).generate_project_tests(max_workers=1)
+    assert _names(parallel_summary.written) == ['test_alpha.py', 'test_beta.py', 'test_gamma.py']
+    assert _names(parallel_summary.errors) == ['broken.py']
+    for name in ('test_alpha.py', 'test_beta.py', 'pkg/test_gamma.py'):
+        assert (project / name).read_text() == (serial / name).read_text()
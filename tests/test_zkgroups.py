@@ -0,0 +1,60 @@
+import pickle
+
+import pytest
+from Crypto.PublicKey import ECC
+
+from datatypes.others.zkgroups import Group, ModPGroup, get_group
+from datatypes.others.zkparams import GroupParams, generate_group
+from datatypes.others.zkproofs import _group_schnorr_challenge
+
+
+@pytest.mark.parametrize('curve', ['P-256', 'P-384', 'P-521', 'Ed25519'])
+def test_points_pickle_on_their_own_curve(curve):
+    point = ECC.generate(curve=curve).pointQ
+    copy = pickle.loads(pickle.dumps(point))
+    assert copy.curve == point.curve
+    assert copy == point
+
+
+def test_p256_elements_pickle():
+    group = get_group('p256')
+    element = group.scalar_mul(group.generator, 12345)
+    assert pickle.loads(pickle.dumps(element)) == element
+
+
+def test_modp_decode_rejects_elements_outside_the_subgroup():
+    group = get_group('modp2048')
+    p = group.params.p
+    element = group.scalar_mul(group.generator, 777)
+    assert group.decode(group.encode(element)) == element
+    for bad in (p - element, p - 1, 0):
+        with pytest.raises(ValueError):
+            group.decode(bad.to_bytes(group.element_size, 'big'))
+
+
+def test_derive_generator_is_abstract():
+    assert 'derive_generator' in Group.__abstractmethods__
+
+
+def _two_generated_groups():
+    first, second = generate_group(64), generate_group(64)
+    while second.p == first.p:
+        second = generate_group(64)
+    return first, second
+
+
+def test_generated_groups_with_different_moduli_differ():
+    first, second = (ModPGroup(params) for params in _two_generated_groups())
+    assert first.name == second.name == 'generated'
+    assert first != second
+    assert first == ModPGroup(first.params)
+    assert len({first, second, ModPGroup(first.params)}) == 2
+
+
+def test_hashes_and_challenges_bind_the_modulus():
+    first, second = _two_generated_groups()
+    # Same name, order and generator; only p differs.
+    a = ModPGroup(first)
+    b = ModPGroup(GroupParams(second.p, first.q, first.g))
+    assert a.hash_to_scalar(b'x') != b.hash_to_scalar(b'x')
+    assert _group_schnorr_challenge(a, 4, 16, b'r') != _group_schnorr_challenge(b, 4, 16, b'r')
@@ -0,0 +1,77 @@
+import pytest
+
+from datatypes.others.zkproofs import Commitment, ZeroKnowledgeProofs as ZKP
+
+# Generated 256-bit groups keep the worker processes' work small.
+BITS = 256
+
+
+def _flip(data):
+    return (int.from_bytes(data, 'big') ^ 1).to_bytes(len(data), 'big')
+
+
+def _forge(proof):
+    r, e, s = proof
+    return r, e, _flip(s)
+
+
+@pytest.fixture(scope='module')
+def schnorr():
+    params = ZKP.schnorr_setup(BITS)
+    proofs = list(ZKP.prove_many('schnorr', [params[2]] * 10, params, max_workers=2, chunk_size=3))
+    return params, proofs
+
+
+def test_prove_many_schnorr_proofs_verify(schnorr):
+    params, proofs = schnorr
+    assert len(proofs) == 10
+    assert all(ZKP.schnorr_verify(proof, params) for proof in proofs)
+
+
+@pytest.mark.parametrize('batch', [True, False])
+def test_verify_many_ordered_flags_the_forgery(schnorr, batch):
+    params, proofs = schnorr
+    proofs = list(proofs)
+    proofs[4] = _forge(proofs[4])
+    results = list(ZKP.verify_many('schnorr', proofs, params, max_workers=2, chunk_size=3, batch=batch))
+    assert results == [i != 4 for i in range(10)]
+
+
+@pytest.mark.parametrize('batch', [True, False])
+def test_verify_many_unordered_yields_every_index(schnorr, batch):
+    params, proofs = schnorr
+    proofs = list(proofs)
+    proofs[7] = _forge(proofs[7])
+    pairs = list(ZKP.verify_many('schnorr', iter(proofs), params, max_workers=2, chunk_size=3,
+                                 ordered=False, batch=batch))
+    assert sorted(pairs) == [(i, i != 7) for i in range(10)]
+
+
+def test_pedersen_commitments_in_parallel():
+    params = ZKP.pedersen_setup(BITS)
+    commitments = list(ZKP.prove_many('pedersen', range(8), params, max_workers=2, chunk_size=3))
+    items = [(c, v) for v, c in enumerate(commitments)]
+    c, v = items[2]
+    items[2] = (Commitment(c.value, _flip(c.randomness)), v)
+    assert list(ZKP.verify_many('pedersen', items, params, max_workers=2, chunk_size=3)) == \
+        [i != 2 for i in range(8)]
+    pairs = list(ZKP.prove_many('pedersen', range(8), params, max_workers=2, chunk_size=3, ordered=False))
+    assert sorted(i for i, _ in pairs) == list(range(8))
+    assert all(ZKP.pedersen_verify(c, i, params) for i, c in pairs)
+
+
+def test_chaum_pedersen_in_parallel():
+    p, g1, g2 = ZKP.pedersen_setup(BITS)
+    x = 4242
+    params = (g1, pow(g1, x, p), g2, pow(g2, x, p), p)
+    proofs = list(ZKP.prove_many('chaum_pedersen', [x] * 6, params, max_workers=2, chunk_size=2))
+    proofs[0] = _forge(proofs[0])
+    assert list(ZKP.verify_many('chaum_pedersen', proofs, params, max_workers=2, chunk_size=2)) == \
+        [False] + [True] * 5
+
+
+def test_bad_arguments_are_rejected():
+    with pytest.raises(ValueError):
+        ZKP.prove_many('unknown', [], ())
+    with pytest.raises(ValueError):
+        ZKP.verify_many('schnorr', [], (), chunk_size=0)
@@ -0,0 +1,25 @@
+import pytest
+
+import datatypes
+from datatypes.future import __data__ as future_data
+from datatypes.others import zkparams
+from datatypes.others.errors.errordevfile import ImportDisabledError
+from datatypes.others.zkproofs import ZeroKnowledgeProofs as ZKP
+
+
+def test_non_standard_sizes_fall_back_to_generated_groups():
+    p, g, h = ZKP.pedersen_setup(bits=256)
+    assert p.bit_length() == 256
+    commitment = ZKP.pedersen_commit(5, (p, g, h))
+    assert ZKP.pedersen_verify(commitment, 5, (p, g, h))
+    assert ZKP.schnorr_setup(bits=256)[0] == p
+
+
+def test_disk_cache_is_opt_in_and_gated():
+    assert not zkparams.ParameterProvider()._use_disk
+    if not future_data.disabled:
+        pytest.skip("the future group is enabled")
+    with pytest.raises(ImportDisabledError):
+        datatypes.PersistentCache
+    with pytest.raises(ImportDisabledError):
+        zkparams.ParameterProvider(use_disk=True)
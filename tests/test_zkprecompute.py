@@ -0,0 +1,78 @@
+import pickle
+import random
+
+import pytest
+
+from datatypes.others.zkprecompute import (FixedBaseTable, PrecomputedParams, fixed_multi_pow, fixed_pow,
+                                           precompute)
+from datatypes.others.zkproofs import ZeroKnowledgeProofs as ZKP
+
+
+@pytest.fixture(scope='module')
+def params():
+    # A generated 256-bit group keeps the comparisons with pow() quick.
+    return ZKP.pedersen_setup(256)
+
+
+def _exponents(p):
+    return [0, 1, 2, p - 2, p - 1, p, 3 * p + 5] + [random.randrange(p ** 2) for _ in range(10)]
+
+
+@pytest.mark.parametrize('window', [1, 4, 5])
+def test_fixed_pow_matches_pow(params, window):
+    p, g, h = params
+    pre = precompute(params, window)
+    assert pre == params
+    other = pow(g, 12345, p)
+    for e in _exponents(p):
+        assert fixed_pow(pre, g, e, p) == pow(g, e, p)
+        assert fixed_pow(pre, h, e, p) == pow(h, e, p)
+        assert fixed_pow(pre, other, e, p) == pow(other, e, p)
+        assert fixed_pow(params, g, e, p) == pow(g, e, p)
+
+
+def test_fixed_multi_pow_matches_pow(params):
+    p, g, h = params
+    pre = precompute(params)
+    other = pow(h, 999, p)
+    for _ in range(10):
+        exponents = [random.randrange(p) for _ in range(3)]
+        expected = pow(g, exponents[0], p) * pow(h, exponents[1], p) * pow(other, exponents[2], p) % p
+        assert fixed_multi_pow(pre, (g, h, other), exponents, p) == expected
+        assert fixed_multi_pow(params, (g, h, other), exponents, p) == expected
+
+
+def test_pickle_round_trip(params):
+    p, g, h = params
+    pre = PrecomputedParams(params, window=4)
+    copy = pickle.loads(pickle.dumps(pre))
+    assert isinstance(copy, PrecomputedParams)
+    assert copy == pre and copy.window == 4 and copy.modulus == p
+    assert {b: t.rows for b, t in copy.tables.items()} == {b: t.rows for b, t in pre.tables.items()}
+    e = random.randrange(p)
+    assert copy.pow(g, e) == pow(g, e, p)
+
+    table = FixedBaseTable(g, p, window=3)
+    assert pickle.loads(pickle.dumps(table)).rows == table.rows
+
+
+def test_from_bytes_rejects_bad_data(params):
+    p, g, _ = params
+    data = FixedBaseTable(g, p, window=3).to_bytes()
+    with pytest.raises(ValueError):
+        FixedBaseTable.from_bytes(b'XXXX' + data[4:])
+    with pytest.raises(ValueError):
+        FixedBaseTable.from_bytes(data[:-1])
+
+
+def test_precomputed_params_work_in_the_protocols():
+    params = ZKP.pedersen_setup()
+    pre = ZKP.precompute(params)
+    commitment = ZKP.pedersen_commit(42, pre)
+    assert ZKP.pedersen_verify(commitment, 42, params)
+    assert not ZKP.pedersen_verify(commitment, 43, pre)
+
+    schnorr = ZKP.schnorr_setup()
+    proof = ZKP.schnorr_prove(schnorr[2], ZKP.precompute(schnorr))
+    assert ZKP.schnorr_verify(proof, schnorr)
+    assert ZKP.schnorr_verify(proof, ZKP.precompute(schnorr))
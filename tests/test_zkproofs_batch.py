@@ -0,0 +1,51 @@
+from datatypes.others.zkproofs import Commitment, ZeroKnowledgeProofs as ZKP
+
+
+def _negate(data, p):
+    return (p - int.from_bytes(data, 'big')).to_bytes(len(data), 'big')
+
+
+def test_pedersen_batch_matches_single_on_tampered_inputs():
+    params = ZKP.pedersen_setup()
+    p = params[0]
+    items = [(ZKP.pedersen_commit(v, params), v) for v in range(12)]
+    com, v = items[3]
+    items[3] = (Commitment(_negate(com.value, p), com.randomness), v)
+    com, v = items[7]
+    items[7] = (com, v + 1)
+    items.append((Commitment(p.to_bytes(len(com.value), 'big'), com.randomness), 0))
+
+    expected = [ZKP.pedersen_verify(c, v, params) for c, v in items]
+    assert ZKP.pedersen_batch_verify(items, params) == expected
+    assert expected.count(False) == 3
+
+
+def test_schnorr_batch_matches_single_on_tampered_inputs():
+    params = ZKP.schnorr_setup()
+    p = params[0]
+    proofs = [ZKP.schnorr_prove(params[2], params) for _ in range(12)]
+    r, e, s = proofs[5]
+    proofs[5] = (_negate(r, p), e, s)
+    r, e, s = proofs[8]
+    proofs[8] = (r, e, (int.from_bytes(s, 'big') + 1).to_bytes(len(s), 'big'))
+
+    expected = [ZKP.schnorr_verify(proof, params) for proof in proofs]
+    assert ZKP.schnorr_batch_verify(proofs, params) == expected
+    assert expected.count(False) == 2
+
+
+def test_chaum_pedersen_batch_matches_single_on_tampered_inputs():
+    p, g1, h = ZKP.pedersen_setup()
+    x = 12345
+    g2 = h
+    h1, h2 = pow(g1, x, p), pow(g2, x, p)
+    params = (g1, h1, g2, h2, p)
+    proofs = [ZKP.chaum_pedersen_prove(g1, h1, g2, h2, x, p) for _ in range(12)]
+    r1, r2, s = proofs[2]
+    proofs[2] = (_negate(r1, p), _negate(r2, p), s)
+    r1, r2, s = proofs[9]
+    proofs[9] = (r1, _negate(r2, p), s)
+
+    expected = [ZKP.chaum_pedersen_verify(proof, params) for proof in proofs]
+    assert ZKP.chaum_pedersen_batch_verify(proofs, params) == expected
+    assert expected.count(False) == 2
@@ -0,0 +1,103 @@
+import pytest
+
+from datatypes.others.zkgroups import get_group
+from datatypes.others.zkproofs import ZeroKnowledgeProofs as ZKP
+from datatypes.others.zktranscript import Transcript
+
+
+def test_with_prefix_encodes_params_once():
+    calls = []
+
+    def public():
+        calls.append(1)
+        return ((b'p', b'\x17'), (b'g', b'\x05'))
+
+    first = Transcript.with_prefix(b'test/prefix', (23, 5), public)
+    second = Transcript.with_prefix(b'test/prefix', (23, 5), public)
+    assert len(calls) == 1
+    assert first.challenge(2 ** 64) == second.challenge(2 ** 64)
+    expected = Transcript(b'test/prefix').absorb(b'p', b'\x17').absorb(b'g', b'\x05')
+    assert first.challenge(2 ** 64) == expected.challenge(2 ** 64)
+
+
+def test_decode_proof_rejects_params_of_unknown_length():
+    params = ZKP.schnorr_setup()
+    data = ZKP.encode_proof(ZKP.schnorr_prove(params[2], params), params)
+    with pytest.raises(ValueError, match="match no protocol"):
+        ZKP.decode_proof(data, params[:2])
+
+
+def _setups(group):
+    pedersen = ZKP.pedersen_setup(group=group)
+    schnorr = ZKP.schnorr_setup(group=group)
+    x = 31337
+    if group is None:
+        p, g1, g2 = pedersen
+        chaum_pedersen = (g1, pow(g1, x, p), g2, pow(g2, x, p), p)
+    else:
+        g = get_group(group)
+        g1, g2 = g.generator, g.derive_generator(b'test-g2')
+        chaum_pedersen = (g1, g.scalar_mul(g1, x), g2, g.scalar_mul(g2, x), g)
+    return pedersen, schnorr, chaum_pedersen, x
+
+
+@pytest.fixture(scope='module', params=[None, 'modp2048', 'p256'])
+def setups(request):
+    return _setups(request.param)
+
+
+def test_pedersen_round_trip(setups):
+    params = setups[0]
+    commitment = ZKP.pedersen_commit(7, params)
+    data = ZKP.encode_proof(commitment, params)
+    decoded = ZKP.decode_proof(data, params)
+    assert decoded == commitment
+    assert ZKP.pedersen_verify(decoded, 7, params)
+
+
+def test_schnorr_round_trip_recomputes_the_challenge(setups):
+    params = setups[1]
+    proof = ZKP.schnorr_prove(params[2], params)
+    r, e, s = proof
+    data = ZKP.encode_proof(proof, params)
+    assert len(data) == 2 + len(r) + len(s)  # e is not sent.
+    assert ZKP.encode_proof((r, bytes(len(e)), s), params) == data
+    decoded = ZKP.decode_proof(data, params)
+    assert decoded == proof
+    assert ZKP.schnorr_verify(decoded, params)
+
+    tampered = bytearray(data)
+    tampered[2 + len(r) - 1] ^= 1
+    try:
+        forged = ZKP.decode_proof(bytes(tampered), params)
+    except ValueError:
+        pass  # Not a valid point any more.
+    else:
+        assert forged[1] != e
+        assert not ZKP.schnorr_verify(forged, params)
+
+
+def test_chaum_pedersen_round_trip(setups):
+    params, x = setups[2], setups[3]
+    proof = ZKP.chaum_pedersen_prove(*params[:4], x, params[4])
+    decoded = ZKP.decode_proof(ZKP.encode_proof(proof, params), params)
+    assert decoded == tuple(proof)
+    assert ZKP.chaum_pedersen_verify(decoded, params)
+
+
+def test_decode_proof_rejects_malformed_data(setups):
+    pedersen, schnorr = setups[0], setups[1]
+    data = ZKP.encode_proof(ZKP.pedersen_commit(7, pedersen), pedersen)
+    with pytest.raises(ValueError, match="version"):
+        ZKP.decode_proof(bytes([99]) + data[1:], pedersen)
+    with pytest.raises(ValueError, match="version"):
+        ZKP.decode_proof(b'', pedersen)
+    with pytest.raises(ValueError, match="different protocol"):
+        ZKP.decode_proof(data, schnorr)
+    with pytest.raises(ValueError, match="length"):
+        ZKP.decode_proof(data[:-1], pedersen)
+    with pytest.raises(ValueError, match="length"):
+        ZKP.decode_proof(data + b'\0', pedersen)
+    proof = ZKP.schnorr_prove(schnorr[2], schnorr)
+    with pytest.raises(ValueError):
+        ZKP.encode_proof((proof[0][1:], proof[1], proof[2]), schnorr)